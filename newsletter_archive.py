@@ -0,0 +1,131 @@
+# 뉴스레터 지난 호 정적 아카이브 (GitHub Pages 게시용)
+# 매주 브라우저 버전을 날짜별 페이지로 보관하고 지난 호 목록(index)과 검색용 목록(search.json)을 유지
+# manifest.json에 호별 입력 해시와 페이지별 내용 해시를 기록하여, 입력이 바뀐 호와 내용이 바뀐 페이지만 다시 기록
+# 주석은 한국어로 설명합니다
+
+import os
+import re
+import json
+import html
+import hashlib
+
+from newsletter_template import render_archive_index
+
+# 아카이브 형식 버전 (페이지 구성이 바뀌면 올려서 모든 호를 다시 생성)
+ARCHIVE_FORMAT_VERSION = 1
+
+ARCHIVE_INDEX_NAME = 'index.html'
+ARCHIVE_SEARCH_NAME = 'search.json'
+ARCHIVE_MANIFEST_NAME = 'manifest.json'
+
+# 기사 목록 HTML 한 줄(format_news_item 결과)에서 링크/제목/언론사 추출
+_ITEM_LINK = re.compile(r"<a href='([^']*)'[^>]*>(.*?)</a>")
+_ITEM_SOURCE = re.compile(r"<span style='color:#888;[^']*'>\((.*?)\)</span>")
+
+
+def content_hash(data):
+    """페이지 내용(str 또는 bytes)의 SHA-256"""
+    return hashlib.sha256(data.encode('utf-8') if isinstance(data, str) else data).hexdigest()
+
+
+def edition_input_hash(news, youtube_recommendations=None):
+    """호를 만드는 입력(카테고리별 기사 + 추천 영상)의 해시 (같으면 페이지를 다시 만들 필요 없음)"""
+    payload = json.dumps([ARCHIVE_FORMAT_VERSION, news, youtube_recommendations or []],
+                         ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return content_hash(payload)
+
+
+def search_entry(edition, path, news, youtube_recommendations=None):
+    """검색 목록(search.json)의 호 1건 (섹션별 기사 제목/링크/언론사, 추천 영상)"""
+    sections = []
+    for name, items in news.items():
+        entries = []
+        for item in items:
+            link = _ITEM_LINK.search(item)
+            source = _ITEM_SOURCE.search(item)
+            entries.append({
+                'title': html.unescape(link.group(2)) if link else html.unescape(re.sub('<[^>]+>', '', item)),
+                'link': html.unescape(link.group(1)) if link else '',
+                'source': html.unescape(source.group(1)) if source else '',
+            })
+        sections.append({'name': name, 'items': entries})
+    videos = [{'title': video['title'], 'channel': video['channel'], 'link': video['link']}
+              for video in youtube_recommendations or []]
+    return {'edition': edition, 'path': path, 'sections': sections, 'videos': videos}
+
+
+class ArchiveBuilder:
+    """
+    지난 호 아카이브 디렉터리 관리
+    - <directory>/<YYYY-MM-DD>.html: 호별 브라우저 버전 (입력 해시가 같으면 렌더링/기록 생략)
+    - <directory>/index.html, search.json: 호 목록이 바뀐 경우에만 내용이 달라지므로 그때만 기록
+    - <directory>/manifest.json: {'editions': {호: {'path', 'input'}}, 'pages': {파일명: 내용 해시}}
+    changed는 이번 실행에서 새로 기록된 파일 {파일명: 내용} (업로드 대상)
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, ARCHIVE_MANIFEST_NAME)
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.manifest = {}
+        for key in ('editions', 'pages'):
+            self.manifest.setdefault(key, {})
+        # 검색 목록은 지난 실행의 search.json을 읽어 호 단위로 갱신
+        try:
+            with open(os.path.join(directory, ARCHIVE_SEARCH_NAME), 'r', encoding='utf-8') as f:
+                self.search = {entry['edition']: entry for entry in json.load(f).get('editions', ())}
+        except (FileNotFoundError, ValueError):
+            self.search = {}
+        self.changed = {}
+        self.skipped = []
+
+    def _store(self, name, content):
+        path = os.path.join(self.directory, name)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self.changed[name] = content
+
+    def _write(self, name, content):
+        """내용 해시가 manifest와 같고 파일이 있으면 기록 생략, 기록했으면 True"""
+        digest = content_hash(content)
+        if self.manifest['pages'].get(name) == digest and os.path.exists(os.path.join(self.directory, name)):
+            self.skipped.append(name)
+            return False
+        self._store(name, content)
+        self.manifest['pages'][name] = digest
+        return True
+
+    def add_edition(self, edition, news, youtube_recommendations, render):
+        """
+        호 추가/갱신 (edition: 'YYYY-MM-DD', render: 브라우저 버전 HTML을 반환하는 함수)
+        입력 해시가 지난 기록과 같으면 render를 호출하지 않음, 반환: 페이지를 새로 기록했으면 True
+        """
+        name = f'{edition}.html'
+        input_hash = edition_input_hash(news, youtube_recommendations)
+        recorded = self.manifest['editions'].get(edition)
+        if recorded and recorded['input'] == input_hash and os.path.exists(os.path.join(self.directory, name)):
+            self.skipped.append(name)
+            return False
+        self.manifest['editions'][edition] = {'path': name, 'input': input_hash}
+        self.search[edition] = search_entry(edition, name, news, youtube_recommendations)
+        return self._write(name, render())
+
+    def save(self):
+        """index.html/search.json(바뀐 경우만)과 manifest.json 기록, 반환: 이번 실행에서 바뀐 파일 {파일명: 내용}"""
+        editions = sorted(self.manifest['editions'], reverse=True)
+        self._write(ARCHIVE_INDEX_NAME, render_archive_index(
+            [(edition, self.manifest['editions'][edition]['path']) for edition in editions]))
+        search = [self.search[edition] for edition in editions if edition in self.search]
+        self._write(ARCHIVE_SEARCH_NAME, json.dumps({'editions': search}, ensure_ascii=False, separators=(',', ':')))
+        if self.changed:
+            self._store(ARCHIVE_MANIFEST_NAME, json.dumps(self.manifest, ensure_ascii=False, sort_keys=True, indent=1))
+        return dict(self.changed)
+
+    def report(self):
+        return f'🗂️ 지난 호 아카이브: 다시 기록 {len(self.changed)}개 / 변경 없음 {len(self.skipped)}개 ({self.directory})'
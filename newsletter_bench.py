@@ -0,0 +1,450 @@
+# 뉴스레터 오프라인 벤치마크
+# 로컬 픽스처 서버를 띄우고 모든 외부 요청(구글 뉴스 RSS/유튜브 검색/oEmbed/채널 피드/썸네일)을 그쪽으로 돌려
+# collect_news() → collect_youtube_recommendations() → 썸네일 → HTML 렌더링 전체를 실행하고 단계별 성능을 측정
+# - 기록 모드(--record): 실제 응답을 픽스처 디렉터리에 저장, 재생 시 저장된 응답을 우선 사용
+# - 저장된 응답이 없는 요청은 합성 피드로 응답 (--scale로 피드당 항목 수를 10배~1000배까지 확대)
+# - 단계별 실행 시간/CPU 시간/최대 메모리/요청 수를 출력하고 JSON 결과 파일로 저장 (--compare로 이전 결과와 비교)
+# 사용 예: python newsletter_bench.py --scale 10 --latency 20 --compare bench_results/이전결과.json
+# 주석은 한국어로 설명합니다
+
+import os
+import io
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import datetime
+import platform
+import tempfile
+import threading
+import subprocess
+import tracemalloc
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow가 없으면 합성 썸네일을 임의 바이트로 대신함
+    Image = None
+
+from newsletter_prompt import trusted_sources, trusted_academic_sources
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'bench_fixtures')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'bench_results')
+
+# 현재 실제 응답 기준 피드당 항목 수 (scale=1), --scale 배수만큼 늘려 합성
+RSS_BASE_ITEMS = 20
+YOUTUBE_BASE_RESULTS = 20
+CHANNEL_FEED_BASE_ENTRIES = 15
+
+# 외부 요청 종류 (요청 수 집계 단위)
+REQUEST_KINDS = ('rss', 'youtube_search', 'oembed', 'channel_feed', 'thumbnail', 'other')
+
+_WORDS = ['AI', '생성형 AI', '로봇', '혁신', '투자', '정책', '반도체', '클라우드', '한화', '금융', '연구',
+          '발표', '성장', '규제', '협력', '서비스', '에이전트', 'LLM', '데이터', '자동화']
+
+
+def request_kind(host, path):
+    if host == 'news.google.com':
+        return 'rss'
+    if path == '/results':
+        return 'youtube_search'
+    if path == '/oembed':
+        return 'oembed'
+    if path == '/feeds/videos.xml':
+        return 'channel_feed'
+    if host in ('img.youtube.com', 'i.ytimg.com'):
+        return 'thumbnail'
+    return 'other'
+
+
+class FixtureStore:
+    """
+    기록된 응답 저장소 (<directory>/index.json: {URL: {file, status, content_type}}, 본문은 URL 해시 파일)
+    기록 모드에서는 여러 수집 스레드가 동시에 저장하므로 잠금으로 보호
+    """
+
+    def __init__(self, directory=FIXTURE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        try:
+            with open(os.path.join(directory, 'index.json'), 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.index = {}
+
+    def get(self, url):
+        """기록된 응답 (status, content_type, 본문) 또는 None"""
+        meta = self.index.get(url)
+        if meta is None:
+            return None
+        with open(os.path.join(self.directory, meta['file']), 'rb') as f:
+            return meta['status'], meta['content_type'], f.read()
+
+    def put(self, url, status, content_type, body):
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.bin'
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, name), 'wb') as f:
+                f.write(body)
+            self.index[url] = {'file': name, 'status': status, 'content_type': content_type}
+
+    def save(self):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, 'index.json'), 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+class SyntheticFeeds:
+    """
+    요청 URL로부터 결정적인 합성 응답 생성 (같은 URL은 항상 같은 응답)
+    발행 시각은 최근 2주에 고르게 분포시키고 신뢰 언론사/학술기관/기타 출처를 섞어 필터 경로를 모두 거치게 함
+    """
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.now = datetime.datetime.now(datetime.timezone.utc)
+        self.sources = list(trusted_sources) + list(trusted_academic_sources) + ['동네소식', '개인 블로그', '커뮤니티']
+
+    def _random(self, key):
+        return random.Random(hashlib.md5(key.encode('utf-8')).hexdigest())
+
+    def _count(self, base, r):
+        return max(1, int(base * self.scale * r.uniform(0.5, 1.5)))
+
+    def rss(self, query):
+        r = self._random(query)
+        items = []
+        for i in range(self._count(RSS_BASE_ITEMS, r)):
+            source = r.choice(self.sources)
+            title = ' '.join(r.choice(_WORDS) for _ in range(r.randint(3, 7))) + f' {query} {i}'
+            published = (self.now - datetime.timedelta(minutes=r.randint(10, 14 * 24 * 60))).strftime('%a, %d %b %Y %H:%M:%S GMT')
+            link = f'https://news.google.com/rss/articles/{hashlib.md5(f"{query}/{i}".encode("utf-8")).hexdigest()}?oc=5'
+            items.append(f'<item><title>{_xml_escape(title)} - {_xml_escape(source)}</title><link>{link}</link>'
+                         f'<pubDate>{published}</pubDate><source url="https://example.com">{_xml_escape(source)}</source></item>')
+        return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Google News</title>'
+                + ''.join(items) + '</channel></rss>').encode('utf-8')
+
+    def youtube_search(self, query):
+        r = self._random(query)
+        renderers = []
+        for i in range(self._count(YOUTUBE_BASE_RESULTS, r)):
+            video_id = hashlib.md5(f'{query}/{i}'.encode('utf-8')).hexdigest()[:11]
+            renderers.append({'videoRenderer': {
+                'videoId': video_id,
+                'title': {'runs': [{'text': f'{r.choice(_WORDS)} {r.choice(_WORDS)} {query} {i}'}]},
+                'ownerText': {'runs': [{'text': f'채널 {video_id[:4]}'}]},
+                'publishedTimeText': {'simpleText': f'{r.randint(1, 6)}일 전'},
+                'viewCountText': {'simpleText': f'조회수 {r.randint(100, 500000):,}회'},
+            }})
+        data = {'contents': {'twoColumnSearchResultsRenderer': {'primaryContents': {'sectionListRenderer': {
+            'contents': [{'itemSectionRenderer': {'contents': renderers}}]}}}}}
+        return ('<html><head><script>var ytcfg = {};</script></head><body><script>var ytInitialData = '
+                + json.dumps(data, ensure_ascii=False, separators=(',', ':')) + ';</script></body></html>').encode('utf-8')
+
+    def oembed(self, video_url):
+        video_id = video_url.rsplit('=', 1)[-1]
+        return json.dumps({'title': f'AI 영상 {video_id}', 'author_name': f'채널 {video_id[:4]}'}, ensure_ascii=False).encode('utf-8')
+
+    def channel_feed(self, channel_id):
+        r = self._random(channel_id)
+        entries = []
+        for i in range(self._count(CHANNEL_FEED_BASE_ENTRIES, r)):
+            video_id = hashlib.md5(f'{channel_id}/{i}'.encode('utf-8')).hexdigest()[:11]
+            published = (self.now - datetime.timedelta(hours=r.randint(1, 24 * 20))).strftime('%Y-%m-%dT%H:%M:%S+00:00')
+            entries.append(
+                f'<entry><yt:videoId>{video_id}</yt:videoId><title>{r.choice(_WORDS)} {r.choice(_WORDS)} {i}</title>'
+                f'<author><name>채널 {channel_id[:6]}</name></author><published>{published}</published>'
+                f'<media:group><media:community><media:statistics views="{r.randint(0, 500000)}"/></media:community></media:group></entry>')
+        return ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+                'xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom"><title>channel</title>'
+                + ''.join(entries) + '</feed>').encode('utf-8')
+
+    def thumbnail(self, path):
+        r = self._random(path)
+        if Image is None:
+            return bytes(r.getrandbits(8) for _ in range(12 * 1024))
+        image = Image.new('RGB', (320, 180), (r.randint(0, 255), r.randint(0, 255), r.randint(0, 255)))
+        output = io.BytesIO()
+        image.save(output, 'JPEG', quality=90)
+        return output.getvalue()
+
+    def respond(self, host, path, query):
+        """(status, content_type, 본문)"""
+        params = urllib.parse.parse_qs(query)
+        kind = request_kind(host, path)
+        if kind == 'rss':
+            return 200, 'application/rss+xml; charset=utf-8', self.rss(params.get('q', [''])[0])
+        if kind == 'youtube_search':
+            return 200, 'text/html; charset=utf-8', self.youtube_search(params.get('search_query', [''])[0])
+        if kind == 'oembed':
+            return 200, 'application/json', self.oembed(params.get('url', [''])[0])
+        if kind == 'channel_feed':
+            return 200, 'application/atom+xml; charset=utf-8', self.channel_feed(params.get('channel_id', [''])[0])
+        if kind == 'thumbnail':
+            return 200, 'image/jpeg', self.thumbnail(path)
+        return 404, 'text/plain', b''
+
+
+def _xml_escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+class FixtureServer:
+    """
+    로컬 픽스처 HTTP 서버 (경로 /<원래 호스트>/<원래 경로>?<원래 쿼리>)
+    기록된 응답이 있으면 그대로, 없으면 합성 응답으로 답하고 요청 종류별 횟수/전송 바이트를 집계
+    latency: 응답마다 추가하는 지연 (초, 네트워크 왕복 흉내)
+    """
+
+    def __init__(self, synthetic, fixtures=None, latency=0.0):
+        self.synthetic = synthetic
+        self.fixtures = fixtures
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(REQUEST_KINDS, 0)
+        self.bytes = 0
+        self.replayed = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive (전송 계층의 연결 재사용이 그대로 동작하도록)
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status, content_type, body = server.respond(self.path)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def respond(self, raw_path):
+        parts = urllib.parse.urlsplit(raw_path)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        path = '/' + path
+        original_url = urllib.parse.urlunsplit(('https', host, path, parts.query, ''))
+        if self.latency:
+            time.sleep(self.latency)
+        recorded = self.fixtures.get(original_url) if self.fixtures else None
+        status, content_type, body = recorded or self.synthetic.respond(host, path, parts.query)
+        with self._lock:
+            self.counts[request_kind(host, path)] += 1
+            self.bytes += len(body)
+            self.replayed += recorded is not None
+        return status, content_type, body
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts), self.bytes
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def route_to_fixtures(transport, server_url):
+    """전송 계층의 모든 https/http 요청을 픽스처 서버로 보냄 (연결 풀/요청 집계는 기존 어댑터 그대로 사용)"""
+    from newsletter_http import PooledAdapter
+
+    class FixtureAdapter(PooledAdapter):
+        def send(self, request, **kwargs):
+            self.stats.count_request(urllib.parse.urlsplit(request.url).hostname or '')
+            parts = urllib.parse.urlsplit(request.url)
+            request.url = f'{server_url}/{parts.hostname}{parts.path or "/"}' + (f'?{parts.query}' if parts.query else '')
+            return super(PooledAdapter, self).send(request, **kwargs)
+
+    adapter = FixtureAdapter(transport.stats, 64)
+    # 로컬 픽스처 서버이므로 호스트별 속도 제한은 적용하지 않음 (수집 단계 자체의 비용만 측정)
+    transport.limiter.buckets.clear()
+    transport.session.adapters.clear()
+    transport.session.mount('https://', adapter)
+    transport.session.mount('http://', adapter)
+
+
+def record_responses(transport, fixtures):
+    """실제 요청을 그대로 보내면서 응답을 픽스처로 저장 (기록 모드)"""
+    for adapter in set(transport.session.adapters.values()):
+        original_send = adapter.send
+
+        def send(request, _send=original_send, **kwargs):
+            response = _send(request, **kwargs)
+            fixtures.put(request.url, response.status_code, response.headers.get('Content-Type', ''), response.content)
+            return response
+
+        adapter.send = send
+
+
+class StageTimer:
+    """단계별 실행 시간/CPU 시간/최대 메모리/픽스처 서버 요청 수 측정"""
+
+    def __init__(self, server=None, measure_memory=True):
+        self.server = server
+        self.measure_memory = measure_memory
+        self.stages = {}
+
+    def run(self, name, func, *args):
+        requests_before, bytes_before = self.server.snapshot() if self.server else ({}, 0)
+        if self.measure_memory:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = func(*args)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        stage = {'wall_s': round(wall, 4), 'cpu_s': round(cpu, 4)}
+        if self.measure_memory:
+            stage['peak_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        if self.server:
+            requests_after, bytes_after = self.server.snapshot()
+            stage['requests'] = {kind: requests_after[kind] - requests_before.get(kind, 0)
+                                 for kind in REQUEST_KINDS if requests_after[kind] - requests_before.get(kind, 0)}
+            stage['bytes'] = bytes_after - bytes_before
+        self.stages[name] = stage
+        return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_pipeline(timer, ns):
+    """수집 → 유튜브 → 썸네일 → 렌더링 (브라우저 버전 + 크기 예산 이메일 버전)"""
+    news = timer.run('collect_news', ns.collect_news)
+    videos = timer.run('youtube', ns.collect_youtube_recommendations)
+    thumbnails = timer.run('thumbnails', ns.prepare_thumbnails, videos)
+
+    def render():
+        browser = ns.generate_html(news, videos, email_version=False, thumbnails=thumbnails)
+        email_html, _, _ = ns.render_email(news, videos, thumbnails, ns.EMAIL_SIZE_BUDGET)
+        return browser, email_html
+
+    browser, email_html = timer.run('render', render)
+    return {
+        'news_items': sum(len(items) for items in news.values()),
+        'videos': len(videos),
+        'thumbnails': len(thumbnails),
+        'browser_html_bytes': len(browser.encode('utf-8')),
+        'email_html_bytes': len(email_html.encode('utf-8')),
+    }
+
+
+def format_results(results):
+    lines = [f"⏱️ 벤치마크 ({results['commit']}, scale {results['scale']}x, latency {results['latency_ms']}ms, "
+             f"youtube {results['youtube_mode']})"]
+    for name, stage in results['stages'].items():
+        memory = f" / 최대 메모리 {stage['peak_kb'] / 1024:.1f}MB" if 'peak_kb' in stage else ''
+        requests = ', '.join(f'{kind} {count}' for kind, count in stage.get('requests', {}).items()) or '요청 없음'
+        lines.append(f"   {name}: {stage['wall_s']:.3f}s (CPU {stage['cpu_s']:.3f}s){memory} [{requests}]")
+    lines.append('   결과: ' + ', '.join(f'{key} {value}' for key, value in results['output'].items()))
+    return '\n'.join(lines)
+
+
+def format_comparison(results, baseline):
+    """기준 결과 대비 단계별 실행 시간/최대 메모리 변화율"""
+    lines = [f"📊 비교 기준: {baseline.get('commit')} (scale {baseline.get('scale')}x)"]
+    for name, stage in results['stages'].items():
+        before = baseline.get('stages', {}).get(name)
+        if not before:
+            continue
+        changes = []
+        for key, label in (('wall_s', '시간'), ('cpu_s', 'CPU'), ('peak_kb', '메모리')):
+            if before.get(key) and key in stage:
+                changes.append(f'{label} {(stage[key] - before[key]) / before[key] * 100:+.1f}%')
+        lines.append(f"   {name}: {', '.join(changes)}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='뉴스레터 오프라인 벤치마크')
+    parser.add_argument('--scale', type=float, default=1.0, help='합성 피드 항목 수 배수 (예: 10, 100, 1000)')
+    parser.add_argument('--latency', type=float, default=0.0, help='픽스처 응답 지연 (밀리초)')
+    parser.add_argument('--youtube-mode', choices=('search', 'channels'), default='search', help='유튜브 수집 방식')
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help='기록된 응답 디렉터리')
+    parser.add_argument('--no-fixtures', action='store_true', help='기록된 응답을 쓰지 않고 모두 합성')
+    parser.add_argument('--record', action='store_true', help='실제 서버로 요청하며 응답을 픽스처로 기록')
+    parser.add_argument('--warm', action='store_true', help='같은 캐시로 한 번 더 실행하여 캐시 적중 시 성능도 측정')
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc 메모리 측정 생략 (측정 부하 제거)')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: bench_results/<시각>-<커밋>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    args = parser.parse_args(argv)
+
+    # 캐시/저장소는 실행마다 빈 임시 디렉터리 사용 (모듈 로드 시 경로가 정해지므로 import 전에 지정)
+    cache_dir = tempfile.mkdtemp(prefix='newsletter-bench-')
+    os.environ['NEWSLETTER_CACHE_DIR'] = cache_dir
+    os.environ['YOUTUBE_SOURCE_MODE'] = args.youtube_mode
+    for key in ('ARTICLE_STORE_PATH', 'VIDEO_CACHE_PATH', 'ARCHIVE_DIR'):
+        os.environ.pop(key, None)
+    import newsletter_sender as ns
+    from newsletter_http import transport
+
+    fixtures = FixtureStore(args.fixtures)
+    server = None
+    if args.record:
+        record_responses(transport, fixtures)
+    else:
+        server = FixtureServer(SyntheticFeeds(args.scale), None if args.no_fixtures else fixtures,
+                               args.latency / 1000).start()
+        route_to_fixtures(transport, server.url)
+
+    measure_memory = not args.no_memory
+    if measure_memory:
+        tracemalloc.start()
+    timer = StageTimer(server, measure_memory)
+    try:
+        output = run_pipeline(timer, ns)
+        if args.warm:
+            cold = timer.stages
+            timer.stages = {}
+            run_pipeline(timer, ns)
+            timer.stages = {**cold, **{f'{name}_warm': stage for name, stage in timer.stages.items()}}
+    finally:
+        transport.close()
+        if server:
+            server.stop()
+        if args.record:
+            fixtures.save()
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'scale': args.scale,
+        'latency_ms': args.latency,
+        'youtube_mode': args.youtube_mode,
+        'recorded': bool(server and server.replayed),
+        'stages': timer.stages,
+        'output': output,
+        'transport': transport.stats.summary(),
+    }
+    print(format_results(results))
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print(format_comparison(results, json.load(f)))
+    output_path = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}-{results['commit']}-{args.scale:g}x.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=1)
+    print(f'결과 저장: {output_path}')
+    return results
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,132 @@
+# 뉴스레터 실행 시간 예산
+# 실행 전체에 시간 예산을 두고 단계(뉴스 수집 → 유튜브 수집 → 렌더링/업로드/발송)별 마감 시각을 나눠 배정
+# 뉴스 수집 단계 안에서는 카테고리별 작업 시간 몫(GroupBudget)을 나눠 느린 카테고리 하나가 다른 카테고리를 굶기지 않도록 함
+# 마감이 지나면 아직 시작하지 않은 요청은 취소하고, 진행 중인 요청의 timeout은 남은 시간으로 줄여
+# 수집된 만큼으로 렌더링하며, 요청이 잘린 섹션은 degraded에 기록하여 본문에 안내 문구를 표시
+# 주석은 한국어로 설명합니다
+
+import time
+import threading
+
+# 단계별 마감 시점 (실행 예산 대비 누적 비율, 앞 단계가 일찍 끝나면 남은 시간은 다음 단계가 사용)
+# 마지막 15%는 렌더링/업로드/발송 몫으로 남겨 둠
+STAGE_CHECKPOINTS = {
+    'collect': 0.60,
+    'youtube': 0.85,
+}
+
+# 본문에 표시할 안내 문구
+DEGRADED_NOTICE = '발송 시간 제한으로 일부 키워드만 반영되었습니다.'
+
+
+class DeadlineExceeded(Exception):
+    """단계 마감이 지나 요청을 보내지 않음 (수집 결과 자리에 예외 객체로 담김)"""
+
+
+class StageDeadline:
+    """한 단계의 마감 시각 (end가 None이면 제한 없음)"""
+
+    def __init__(self, run, name, end):
+        self.run = run
+        self.name = name
+        self.end = end
+
+    def remaining(self):
+        """남은 시간 (초, 제한 없으면 None)"""
+        return None if self.end is None else max(0.0, self.end - time.monotonic())
+
+    def expired(self):
+        return self.end is not None and time.monotonic() >= self.end
+
+    def clamp(self, timeout):
+        """요청 timeout을 남은 시간 이내로 줄임 (timeout이 None이면 남은 시간, 이미 마감이면 DeadlineExceeded)"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceeded(f'{self.name} 단계 마감')
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def mark_degraded(self, section, notice=DEGRADED_NOTICE):
+        self.run.mark_degraded(section, notice)
+
+
+class GroupBudget:
+    """
+    한 단계의 남은 시간을 그룹(카테고리)별 작업 시간 몫으로 나눔 (작업자 수 × 남은 시간을 weights 비율로 배분)
+    - 그룹이 보낸 요청의 실행 시간을 charge()로 차감하고, 몫을 다 쓴 그룹은 남은 요청을 보내지 않음
+      (느린 키워드가 많은 그룹 하나가 공유 작업자와 단계 시간을 다 써서 다른 그룹까지 잘리지 않도록)
+    - finish(group): 일찍 끝난 그룹의 남은 몫은 아직 진행 중인 그룹에 weights 비율로 다시 나눔
+    - 단계에 마감이 없으면 제한 없음
+    """
+
+    def __init__(self, stage, weights, workers):
+        remaining = stage.remaining()
+        total = sum(weights.values())
+        self._lock = threading.Lock()
+        self.weights = dict(weights)
+        self.active = set(weights)
+        self.spent = dict.fromkeys(weights, 0.0)
+        if remaining is None or total <= 0:
+            self.shares = None
+        else:
+            capacity = remaining * max(1, workers)
+            self.shares = {group: capacity * weight / total for group, weight in weights.items()}
+
+    def charge(self, group, seconds):
+        with self._lock:
+            self.spent[group] += seconds
+
+    def exhausted(self, group):
+        with self._lock:
+            return self.shares is not None and self.spent[group] >= self.shares[group]
+
+    def finish(self, group):
+        with self._lock:
+            self.active.discard(group)
+            if self.shares is None:
+                return
+            unused = self.shares[group] - self.spent[group]
+            active_weight = sum(self.weights[other] for other in self.active)
+            if unused <= 0 or active_weight <= 0:
+                return
+            self.shares[group] = self.spent[group]
+            for other in self.active:
+                self.shares[other] += unused * self.weights[other] / active_weight
+
+
+class RunDeadline:
+    """
+    실행 전체 시간 예산 (budget: 초, 0 또는 None이면 제한 없음)
+    stage(name)은 STAGE_CHECKPOINTS 비율로 정한 그 단계의 마감 시각을 가진 StageDeadline 반환
+    """
+
+    def __init__(self, budget=None, checkpoints=None):
+        self.budget = budget or None
+        self.start = time.monotonic()
+        self.checkpoints = STAGE_CHECKPOINTS if checkpoints is None else checkpoints
+        self._lock = threading.Lock()
+        self.degraded = {}  # 섹션명 -> 안내 문구
+
+    def stage(self, name):
+        if self.budget is None:
+            return StageDeadline(self, name, None)
+        return StageDeadline(self, name, self.start + self.budget * self.checkpoints.get(name, 1.0))
+
+    def remaining(self):
+        return None if self.budget is None else max(0.0, self.start + self.budget - time.monotonic())
+
+    def mark_degraded(self, section, notice=DEGRADED_NOTICE):
+        with self._lock:
+            self.degraded.setdefault(section, notice)
+
+    def report(self):
+        if self.budget is None:
+            return '⏳ 실행 시간 예산: 제한 없음'
+        used = time.monotonic() - self.start
+        degraded = f" / 일부만 반영된 섹션: {', '.join(self.degraded)}" if self.degraded else ''
+        return f'⏳ 실행 시간 예산: {used:.1f}초 / {self.budget:.0f}초 사용{degraded}'
+
+
+# 제한 없는 기본 마감 (함수를 단독으로 호출할 때 사용)
+NO_DEADLINE = RunDeadline(None)
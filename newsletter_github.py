@@ -0,0 +1,105 @@
+# 뉴스레터 GitHub Pages 업로드
+# Git Data API(refs/commits/trees)로 여러 파일을 커밋 하나에 올리고,
+# 로컬 내용의 git blob SHA가 원격 트리와 같은 파일은 업로드하지 않음
+# 주석은 한국어로 설명합니다
+
+import base64
+import hashlib
+from collections import namedtuple
+
+from newsletter_http import transport
+
+GITHUB_API_URL = 'https://api.github.com'
+
+# 브랜치 현재 상태 (commit: 최신 커밋 SHA, tree: 트리 SHA, blobs: {경로: blob SHA})
+RemoteTree = namedtuple('RemoteTree', ['commit', 'tree', 'blobs'])
+# 업로드 결과 (commit: 새 커밋 SHA, 변경 없으면 None / changed, unchanged: 파일 경로 목록)
+PublishResult = namedtuple('PublishResult', ['commit', 'changed', 'unchanged'])
+
+
+class GitHubError(Exception):
+    """GitHub API 호출 실패 (status: HTTP 상태 코드)"""
+
+    def __init__(self, status, message):
+        super().__init__(f'{status} - {message}')
+        self.status = status
+
+
+def to_bytes(content):
+    return content.encode('utf-8') if isinstance(content, str) else content
+
+
+def git_blob_sha(content):
+    """git이 파일 내용에 붙이는 blob SHA-1 (원격 트리의 sha와 같으면 내용이 같은 파일)"""
+    data = to_bytes(content)
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+class GitHubPublisher:
+    """
+    레포지토리 브랜치에 파일 묶음을 커밋 하나로 게시
+    - 브랜치의 현재 트리를 한 번 조회하여 경로별 blob SHA와 비교, 바뀐 파일만 새 트리에 포함
+    - 바뀐 파일이 없으면 커밋을 만들지 않음
+    - 기존 방식(파일마다 GET + base64 PUT, 파일마다 커밋) 대비 요청 수: 조회 3회 + 생성 2~3회 + 바뀐 바이너리 파일 수
+    """
+
+    def __init__(self, repo, branch, token, api_url=GITHUB_API_URL):
+        self.repo = repo
+        self.branch = branch
+        self.api_url = api_url.rstrip('/')
+        self.headers = {
+            'Authorization': f'token {token}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
+
+    def _request(self, method, path, **kwargs):
+        url = f'{self.api_url}/repos/{self.repo}/{path}'
+        response = transport.request(method, url, headers=self.headers, timeout=30, **kwargs)
+        if response.status_code not in (200, 201):
+            raise GitHubError(response.status_code, response.text[:200])
+        return response.json()
+
+    def snapshot(self):
+        """브랜치 최신 커밋/트리와 트리 전체의 {경로: blob SHA} (트리가 너무 커서 잘리면 빠진 파일은 바뀐 것으로 취급됨)"""
+        ref = self._request('GET', f'git/ref/heads/{self.branch}')
+        commit_sha = ref['object']['sha']
+        tree_sha = self._request('GET', f'git/commits/{commit_sha}')['tree']['sha']
+        tree = self._request('GET', f'git/trees/{tree_sha}', params={'recursive': '1'})
+        blobs = {entry['path']: entry['sha'] for entry in tree.get('tree', ()) if entry.get('type') == 'blob'}
+        return RemoteTree(commit_sha, tree_sha, blobs)
+
+    def _tree_entry(self, path, content):
+        entry = {'path': path, 'mode': '100644', 'type': 'blob'}
+        if isinstance(content, str):
+            # 텍스트 파일은 트리 생성 요청에 내용을 바로 넣음 (blob 생성 요청 생략)
+            entry['content'] = content
+        else:
+            blob = self._request('POST', 'git/blobs', json={
+                'content': base64.b64encode(content).decode('ascii'), 'encoding': 'base64'})
+            entry['sha'] = blob['sha']
+        return entry
+
+    def publish(self, files, message, attempts=2):
+        """
+        files: {레포 내 경로: 내용(str 또는 bytes)} → PublishResult
+        다른 커밋이 먼저 올라가 브랜치 갱신이 거절되면(422) 최신 상태에서 다시 비교/커밋
+        """
+        for attempt in range(attempts):
+            remote = self.snapshot()
+            changed = [path for path, content in files.items() if remote.blobs.get(path) != git_blob_sha(content)]
+            unchanged = [path for path in files if path not in changed]
+            if not changed:
+                return PublishResult(None, [], unchanged)
+            tree = self._request('POST', 'git/trees', json={
+                'base_tree': remote.tree,
+                'tree': [self._tree_entry(path, files[path]) for path in changed],
+            })
+            commit = self._request('POST', 'git/commits', json={
+                'message': message, 'tree': tree['sha'], 'parents': [remote.commit]})
+            try:
+                self._request('PATCH', f'git/refs/heads/{self.branch}', json={'sha': commit['sha']})
+            except GitHubError as e:
+                if e.status == 422 and attempt + 1 < attempts:
+                    continue
+                raise
+            return PublishResult(commit['sha'], changed, unchanged)
@@ -0,0 +1,217 @@
+# 뉴스레터 GitHub 게시 점검 (로컬 Git Data API 스텁 서버)
+# refs/commits/trees/blobs만 흉내 내는 메모리 저장소 서버를 띄우고 GitHubPublisher를 그쪽으로 돌려
+# - 생성: 빈 브랜치에 텍스트/바이너리 파일을 커밋 하나로 올리는지 (바이너리만 blob 생성 요청)
+# - 건너뛰기: 원격 blob SHA와 같은 파일은 올리지 않고, 모두 같으면 커밋을 만들지 않는지
+# - 충돌 재시도: 다른 커밋이 먼저 올라가 브랜치 갱신이 거절(422)되면 최신 상태에서 다시 커밋하는지 (다른 커밋 내용 유지)
+# 사용 예: python newsletter_github_check.py
+# 주석은 한국어로 설명합니다
+
+import sys
+import json
+import base64
+import hashlib
+import argparse
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from newsletter_github import GitHubPublisher, GitHubError, git_blob_sha
+from newsletter_mail_check import CheckResults
+
+REPO = 'owner/newsletter'
+BRANCH = 'main'
+# 빈 파일의 git blob SHA (git hash-object /dev/null)
+EMPTY_BLOB_SHA = 'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391'
+
+
+def object_sha(kind, data):
+    return hashlib.sha1(kind.encode('ascii') + b' %d\0' % len(data) + data).hexdigest()
+
+
+class GitHubStubServer:
+    """
+    로컬 Git Data API 스텁 서버 (경로 /repos/<소유자>/<레포>/git/...)
+    브랜치 하나의 커밋/트리/blob을 메모리에 보관하고 (메서드, API 종류)별 요청 수를 집계
+    race: 남은 횟수만큼 브랜치 갱신(PATCH) 직전에 다른 커밋(other.txt 추가)을 먼저 올려 422를 유도
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.blobs = {}
+        self.trees = {}
+        self.commits = {}
+        self.requests = []
+        self.race = 0
+        self.head = self._commit('initial', self._tree({}), [])
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive (전송 계층의 연결 재사용이 그대로 동작하도록)
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                status, payload = server.respond(self.command, urllib.parse.urlsplit(self.path).path, body)
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = _handle
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def _blob(self, data):
+        sha = object_sha('blob', data)
+        self.blobs[sha] = data
+        return sha
+
+    def _tree(self, entries):
+        sha = object_sha('tree', json.dumps(sorted(entries.items())).encode('utf-8'))
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def _commit(self, message, tree, parents):
+        sha = object_sha('commit', json.dumps([message, tree, parents, len(self.commits)]).encode('utf-8'))
+        self.commits[sha] = {'message': message, 'tree': tree, 'parents': parents}
+        return sha
+
+    def files(self):
+        """브랜치 최신 커밋의 {경로: 내용 bytes}"""
+        with self._lock:
+            tree = self.trees[self.commits[self.head]['tree']]
+            return {path: self.blobs[sha] for path, sha in tree.items()}
+
+    def count(self, method=None, kind=None, since=0):
+        return sum(1 for m, k in self.requests[since:] if (method is None or m == method) and (kind is None or k == kind))
+
+    def respond(self, method, path, body):
+        prefix = f'/repos/{REPO}/git/'
+        if not path.startswith(prefix):
+            return 404, {'message': 'Not Found'}
+        kind, _, name = path[len(prefix):].partition('/')
+        with self._lock:
+            self.requests.append((method, kind))
+            if method == 'GET' and kind == 'ref' and name == f'heads/{BRANCH}':
+                return 200, {'object': {'sha': self.head}}
+            if method == 'GET' and kind == 'commits' and name in self.commits:
+                return 200, {'sha': name, 'tree': {'sha': self.commits[name]['tree']}}
+            if method == 'GET' and kind == 'trees' and name in self.trees:
+                return 200, {'sha': name, 'truncated': False, 'tree': [
+                    {'path': entry, 'mode': '100644', 'type': 'blob', 'sha': sha} for entry, sha in self.trees[name].items()]}
+            if method == 'POST' and kind == 'blobs':
+                return 201, {'sha': self._blob(base64.b64decode(body['content']))}
+            if method == 'POST' and kind == 'trees':
+                entries = dict(self.trees.get(body.get('base_tree'), {}))
+                for entry in body['tree']:
+                    entries[entry['path']] = self._blob(entry['content'].encode('utf-8')) if 'content' in entry else entry['sha']
+                return 201, {'sha': self._tree(entries)}
+            if method == 'POST' and kind == 'commits':
+                return 201, {'sha': self._commit(body['message'], body['tree'], body['parents'])}
+            if method == 'PATCH' and kind == 'refs' and name == f'heads/{BRANCH}':
+                if self.race:
+                    # 다른 실행이 먼저 커밋을 올린 상황 재현
+                    self.race -= 1
+                    entries = dict(self.trees[self.commits[self.head]['tree']])
+                    entries['other.txt'] = self._blob(b'concurrent commit\n')
+                    self.head = self._commit('concurrent', self._tree(entries), [self.head])
+                if self.head not in self.commits.get(body['sha'], {}).get('parents', ()):
+                    return 422, {'message': 'Update is not a fast forward'}
+                self.head = body['sha']
+                return 200, {'object': {'sha': self.head}}
+        return 404, {'message': 'Not Found'}
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def check_publisher(results, server):
+    publisher = GitHubPublisher(REPO, BRANCH, 'stub-token', server.url)
+    files = {
+        'index.html': '<html><body>뉴스레터 1호</body></html>\n',
+        'archive/2026-10-12.html': '<html><body>지난 호</body></html>\n',
+        'img/thumb.jpg': b'\xff\xd8\xff\xe0binary thumbnail',
+    }
+    results.check('git blob SHA (빈 파일 기준값)', git_blob_sha('') == EMPTY_BLOB_SHA, git_blob_sha(''))
+
+    print('🆕 생성: 빈 브랜치에 파일 3개')
+    since = len(server.requests)
+    result = publisher.publish(files, 'newsletter: 1호')
+    remote = server.files()
+    results.check('커밋 하나로 모두 게시', result.commit == server.head and sorted(result.changed) == sorted(files)
+                  and all(remote.get(path) == (content.encode('utf-8') if isinstance(content, str) else content)
+                          for path, content in files.items()),
+                  f'변경 {len(result.changed)}개, 원격 {sorted(remote)}')
+    results.check('blob 생성은 바이너리 파일만', server.count('POST', 'blobs', since) == 1 and server.count('PATCH', since=since) == 1,
+                  f"blob {server.count('POST', 'blobs', since)}건, 브랜치 갱신 {server.count('PATCH', since=since)}건")
+
+    print('⏭️ 건너뛰기: 같은 내용으로 다시 게시')
+    head = server.head
+    since = len(server.requests)
+    result = publisher.publish(files, 'newsletter: 1호 재실행')
+    results.check('바뀐 파일이 없으면 커밋 생략', result.commit is None and not result.changed and server.head == head
+                  and server.count('POST', since=since) == 0 and server.count('PATCH', since=since) == 0,
+                  f'조회 {server.count("GET", since=since)}건, 쓰기 {server.count(since=since) - server.count("GET", since=since)}건')
+
+    print('✏️ 일부 변경: index.html만 변경')
+    files['index.html'] = '<html><body>뉴스레터 2호</body></html>\n'
+    since = len(server.requests)
+    result = publisher.publish(files, 'newsletter: 2호')
+    results.check('바뀐 파일만 게시 (나머지는 기존 트리 유지)', result.changed == ['index.html']
+                  and sorted(result.unchanged) == ['archive/2026-10-12.html', 'img/thumb.jpg']
+                  and server.count('POST', 'blobs', since) == 0 and server.files()['img/thumb.jpg'] == files['img/thumb.jpg'],
+                  f'변경 {result.changed}')
+
+    print('🔁 충돌 재시도: 브랜치 갱신 직전에 다른 커밋이 올라감')
+    files['index.html'] = '<html><body>뉴스레터 3호</body></html>\n'
+    server.race = 1
+    since = len(server.requests)
+    try:
+        commit = publisher.publish(files, 'newsletter: 3호').commit
+    except GitHubError as e:
+        commit = f'오류 {e}'
+    remote = server.files()
+    results.check('422 후 최신 상태에서 다시 커밋', commit == server.head and server.count('PATCH', since=since) == 2
+                  and remote.get('other.txt') == b'concurrent commit\n'
+                  and remote.get('index.html') == files['index.html'].encode('utf-8'),
+                  f"브랜치 갱신 {server.count('PATCH', since=since)}건, 원격 {sorted(remote)}")
+
+    print('⛔ 충돌 반복: 재시도 횟수를 넘기면 오류')
+    files['index.html'] = '<html><body>뉴스레터 4호</body></html>\n'
+    server.race = 2
+    try:
+        publisher.publish(files, 'newsletter: 4호')
+        status = None
+    except GitHubError as e:
+        status = e.status
+    results.check('재시도 후에도 422면 GitHubError', status == 422, f'status {status}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='뉴스레터 GitHub 게시 점검 (로컬 Git Data API 스텁 서버)')
+    parser.parse_args(argv)
+
+    results = CheckResults()
+    server = GitHubStubServer().start()
+    try:
+        check_publisher(results, server)
+    finally:
+        server.stop()
+    print('✅ 모든 점검 통과' if not results.failures else f'❌ 점검 실패 {results.failures}건')
+    return results.failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if main(sys.argv[1:]) else 0)
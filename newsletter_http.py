@@ -0,0 +1,455 @@
+# 뉴스레터 HTTP 전송 계층
+# 뉴스/유튜브/oEmbed/썸네일/GitHub 업로드 등 모든 외부 요청이 이 모듈의 세션 하나를 공유함
+# 주석은 한국어로 설명합니다
+
+import os
+import json
+import time
+import hashlib
+import threading
+import urllib.parse
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from newsletter_telemetry import telemetry
+from newsletter_resilience import (RetryPolicy, CircuitBreaker, CircuitOpenError, LatencyWindow, ResilienceStats,
+                                   HTTP_HEDGE, HTTP_HEDGE_MIN_DELAY, RETRY_STATUSES, THROTTLE_STATUS)
+from newsletter_ratelimit import HostRateLimiter, parse_retry_after
+from newsletter_deadline import DeadlineExceeded
+
+# 호스트별 연결 풀 크기 (동시 요청 수에 맞춰 지정, 목록에 없는 호스트는 기본값 사용)
+DEFAULT_POOL_SIZE = 10
+HOST_POOL_SIZES = {
+    'news.google.com': 32,
+    'www.youtube.com': 16,
+    'img.youtube.com': 8,
+    'api.github.com': 4,
+}
+
+# 실행 간 유지되는 로컬 캐시 디렉터리 (HTTP 캐시 등, 환경변수 NEWSLETTER_CACHE_DIR로 변경 가능)
+CACHE_DIR = os.environ.get('NEWSLETTER_CACHE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), '.newsletter_cache')
+
+# HTTP 캐시 설정: TTL 이내에는 요청 없이 디스크에서 응답, 이후에는 조건부 GET으로 재검증
+HTTP_CACHE_TTL = int(os.environ.get('HTTP_CACHE_TTL') or 3600)  # 초
+HTTP_CACHE_MAX_BYTES = int(os.environ.get('HTTP_CACHE_MAX_BYTES') or 64 * 1024 * 1024)
+
+
+class TransportStats:
+    """호스트별 요청 수와 신규 연결 수를 집계 (요청 수 - 신규 연결 수 = 재사용 횟수)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.connections = {}
+
+    def count_request(self, host):
+        with self._lock:
+            self.requests[host] = self.requests.get(host, 0) + 1
+
+    def count_connection(self, host):
+        with self._lock:
+            self.connections[host] = self.connections.get(host, 0) + 1
+
+    def summary(self):
+        """호스트별 {requests, new_connections, reused} 딕셔너리 반환"""
+        with self._lock:
+            result = {}
+            for host, count in self.requests.items():
+                opened = self.connections.get(host, 0)
+                result[host] = {
+                    'requests': count,
+                    'new_connections': opened,
+                    'reused': max(count - opened, 0),
+                }
+            return result
+
+
+class HttpCache:
+    """
+    URL 단위 디스크 HTTP 캐시 (본문 + ETag/Last-Modified 저장)
+    - TTL 이내: 네트워크 요청 없이 저장된 본문 반환
+    - TTL 경과: If-None-Match/If-Modified-Since 조건부 GET, 304면 저장본 재사용
+    - 전체 용량이 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    """
+
+    def __init__(self, directory, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.entries = {}  # key -> 메타데이터
+        self.counts = {'hit': 0, 'revalidated': 0, 'miss': 0}
+        # 기존 캐시 메타데이터 로드
+        for name in (os.listdir(directory) if os.path.isdir(directory) else []):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if os.path.exists(self._body_path(meta['key'])):
+                    self.entries[meta['key']] = meta
+            except Exception:
+                continue
+
+    @staticmethod
+    def key_for(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, key + '.body')
+
+    def _meta_path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def _write_meta(self, meta):
+        # 같은 키를 여러 스레드가 동시에 쓸 수 있으므로 임시 파일명에 스레드 ID 포함
+        tmp_path = f"{self._meta_path(meta['key'])}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, self._meta_path(meta['key']))
+
+    def lookup(self, url):
+        """저장된 메타데이터 반환 (없으면 None)"""
+        with self._lock:
+            return self.entries.get(self.key_for(url))
+
+    def is_fresh(self, meta):
+        return time.time() - meta['stored_at'] < self.ttl
+
+    def conditional_headers(self, meta):
+        """재검증용 조건부 요청 헤더"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load(self, meta, status):
+        """저장된 본문으로 requests.Response 객체를 만들어 반환 (X-Cache 헤더에 hit/revalidated 표시)"""
+        with open(self._body_path(meta['key']), 'rb') as f:
+            body = f.read()
+        with self._lock:
+            self.counts[status] += 1
+            meta['last_access'] = time.time()
+        self._write_meta(meta)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.url = meta['url']
+        response.encoding = meta.get('encoding')
+        response.headers = CaseInsensitiveDict({
+            'Content-Type': meta.get('content_type', ''),
+            'X-Cache': status,
+        })
+        if meta.get('etag'):
+            response.headers['ETag'] = meta['etag']
+        if meta.get('last_modified'):
+            response.headers['Last-Modified'] = meta['last_modified']
+        return response
+
+    def refresh(self, meta, response):
+        """304 응답 수신 시 저장 시각 갱신 후 저장본 반환"""
+        with self._lock:
+            meta['stored_at'] = time.time()
+            meta['etag'] = response.headers.get('ETag', meta.get('etag'))
+            meta['last_modified'] = response.headers.get('Last-Modified', meta.get('last_modified'))
+        return self.load(meta, 'revalidated')
+
+    def store(self, url, response):
+        """200 응답 본문과 검증자(ETag/Last-Modified)를 저장"""
+        key = self.key_for(url)
+        body = response.content
+        now = time.time()
+        meta = {
+            'key': key,
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type', ''),
+            'encoding': response.encoding,
+            'size': len(body),
+            'stored_at': now,
+            'last_access': now,
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{self._body_path(key)}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, self._body_path(key))
+        self._write_meta(meta)
+        with self._lock:
+            self.counts['miss'] += 1
+            self.entries[key] = meta
+        self.evict()
+        response.headers['X-Cache'] = 'miss'
+
+    def evict(self):
+        """전체 용량이 한도를 넘으면 최근 사용 시각이 오래된 순으로 삭제"""
+        with self._lock:
+            total = sum(meta['size'] for meta in self.entries.values())
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for meta in sorted(self.entries.values(), key=lambda m: m['last_access']):
+                if total <= self.max_bytes:
+                    break
+                total -= meta['size']
+                victims.append(meta['key'])
+            for key in victims:
+                del self.entries[key]
+        for key in victims:
+            for path in (self._body_path(key), self._meta_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def report(self):
+        return (f"💾 HTTP 캐시: 디스크 적중 {self.counts['hit']}건 / 재검증(304) {self.counts['revalidated']}건 / "
+                f"신규 다운로드 {self.counts['miss']}건")
+
+
+class PooledAdapter(HTTPAdapter):
+    """신규 연결 생성과 요청 횟수를 TransportStats에 기록하는 HTTPAdapter"""
+
+    def __init__(self, stats, pool_size):
+        self.stats = stats
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        # 연결 풀이 새 소켓을 열 때마다 호스트별로 카운트
+        class CountingHTTPPool(HTTPConnectionPool):
+            def _new_conn(self):
+                stats.count_connection(self.host)
+                return super()._new_conn()
+
+        class CountingHTTPSPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                stats.count_connection(self.host)
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPPool,
+            'https': CountingHTTPSPool,
+        }
+
+    def send(self, request, **kwargs):
+        self.stats.count_request(urllib.parse.urlsplit(request.url).hostname or '')
+        return super().send(request, **kwargs)
+
+
+class HttpTransport:
+    """
+    keep-alive 연결 풀을 공유하는 HTTP 세션
+    - 호스트마다 별도 크기의 연결 풀 사용 (HOST_POOL_SIZES)
+    - gzip 압축 응답 협상
+    - report()로 연결 재사용 횟수(절약된 TCP+TLS 핸드셰이크) 확인
+    - get(url, use_cache=True)로 디스크 HTTP 캐시 사용
+    - 멱등 요청 재시도(지터 지수 백오프), 호스트별 서킷 브레이커, 헤지 요청(hedge=True 또는 HTTP_HEDGE=1)
+    - 실행 종료 시 close()로 헤지 요청 스레드풀/연결 풀 정리
+    - 호스트별 토큰 버킷 속도 제한 (HOST_RATE_LIMITS, 429/Retry-After 수신 시 해당 호스트 일시 정지 후 감속)
+    """
+
+    def __init__(self, host_pool_sizes=None, default_pool_size=DEFAULT_POOL_SIZE, cache_dir=None,
+                 retry=None, hedge=HTTP_HEDGE, rate_limits=None):
+        self.cache = HttpCache(cache_dir or os.path.join(CACHE_DIR, 'http'))
+        self.stats = TransportStats()
+        self.retry = retry or RetryPolicy()
+        self.hedge = hedge
+        self.resilience = ResilienceStats()
+        self.latency = LatencyWindow()
+        self.limiter = HostRateLimiter(rate_limits)
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self._hedge_executor = None
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        default_adapter = PooledAdapter(self.stats, default_pool_size)
+        self.session.mount('https://', default_adapter)
+        self.session.mount('http://', default_adapter)
+        # 호스트별 전용 어댑터 (requests는 가장 긴 접두어가 일치하는 어댑터를 사용)
+        sizes = HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes
+        for host, size in sizes.items():
+            adapter = PooledAdapter(self.stats, size)
+            self.session.mount(f'https://{host}/', adapter)
+            self.session.mount(f'http://{host}/', adapter)
+
+    def breaker(self, host):
+        """호스트별 서킷 브레이커 (처음 요청할 때 생성)"""
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker()
+            return self._breakers[host]
+
+    def _count(self, host, field):
+        self.resilience.count(host, field)
+        telemetry.count(f'http_{field}')
+
+    def _hedged(self, host, delay, method, url, deadline=None, **kwargs):
+        """
+        응답이 delay 안에 오지 않으면 같은 요청을 한 번 더 보내 먼저 성공한 응답 반환 (늦게 온 응답은 닫음)
+        헤지 요청의 속도 제한 대기가 단계 마감(deadline)을 넘기면 헤지 없이 첫 요청의 응답을 기다림
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix='hedge')
+        primary = self._hedge_executor.submit(self.session.request, method, url, **kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        try:
+            self.limiter.acquire(host, deadline)
+        except DeadlineExceeded:
+            return primary.result()
+        self._count(host, 'hedges')
+        hedge = self._hedge_executor.submit(self.session.request, method, url, **kwargs)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count(host, 'hedges_won')
+                    for loser in pending:
+                        loser.add_done_callback(lambda f: f.exception() is None and f.result().close())
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _attempt(self, host, method, url, hedge=None, deadline=None, **kwargs):
+        """요청 1회 (헤지 대상이면 호스트의 최근 지연 p95를 넘길 때 중복 요청)"""
+        if (self.hedge if hedge is None else hedge) and method == 'GET' and not kwargs.get('stream'):
+            p95 = self.latency.p95(host)
+            if p95 is not None:
+                return self._hedged(host, max(p95, HTTP_HEDGE_MIN_DELAY), method, url, deadline, **kwargs)
+        return self.session.request(method, url, **kwargs)
+
+    def _send(self, method, url, cache=None, deadline=None, **kwargs):
+        """
+        실제 요청 전송 + 계측 기록 (지연/바이트/상태/캐시 결과, 예외도 기록 후 그대로 전달)
+        멱등 요청은 연결 오류/타임아웃/5xx/429 응답 시 재시도, 서킷 브레이커가 열린 호스트는 즉시 CircuitOpenError
+        보내기 전에 호스트의 속도 제한 토큰을 기다리며, 기다린 시간은 요청 기록의 throttle_s로 남음
+        deadline(StageDeadline): 시도마다 timeout을 남은 시간으로 줄이고, 마감이 지났거나 속도 제한 대기가 마감을 넘기면 보내지 않고 DeadlineExceeded
+        (재시도 대기도 남은 시간 안으로 줄이고, 재시도에 줄 최소 timeout도 남지 않으면 마지막 결과를 그대로 반환)
+        """
+        host = urllib.parse.urlsplit(url).hostname or ''
+        breaker = self.breaker(host)
+        timeout = kwargs.get('timeout')
+        attempt = 0
+        while True:
+            if deadline is not None:
+                kwargs['timeout'] = deadline.clamp(timeout)
+            if not breaker.allow():
+                self._count(host, 'rejected')
+                error = CircuitOpenError(f'{host} 연속 실패로 요청 중단 (서킷 브레이커 열림)')
+                telemetry.record_request(method, url, cache=cache, error=f'{type(error).__name__}: {error}')
+                raise error
+            try:
+                waited = self.limiter.acquire(host, deadline)
+            except BaseException:
+                # 속도 제한 대기가 마감을 넘겨 보내지 못함 (half-open 시험 요청 자리가 묶이지 않도록 반환)
+                breaker.release_trial()
+                raise
+            start = time.perf_counter()
+            try:
+                response = self._attempt(host, method, url, deadline=deadline, **kwargs)
+            except Exception as e:
+                telemetry.record_request(method, url, latency=time.perf_counter() - start, cache=cache,
+                                         error=f'{type(e).__name__}: {e}', throttle=waited)
+                if not isinstance(e, requests.RequestException):
+                    # 요청 오류가 아니면 호스트 상태를 판정할 수 없으므로 실패로 세지 않고 시험 요청 자리만 반환
+                    breaker.release_trial()
+                elif breaker.record(False):
+                    self._count(host, 'opened')
+                if not self.retry.should_retry(method, attempt, error=e, remaining=deadline.remaining() if deadline else None):
+                    raise
+            else:
+                latency = time.perf_counter() - start
+                status_cache = 'revalidated' if cache and response.status_code == 304 else cache
+                telemetry.record_request(method, url, response.status_code, latency, len(response.content), status_cache,
+                                         throttle=waited)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if response.status_code == THROTTLE_STATUS or (response.status_code == 503 and retry_after is not None):
+                    self.limiter.throttled(host, retry_after)
+                elif response.status_code < 400:
+                    self.limiter.succeeded(host)
+                # 429는 호스트가 살아 있다는 응답이므로 서킷 브레이커 실패로 세지 않음
+                failed = response.status_code in RETRY_STATUSES and response.status_code != THROTTLE_STATUS
+                if breaker.record(not failed):
+                    self._count(host, 'opened')
+                if response.status_code < 400:
+                    self.latency.add(host, latency)
+                if not self.retry.should_retry(method, attempt, response=response,
+                                               remaining=deadline.remaining() if deadline else None):
+                    return response
+                response.close()
+            self._count(host, 'retries')
+            time.sleep(self.retry.delay(attempt, deadline.remaining() if deadline else None))
+            attempt += 1
+
+    def request(self, method, url, **kwargs):
+        return self._send(method, url, **kwargs)
+
+    def get(self, url, use_cache=False, **kwargs):
+        if not use_cache:
+            return self._send('GET', url, **kwargs)
+        # 캐시 조회: TTL 이내면 요청 없이 반환, 지났으면 조건부 GET으로 재검증
+        meta = self.cache.lookup(url)
+        if meta and self.cache.is_fresh(meta):
+            response = self.cache.load(meta, 'hit')
+            telemetry.record_request('GET', url, 200, 0.0, len(response.content), 'hit')
+            return response
+        if meta:
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers.update(self.cache.conditional_headers(meta))
+            kwargs['headers'] = headers
+        response = self._send('GET', url, cache='miss', **kwargs)
+        if meta and response.status_code == 304:
+            return self.cache.refresh(meta, response)
+        if response.status_code == 200:
+            self.cache.store(url, response)
+        return response
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """
+        실행 종료 시 헤지 요청 스레드풀과 연결 풀 정리
+        (아직 시작하지 않은 헤지 요청은 취소, 진행 중인 요청은 timeout까지만 실행, 이후 요청하면 다시 생성)
+        """
+        with self._lock:
+            executor, self._hedge_executor = self._hedge_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def report(self):
+        """호스트별 연결 재사용 현황을 콘솔용 문자열로 반환"""
+        lines = ['🔌 HTTP 연결 재사용 현황']
+        total_requests = total_reused = 0
+        for host, s in sorted(self.stats.summary().items()):
+            lines.append(f"   {host}: 요청 {s['requests']}건 / 신규 연결 {s['new_connections']}개 / 재사용 {s['reused']}회")
+            total_requests += s['requests']
+            total_reused += s['reused']
+        lines.append(f'   합계: 요청 {total_requests}건 중 {total_reused}건이 기존 연결 재사용 (핸드셰이크 절약)')
+        lines.append(self.cache.report())
+        lines.append(self.resilience.report())
+        lines.append(self.limiter.report())
+        return '\n'.join(lines)
+
+
+# 프로그램 전체에서 공유하는 전송 계층 인스턴스
+transport = HttpTransport()
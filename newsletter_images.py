@@ -0,0 +1,138 @@
+# 뉴스레터 썸네일 처리
+# 유튜브 썸네일을 동시에 받아 표시 크기(160x90)로 줄여 재압축하고, 원본 내용 해시 기준으로 디스크에 보관
+# 이메일은 cid: 참조 + MIME related 첨부, 브라우저 버전은 작은 data URI로 사용 (렌더링 단계에는 네트워크 요청 없음)
+# 주석은 한국어로 설명합니다
+
+import io
+import os
+import base64
+import hashlib
+import threading
+from collections import namedtuple
+
+from newsletter_http import transport, CACHE_DIR
+from newsletter_telemetry import telemetry
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow가 없으면 원본 이미지를 그대로 사용
+    Image = None
+
+# 뉴스레터 썸네일 표시 크기와 재압축 품질
+THUMBNAIL_SIZE = (160, 90)
+THUMBNAIL_QUALITY = 80
+# 썸네일 디스크 캐시 최대 파일 수 (초과 시 오래 사용하지 않은 파일부터 삭제)
+THUMBNAIL_CACHE_MAX_FILES = 500
+
+# 처리된 썸네일 1건 (cid: 이메일 Content-ID, data: 이미지 바이트, subtype: MIME 하위 유형)
+Thumbnail = namedtuple('Thumbnail', ['cid', 'data', 'subtype'])
+
+
+def downscale(data, size=THUMBNAIL_SIZE, quality=THUMBNAIL_QUALITY):
+    """이미지를 size 안에 들어오도록 줄이고 JPEG로 재압축 (Pillow가 없거나 실패하면 원본 반환)"""
+    if Image is None:
+        return data
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image = image.convert('RGB')
+            image.thumbnail(size, Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, 'JPEG', quality=quality, optimize=True, progressive=True)
+    except Exception:
+        return data
+    # 이미 작은 이미지는 재압축 결과가 더 클 수 있으므로 작은 쪽 사용
+    return output.getvalue() if output.tell() < len(data) else data
+
+
+class ThumbnailStore:
+    """
+    내용 주소 기반 썸네일 디스크 캐시
+    - 원본은 transport의 HTTP 캐시로 받고, 축소/재압축 결과는 원본 SHA-256 이름으로 저장
+    - 같은 이미지는 URL이 달라도 한 번만 처리하며, 다음 실행에서는 재처리 없이 재사용
+    """
+
+    def __init__(self, directory=None, max_files=THUMBNAIL_CACHE_MAX_FILES):
+        self.directory = directory or os.path.join(CACHE_DIR, 'thumbnails')
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self.counts = {'cached': 0, 'processed': 0, 'failed': 0}
+
+    def _count(self, status):
+        with self._lock:
+            self.counts[status] += 1
+
+    def _path(self, digest):
+        width, height = THUMBNAIL_SIZE
+        return os.path.join(self.directory, f'{digest}-{width}x{height}.jpg')
+
+    def get(self, url):
+        """썸네일 URL → Thumbnail (실패 시 None)"""
+        with telemetry.track('thumbnail', query=url):
+            response = transport.get(url, use_cache=True, timeout=5, verify=False)
+        if response.status_code != 200 or not response.content:
+            return None
+        digest = hashlib.sha256(response.content).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # 최근 사용 시각 갱신 (정리 기준)
+            self._count('cached')
+        else:
+            data = downscale(response.content)
+            os.makedirs(self.directory, exist_ok=True)
+            # 같은 이미지를 여러 스레드가 동시에 쓸 수 있으므로 임시 파일명에 스레드 ID 포함
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._count('processed')
+        subtype = 'png' if data.startswith(b'\x89PNG') else 'jpeg'
+        return Thumbnail(f'thumb-{digest[:16]}@newsletter', data, subtype)
+
+    def fetch_all(self, urls, max_workers=8):
+        """여러 썸네일을 동시에 받아 {URL: Thumbnail} 반환 (실패한 URL은 제외)"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        def run(url):
+            try:
+                return self.get(url)
+            except Exception:
+                return None
+
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if not urls:
+            return {}
+        thumbnails = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+            for url, thumbnail in zip(urls, executor.map(run, urls)):
+                if thumbnail:
+                    thumbnails[url] = thumbnail
+                else:
+                    self._count('failed')
+        self.prune()
+        return thumbnails
+
+    def prune(self):
+        """파일 수가 한도를 넘으면 최근 사용 시각이 오래된 순으로 삭제"""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith('.jpg')]
+        except OSError:
+            return
+        if len(names) <= self.max_files:
+            return
+        paths = sorted((os.path.join(self.directory, name) for name in names), key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def report(self):
+        return (f"🖼️ 썸네일: 캐시 재사용 {self.counts['cached']}건 / 신규 처리 {self.counts['processed']}건 / "
+                f"실패 {self.counts['failed']}건")
+
+
+def data_uri(thumbnail):
+    """브라우저 버전용 data URI"""
+    return f'data:image/{thumbnail.subtype};base64,{base64.b64encode(thumbnail.data).decode("ascii")}'
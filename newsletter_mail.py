@@ -0,0 +1,208 @@
+# 뉴스레터 대량 메일 발송
+# 인증된 SMTP 연결 하나를 여러 수신자에게 재사용하고, 발송 속도 제한/수신자별 실패 추적/재시도를 처리
+# 주석은 한국어로 설명합니다
+
+import json
+import time
+import smtplib
+
+# 기본 발송 설정
+DEFAULT_RATE_PER_MINUTE = 30        # 분당 최대 발송 건수 (0이면 제한 없음)
+DEFAULT_MAX_RETRIES = 3             # 일시 오류(4xx, 연결 끊김) 수신자의 재시도 횟수
+DEFAULT_RETRY_DELAY = 5.0           # 재시도 라운드 대기 시간 (초, 라운드마다 2배)
+DEFAULT_MESSAGES_PER_CONNECTION = 100  # 연결 하나로 보낼 최대 건수 (서버 제한 대비 주기적 재연결)
+
+
+def load_recipients(path=None, inline=''):
+    """
+    수신자 목록 읽기 (파일: 한 줄에 한 주소, '#' 뒤는 주석 / inline: 쉼표·세미콜론 구분 문자열)
+    중복 주소는 대소문자 무시로 한 번만, 순서 유지
+    """
+    addresses = []
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                addresses.extend(line.split('#', 1)[0].replace(';', ',').split(','))
+    addresses.extend(inline.replace(';', ',').split(','))
+    unique = {}
+    for address in addresses:
+        address = address.strip()
+        if address and '@' in address:
+            unique.setdefault(address.lower(), address)
+    return list(unique.values())
+
+
+def load_subscriptions(path):
+    """
+    구독 설정(JSON) 읽기 → {소문자 주소: 구독 섹션 목록}
+    형식: {"profiles": {"프로필명": ["섹션명", ...]}, "subscribers": {"주소": "프로필명" 또는 ["섹션명", ...]}}
+    설정에 없는 수신자는 전체 호를 받음 (파일이 없거나 형식이 잘못되었으면 빈 dict → 모두 전체 호)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        # JSON 문법 오류/인코딩 오류로 발송 전체가 멈추지 않도록 전체 호 발송으로 대체
+        print(f'⚠️ 구독 설정 파일을 읽을 수 없어 모든 수신자에게 전체 호를 발송합니다 ({path}: {e})')
+        return {}
+    if not isinstance(config, dict) or not isinstance(config.get('profiles', {}), dict) \
+            or not isinstance(config.get('subscribers', {}), dict):
+        print(f'⚠️ 구독 설정 형식이 올바르지 않아 모든 수신자에게 전체 호를 발송합니다 ({path})')
+        return {}
+    profiles = config.get('profiles', {})
+    subscriptions = {}
+    for address, choice in config.get('subscribers', {}).items():
+        sections = profiles.get(choice) if isinstance(choice, str) else choice
+        if not isinstance(sections, list):
+            print(f'⚠️ 구독 설정: {address}의 프로필 {choice!r}이(가) 없거나 섹션 목록이 아니어서 전체 호를 발송합니다')
+            continue
+        subscriptions[address.strip().lower()] = list(sections)
+    return subscriptions
+
+
+class DeliveryReport:
+    """대량 발송 결과 (수신자별 성공/실패, 재시도/재연결 횟수, 소요시간)"""
+
+    def __init__(self):
+        self.sent = []
+        self.failed = {}       # 수신자 -> 마지막 오류 내용
+        self.attempts = {}     # 수신자 -> 시도 횟수
+        self.retries = 0
+        self.reconnects = 0
+        self.throttled = 0.0   # 속도 제한으로 대기한 시간 (초)
+        self.elapsed = 0.0
+
+    def summary(self):
+        lines = [f'📮 대량 발송 결과: 성공 {len(self.sent)}건 / 실패 {len(self.failed)}건 '
+                 f'(재시도 {self.retries}회, 재연결 {self.reconnects}회, 속도 제한 대기 {self.throttled:.1f}초, '
+                 f'소요 {self.elapsed:.1f}초)']
+        for recipient, reason in self.failed.items():
+            lines.append(f'   ❌ {recipient}: {reason}')
+        return '\n'.join(lines)
+
+
+class BulkMailer:
+    """
+    SMTP 대량 발송기
+    - 연결/STARTTLS/로그인은 한 번만 하고 같은 연결로 여러 메시지 발송 (messages_per_connection마다 재연결)
+    - rate_per_minute로 발송 간격 제한
+    - 수신자별 오류 분류: 5xx 거부는 영구 실패, 4xx/연결 끊김은 재시도 라운드에서 다시 발송
+    """
+
+    def __init__(self, host, port, username='', password='', starttls=True,
+                 rate_per_minute=DEFAULT_RATE_PER_MINUTE, max_retries=DEFAULT_MAX_RETRIES,
+                 retry_delay=DEFAULT_RETRY_DELAY, messages_per_connection=DEFAULT_MESSAGES_PER_CONNECTION,
+                 timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.interval = 60.0 / rate_per_minute if rate_per_minute else 0.0
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.messages_per_connection = messages_per_connection
+        self.timeout = timeout
+        self.server = None
+        self._sent_on_connection = 0
+        self._next_send = 0.0
+
+    def connect(self):
+        self.close()
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        self.server = server
+        self._sent_on_connection = 0
+
+    def close(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+        self.server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _throttle(self, report):
+        now = time.monotonic()
+        if now < self._next_send:
+            report.throttled += self._next_send - now
+            time.sleep(self._next_send - now)
+        self._next_send = max(now, self._next_send) + self.interval
+
+    @staticmethod
+    def _classify(error):
+        """오류 → (재시도 여부, 설명)"""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            code, message = next(iter(error.recipients.values()))
+            return 400 <= code < 500, f'{code} {message.decode("utf-8", "replace") if isinstance(message, bytes) else message}'
+        if isinstance(error, smtplib.SMTPResponseException):
+            message = error.smtp_error.decode('utf-8', 'replace') if isinstance(error.smtp_error, bytes) else error.smtp_error
+            return 400 <= error.smtp_code < 500, f'{error.smtp_code} {message}'
+        # 연결 끊김/타임아웃 등은 재연결 후 재시도
+        return True, f'{type(error).__name__}: {error}'
+
+    def send_all(self, sender, recipients, build_message):
+        """
+        수신자마다 build_message(recipient)가 만든 메시지(bytes)를 발송하고 DeliveryReport 반환
+        일시 오류 수신자는 모든 수신자를 한 번 보낸 뒤 라운드 단위로 재시도 (대기 시간은 라운드마다 2배)
+        """
+        report = DeliveryReport()
+        start = time.monotonic()
+        pending = list(recipients)
+        connections = 0
+        for round_index in range(self.max_retries + 1):
+            if not pending:
+                break
+            if round_index:
+                report.retries += len(pending)
+                time.sleep(self.retry_delay * 2 ** (round_index - 1))
+            retry = []
+            for position, recipient in enumerate(pending):
+                if self.server is None or self._sent_on_connection >= self.messages_per_connection:
+                    if connections:
+                        report.reconnects += 1
+                    connections += 1
+                    try:
+                        self.connect()
+                    except Exception as e:
+                        # 연결/로그인 실패는 이번 라운드의 남은 수신자 전체에 해당 (인증 오류 등 영구 오류면 재시도 안 함)
+                        temporary, reason = self._classify(e)
+                        self.server = None
+                        for rest in pending[position:]:
+                            report.failed[rest] = reason
+                            if temporary:
+                                retry.append(rest)
+                        break
+                report.attempts[recipient] = report.attempts.get(recipient, 0) + 1
+                try:
+                    self._throttle(report)
+                    self.server.sendmail(sender, [recipient], build_message(recipient))
+                    self._sent_on_connection += 1
+                    report.sent.append(recipient)
+                    report.failed.pop(recipient, None)
+                except Exception as e:
+                    temporary, reason = self._classify(e)
+                    report.failed[recipient] = reason
+                    if isinstance(e, smtplib.SMTPRecipientsRefused):
+                        pass  # 수신자만 거부된 것이므로 연결은 계속 사용
+                    elif not isinstance(e, smtplib.SMTPResponseException) or e.smtp_code == 421:
+                        # 연결 상태를 알 수 없으므로 다음 발송 전에 새로 연결
+                        self.close()
+                    if temporary:
+                        retry.append(recipient)
+            pending = retry
+        self.close()
+        report.elapsed = time.monotonic() - start
+        return report
@@ -0,0 +1,282 @@
+# 뉴스레터 대량 발송 점검 (로컬 SMTP 싱크)
+# 표준 라이브러리만으로 만든 로컬 SMTP 서버를 띄우고 BulkMailer/개인화 발송을 실제 SMTP 대화로 실행하여
+# - 연결 재사용: messages_per_connection마다 한 번만 재연결하는지 (연결 수 = ceil(성공 건수 / 연결당 건수))
+# - 수신자별 To 헤더: 받은 메시지마다 To 헤더가 하나이고 RCPT 주소와 같은지
+# - 오류 분류: 5xx 거부는 재시도 없이 실패, 한 번만 4xx인 수신자는 재시도로 성공, 계속 4xx인 수신자는 재시도 후 실패
+# - 개인화 발송: 구독 조합별로 호가 한 번만 만들어지고 구독하지 않은 섹션이 빠지는지, 잘못된 구독 설정 파일은 전체 호로 대체되는지
+# 사용 예: python newsletter_mail_check.py --recipients 254 --per-connection 100
+# 주석은 한국어로 설명합니다
+
+import os
+import sys
+import json
+import math
+import email
+import argparse
+import tempfile
+import threading
+import socketserver
+
+from newsletter_mail import BulkMailer, load_subscriptions, DEFAULT_MESSAGES_PER_CONNECTION
+
+# 수신자 주소별 RCPT 응답 시나리오 (시도마다 앞에서부터 하나씩 사용, 마지막 응답은 계속 반복)
+REJECTED = 'reject@example.com'
+FLAKY = 'flaky@example.com'
+BUSY = 'busy@example.com'
+DEFAULT_REPLIES = {
+    REJECTED: ['550 5.1.1 No such user'],
+    FLAKY: ['451 4.3.0 Try again later', '250 OK'],
+    BUSY: ['452 4.2.2 Mailbox full'],
+}
+
+
+class SmtpSink:
+    """
+    로컬 SMTP 서버 (EHLO/HELO/MAIL/RCPT/DATA/RSET/NOOP/QUIT만 처리, 인증/TLS 없음)
+    받은 메시지를 (연결 번호, RCPT 주소 목록, 본문 bytes)로 보관하고 연결 수를 집계
+    replies: {주소: [RCPT 응답, ...]} - 시도마다 앞에서부터 사용, 마지막 응답은 계속 반복
+    """
+
+    def __init__(self, replies=None):
+        self.replies = {address.lower(): list(codes) for address, codes in (replies or {}).items()}
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(line.encode('ascii') + b'\r\n')
+
+            def handle(self):
+                with sink._lock:
+                    sink.connections += 1
+                    connection = sink.connections
+                self.reply('220 newsletter-sink ESMTP')
+                rcpts = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command, _, argument = line.decode('utf-8', 'replace').strip().partition(' ')
+                    command = command.upper()
+                    if command in ('EHLO', 'HELO'):
+                        self.reply('250 newsletter-sink')
+                    elif command == 'MAIL':
+                        rcpts = []
+                        self.reply('250 OK')
+                    elif command == 'RCPT':
+                        address = argument.partition(':')[2].strip().strip('<>')
+                        response = sink.rcpt_reply(address)
+                        if response.startswith('2'):
+                            rcpts.append(address)
+                        self.reply(response)
+                    elif command == 'DATA':
+                        if not rcpts:
+                            self.reply('503 5.5.1 No valid recipients')
+                            continue
+                        self.reply('354 End data with <CR><LF>.<CR><LF>')
+                        sink.store(connection, rcpts, self.read_data())
+                        rcpts = []
+                        self.reply('250 OK')
+                    elif command == 'RSET':
+                        rcpts = []
+                        self.reply('250 OK')
+                    elif command == 'NOOP':
+                        self.reply('250 OK')
+                    elif command == 'QUIT':
+                        self.reply('221 Bye')
+                        return
+                    else:
+                        self.reply('502 5.5.2 Command not implemented')
+
+            def read_data(self):
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line == b'.\r\n':
+                        break
+                    # 점으로 시작하는 줄은 발신 측이 점을 하나 더 붙여 보냄 (dot-stuffing 해제)
+                    lines.append(line[1:] if line.startswith(b'..') else line)
+                return b''.join(lines)
+
+        self.server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+    def rcpt_reply(self, address):
+        with self._lock:
+            replies = self.replies.get(address.lower())
+            if not replies:
+                return '250 OK'
+            return replies.pop(0) if len(replies) > 1 else replies[0]
+
+    def store(self, connection, rcpts, data):
+        with self._lock:
+            self.messages.append((connection, list(rcpts), data))
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class CheckResults:
+    """점검 항목별 통과 여부 기록 및 출력"""
+
+    def __init__(self):
+        self.failures = 0
+
+    def check(self, name, ok, detail=''):
+        if not ok:
+            self.failures += 1
+        print(f"   {'✅' if ok else '❌'} {name}" + (f' ({detail})' if detail else ''))
+        return ok
+
+
+def check_to_headers(results, messages):
+    """받은 메시지마다 To 헤더가 하나뿐이고 RCPT 주소와 같은지"""
+    mismatched = []
+    for _, rcpts, data in messages:
+        to = email.message_from_bytes(data).get_all('To') or []
+        if len(rcpts) != 1 or to != rcpts:
+            mismatched.append(f'{rcpts} → {to}')
+    results.check('수신자별 To 헤더 (RCPT 주소와 일치, 헤더 1개)', not mismatched,
+                  f'불일치 {len(mismatched)}건: {mismatched[:3]}' if mismatched else f'{len(messages)}건')
+
+
+def check_bulk(results, count, per_connection, max_retries):
+    """BulkMailer: 연결 재사용, To 헤더, 5xx/4xx 분류와 재시도"""
+    recipients = [f'user{i:04d}@example.com' for i in range(max(0, count - len(DEFAULT_REPLIES)))]
+    recipients += list(DEFAULT_REPLIES)
+    print(f'📮 BulkMailer 점검: 수신자 {len(recipients)}명 / 연결당 {per_connection}건 / 재시도 {max_retries}회')
+    sink = SmtpSink(DEFAULT_REPLIES).start()
+    try:
+        payload = b'Subject: newsletter check\nFrom: sender@example.com\n\nbody\n'
+        mailer = BulkMailer('127.0.0.1', sink.port, starttls=False, rate_per_minute=0, max_retries=max_retries,
+                            retry_delay=0.01, messages_per_connection=per_connection, timeout=10)
+        with mailer:
+            report = mailer.send_all('sender@example.com', recipients,
+                                     lambda recipient: f'To: {recipient}\n'.encode('utf-8') + payload)
+    finally:
+        sink.stop()
+    print(report.summary())
+
+    expected_connections = math.ceil(len(report.sent) / per_connection)
+    results.check('발송 건수', len(report.sent) == len(recipients) - 2 and len(sink.messages) == len(report.sent),
+                  f'성공 {len(report.sent)}건 / 수신 {len(sink.messages)}건 / 수신자 {len(recipients)}명')
+    results.check('연결 재사용', sink.connections == expected_connections and report.reconnects == expected_connections - 1,
+                  f'연결 {sink.connections}회 (예상 {expected_connections}회), 재연결 {report.reconnects}회')
+    per_connection_counts = {}
+    for connection, _, _ in sink.messages:
+        per_connection_counts[connection] = per_connection_counts.get(connection, 0) + 1
+    results.check('연결당 발송 건수 상한', max(per_connection_counts.values(), default=0) <= per_connection,
+                  f'연결별 {sorted(per_connection_counts.values(), reverse=True)}')
+    check_to_headers(results, sink.messages)
+    results.check('5xx 거부는 재시도 없이 실패', REJECTED in report.failed and report.attempts.get(REJECTED) == 1,
+                  f"시도 {report.attempts.get(REJECTED)}회, {report.failed.get(REJECTED)}")
+    results.check('일시 4xx는 재시도로 성공', FLAKY in report.sent and report.attempts.get(FLAKY) == 2,
+                  f'시도 {report.attempts.get(FLAKY)}회')
+    results.check('계속 4xx면 재시도 후 실패', BUSY in report.failed and report.attempts.get(BUSY) == max_retries + 1,
+                  f"시도 {report.attempts.get(BUSY)}회, {report.failed.get(BUSY)}")
+
+
+def sample_news():
+    """개인화 점검용 뉴스 3개 섹션 (섹션마다 2건)"""
+    news = {}
+    for index, section in enumerate(('AX 활용 사례', '국내 AI 소식', '해외 AI 신규뉴스')):
+        news[section] = [f"<a href='https://example.com/{index}/{n}' target='_blank'>{section} 점검 기사 {n}</a> "
+                         f"<span style='color:#888;font-size:0.85em;'>(점검)</span>" for n in range(2)]
+    return news
+
+
+def html_body(data):
+    for part in email.message_from_bytes(data).walk():
+        if part.get_content_type() == 'text/html':
+            return part.get_payload(decode=True).decode(part.get_content_charset() or 'utf-8')
+    return ''
+
+
+def check_personalized(results):
+    """send_personalized_email: 구독 설정 파일 → 조합별 호, 수신자별 To 헤더, 잘못된 설정 파일 대체"""
+    news = sample_news()
+    sections = list(news)
+    subscriptions_config = {
+        'profiles': {'국내': [sections[1]]},
+        'subscribers': {'domestic1@example.com': '국내', 'Domestic2@Example.com': '국내',
+                        'cases@example.com': [sections[0]], 'unknown@example.com': '없는 프로필'},
+    }
+    recipients = ['domestic1@example.com', 'domestic2@example.com', 'cases@example.com',
+                  'unknown@example.com', 'all1@example.com', 'all2@example.com']
+    expected = {
+        'domestic1@example.com': [sections[1]], 'domestic2@example.com': [sections[1]],
+        'cases@example.com': [sections[0]],
+    }
+
+    # 발송 설정은 모듈 로드 시 정해지므로 import 전에 로컬 싱크로 지정 (인증 없음, 속도 제한 없음)
+    sink = SmtpSink().start()
+    work_dir = tempfile.mkdtemp(prefix='newsletter-mailcheck-')
+    os.environ.update({'NEWSLETTER_CACHE_DIR': work_dir, 'SMTP_SERVER': '127.0.0.1', 'SMTP_PORT': str(sink.port),
+                       'SMTP_STARTTLS': '0', 'SENDER_EMAIL': 'sender@example.com', 'BULK_RATE_PER_MINUTE': '0'})
+    os.environ.pop('EMAIL_PASSWORD', None)
+    import newsletter_sender as ns
+
+    print(f'🧩 개인화 발송 점검: 수신자 {len(recipients)}명 / 섹션 {len(sections)}개')
+    subscriptions_path = os.path.join(work_dir, 'subscriptions.json')
+    with open(subscriptions_path, 'w', encoding='utf-8') as f:
+        json.dump(subscriptions_config, f, ensure_ascii=False)
+    try:
+        report = ns.send_personalized_email(news, recipients=recipients,
+                                            subscriptions=load_subscriptions(subscriptions_path))
+    finally:
+        sink.stop()
+
+    results.check('발송 건수', len(report.sent) == len(recipients) and len(sink.messages) == len(recipients),
+                  f'성공 {len(report.sent)}건 / 수신 {len(sink.messages)}건')
+    results.check('연결 재사용', sink.connections == math.ceil(len(recipients) / DEFAULT_MESSAGES_PER_CONNECTION),
+                  f'연결 {sink.connections}회')
+    check_to_headers(results, sink.messages)
+    bodies = {}
+    wrong_sections = []
+    for _, rcpts, data in sink.messages:
+        recipient = rcpts[0]
+        html = html_body(data)
+        bodies.setdefault(html, []).append(recipient)
+        included = [section for section in sections if section in html]
+        if included != expected.get(recipient, sections):
+            wrong_sections.append(f'{recipient}: {included}')
+    results.check('구독 조합별 호 (조합 3종, 구독하지 않은 섹션 제외)', len(bodies) == 3 and not wrong_sections,
+                  f'호 {len(bodies)}종' + (f', 불일치 {wrong_sections[:3]}' if wrong_sections else ''))
+
+    # 잘못된 구독 설정 파일 (JSON 문법 오류/최상위가 객체가 아님) → 빈 dict (모두 전체 호)
+    broken = []
+    for content in ('{"profiles": {', '["not", "a", "dict"]', '{"subscribers": {"a@example.com": 3}}'):
+        with open(subscriptions_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        try:
+            if load_subscriptions(subscriptions_path) != {}:
+                broken.append(content)
+        except Exception as e:
+            broken.append(f'{content}: {type(e).__name__}')
+    results.check('잘못된 구독 설정 파일은 전체 호로 대체', not broken, f'실패 {broken}' if broken else '')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='뉴스레터 대량 발송 점검 (로컬 SMTP 싱크)')
+    parser.add_argument('--recipients', type=int, default=254, help='BulkMailer 점검 수신자 수 (실패 시나리오 3명 포함)')
+    parser.add_argument('--per-connection', type=int, default=100, help='연결당 최대 발송 건수')
+    parser.add_argument('--max-retries', type=int, default=3, help='일시 오류 재시도 횟수')
+    args = parser.parse_args(argv)
+
+    results = CheckResults()
+    check_bulk(results, args.recipients, args.per_connection, args.max_retries)
+    check_personalized(results)
+    print('✅ 모든 점검 통과' if not results.failures else f'❌ 점검 실패 {results.failures}건')
+    return results.failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if main(sys.argv[1:]) else 0)
@@ -8,6 +8,10 @@
 - trusted_sources: 신뢰할 수 있는 주요 언론사 목록 (이 언론사에 해당하는 뉴스만 우선 노출)
 - trusted_academic_sources: 신뢰할 수 있는 주요 학술기관/연구소/저널/기업 목록 (학술기관 AX Trend 카테고리로 출력)
 - categories: 카테고리별 뉴스 검색 키워드 (카테고리명: [키워드 리스트])
+- non_academic_keywords: 학술기관 AX Trend에서 제외할 비학술(정치/사회/연예 등) 제목 키워드
+- youtube_search_keywords: 유튜브 추천 영상 검색 키워드
+- youtube_channels: 채널 피드 모드(YOUTUBE_SOURCE_MODE=channels)에서 영상을 가져올 유튜브 채널 (채널명: 채널 ID)
+- it_ai_keywords: 유튜브 추천 영상 제목에 반드시 포함되어야 하는 IT/AI 키워드 (대소문자 무시)
 
 ※ 카테고리명, 키워드, 언론사, 학술기관 모두 자유롭게 추가/삭제/수정 가능
 ※ 이 파일만 수정하면 코드 변경 없이 뉴스레터 조건이 바뀜
@@ -57,6 +61,14 @@ trusted_academic_sources = [
     '네이처 (Nature)', '사이언스 (Science)', '셀 (Cell)', 'PNAS', 'IEEE', 'ACM', 'AAAI', 'IJCAI', 'CVPR', 'NeurIPS', 'ICLR', 'ICML', 'ECCV', 'AI 전문 저널 등'
 ]
 
+# 학술기관 AX Trend에서 제외할 정치, 사회, 연예 등 비학술적 키워드 (제목 기준)
+non_academic_keywords = [
+    '정치', '대통령', '총리', '국회', '의원', '선거', '정당', '정부', '청와대',
+    '사회', '사건', '사고', '범죄', '재판', '법원', '검찰', '경찰',
+    '연예', '연예인', '가수', '배우', '방송', '드라마', '영화', '스포츠',
+    '사망', '사건사고', '논란', '입학취소', '징계', '정치권', '정치인', '부정', '비리', '의혹', '논문 표절', '입시', '입학', '퇴출', '징계', '윤리', '조민', '김건희'
+]
+
 # 카테고리별 검색 키워드
 categories = {
     'AX 활용 사례': [
@@ -172,4 +184,31 @@ youtube_search_keywords = [
     'AI 실전 글로벌',
     'AI 실전 혁신',
     'AI 실전 미래'
-]
\ No newline at end of file
+]
+
+
+# 유튜브 추천 영상 채널 (채널 피드 모드에서 사용, 채널명: 채널 ID)
+# 채널 ID는 채널 페이지 주소 youtube.com/channel/<채널 ID> 또는 페이지 소스의 "channelId" 값
+youtube_channels = {
+    '노마드 코더 Nomad Coders': 'UCUpJs89fSBXNolQGOYKn0YQ',
+    '조코딩 JoCoding': 'UCQNE2JmbasNYbjGAcuBiRRg',
+    'Google DeepMind': 'UCP7jMXSY2xbc3KCAE0MHQ-A',
+    'OpenAI': 'UCXZCJLdBC09xxGZ6gcdrc6A',
+    'Two Minute Papers': 'UCbfYPyITQ-7l4upoX8nvctg',
+    'Andrej Karpathy': 'UCXUPKJO5MZQN11PqgIvyuvQ',
+    'AI Explained': 'UCNJ1Ymd5yFuUPtn21xtRbbw',
+    'Yannic Kilcher': 'UCZHmQk67mSJgfCCTn7xBfew',
+    'Lex Fridman': 'UCSHZKyawb77ixDdsGog4iWA',
+    'Fireship': 'UCsBjURrPoezykLs9EqgamOA',
+    '3Blue1Brown': 'UCYO_jab_esuFRV4b17AJtAw',
+}
+
+
+# 유튜브 추천 영상 IT/AI 키워드 필터 (이 키워드가 제목에 포함된 영상만 추천, 대소문자 무시)
+it_ai_keywords = [
+    'AI', '인공지능', 'GPT', 'ChatGPT', '챗GPT', '머신러닝', '딥러닝',
+    '데이터', '분석', '자동화', 'AX', 'DX', '디지털', '전환',
+    '로봇', '클라우드', '빅데이터', 'IT', 'RPA', '코딩', '프로그래밍',
+    '알고리즘', '테크', '기술', '혁신', '스마트', '플랫폼',
+    '비즈니스', '업무', '생산성', '효율', '솔루션'
+]
@@ -0,0 +1,186 @@
+# 뉴스레터 호스트별 요청 속도 제한 (토큰 버킷)
+# 동시 수집이 구글 뉴스/유튜브에 수백 건을 한꺼번에 보내 429나 차단 페이지를 받지 않도록
+# 호스트마다 초당 요청 수(rate)와 순간 허용량(burst)을 두고, 전송 계층의 모든 요청이 같은 버킷을 공유함
+# 429/Retry-After를 받으면 그 시각까지(최대 THROTTLE_MAX_PAUSE) 호스트 요청을 멈추고 속도를 절반으로 낮춘 뒤, 성공할 때마다 조금씩 회복
+# 주석은 한국어로 설명합니다
+
+import os
+import time
+import threading
+import email.utils
+
+from newsletter_deadline import DeadlineExceeded
+
+# 호스트별 기본 속도 제한 (초당 요청 수, 순간 허용량) - 목록에 없는 호스트는 제한 없음
+HOST_RATE_LIMITS = {
+    'news.google.com': (10.0, 20),
+    'www.youtube.com': (5.0, 10),
+    'img.youtube.com': (20.0, 20),
+}
+# 환경변수로 변경: HTTP_RATE_LIMITS='news.google.com=10:20,www.youtube.com=5:10' (rate 0이면 제한 해제)
+HTTP_RATE_LIMITS = os.environ.get('HTTP_RATE_LIMITS') or ''
+# Retry-After가 없는 429 응답을 받았을 때 호스트 요청을 멈추는 시간 (초)
+THROTTLE_DEFAULT_PAUSE = float(os.environ.get('THROTTLE_DEFAULT_PAUSE') or 2)
+# Retry-After로 호스트 요청을 멈추는 최대 시간 (초) - 'Retry-After: 3600' 하나로 모든 작업자가 멈추지 않도록 상한
+THROTTLE_MAX_PAUSE = float(os.environ.get('THROTTLE_MAX_PAUSE') or 5)
+# 429 후 속도 하한 (설정 속도 대비 비율), 성공 1건당 회복량 (설정 속도 대비 비율)
+THROTTLE_MIN_FACTOR = 0.125
+THROTTLE_RECOVERY = 0.05
+
+
+def parse_rate_limits(text):
+    """'host=rate:burst,...' → {host: (rate, burst)} (burst 생략 시 rate와 같음, 해석할 수 없는 항목은 경고 후 무시)"""
+    limits = {}
+    for part in text.split(','):
+        host, sep, spec = part.strip().partition('=')
+        if not sep:
+            continue
+        rate, _, burst = spec.partition(':')
+        try:
+            rate = float(rate)
+            burst = int(burst) if burst else max(1, int(rate))
+            if not host.strip() or rate < 0 or burst < 1:
+                raise ValueError('호스트가 없거나 값이 범위를 벗어남')
+        except ValueError as e:
+            print(f'⚠️ HTTP_RATE_LIMITS 항목 무시: {part.strip()!r} ({e})')
+            continue
+        limits[host.strip()] = (rate, burst)
+    return limits
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 기다릴 시간(초), 해석할 수 없으면 None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+class TokenBucket:
+    """
+    토큰 버킷 하나 (rate: 초당 충전량, burst: 최대 보유량)
+    acquire()는 토큰을 예약하고(음수 허용) 그 토큰이 충전될 때까지 잠금 밖에서 대기하므로
+    여러 스레드가 동시에 요청해도 호출 순서대로 간격을 두고 통과함
+    """
+
+    def __init__(self, rate, burst):
+        self.configured = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """토큰 1개 예약, 반환: 기다려야 하는 시간 (초)"""
+        with self._lock:
+            now = time.monotonic()
+            # 일시 정지 중이면 정지가 풀린 뒤부터 대기 시간 계산
+            start = max(now, self.paused_until)
+            if start > self.updated:
+                self._refill(start)
+            self.tokens -= 1
+            wait = start - now
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    def release(self):
+        """예약한 토큰 반환 (마감으로 요청을 보내지 않을 때)"""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def pause(self, seconds):
+        """429 수신: seconds 동안 요청 중단, 속도를 절반으로 낮추고 쌓인 토큰 비움"""
+        with self._lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.rate = max(self.configured * THROTTLE_MIN_FACTOR, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            # 정지 중에는 충전하지 않음 (정지가 풀리는 시각부터 충전)
+            self.updated = max(self.updated, self.paused_until)
+
+    def recover(self):
+        """정상 응답: 낮춘 속도를 설정값까지 조금씩 회복"""
+        with self._lock:
+            if self.rate < self.configured:
+                self.rate = min(self.configured, self.rate + self.configured * THROTTLE_RECOVERY)
+
+
+class HostRateLimiter:
+    """
+    호스트별 토큰 버킷 모음 (전송 계층 인스턴스 하나가 공유)
+    - acquire(host, deadline): 토큰이 생길 때까지 대기, 반환: 대기 시간 (초)
+      대기가 단계 마감(deadline.remaining())을 넘으면 기다리지 않고 토큰을 돌려준 뒤 DeadlineExceeded
+    - throttled(host, retry_after): 429/Retry-After 반영 (요청 중단은 THROTTLE_MAX_PAUSE까지)
+    - 호스트별 대기 시간 합계/대기 요청 수/429 수를 집계하여 report()로 확인
+    """
+
+    def __init__(self, limits=None):
+        if limits is None:
+            limits = dict(HOST_RATE_LIMITS)
+            limits.update(parse_rate_limits(HTTP_RATE_LIMITS))
+        self.buckets = {host: TokenBucket(rate, burst) for host, (rate, burst) in limits.items() if rate > 0}
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def _count(self, host, waited=0.0, throttled=0):
+        with self._lock:
+            stats = self.stats.setdefault(host, {'waits': 0, 'wait_s': 0.0, 'throttled': 0})
+            if waited > 0:
+                stats['waits'] += 1
+                stats['wait_s'] += waited
+            stats['throttled'] += throttled
+
+    def acquire(self, host, deadline=None):
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve()
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None and wait > remaining:
+            bucket.release()
+            raise DeadlineExceeded(f'{deadline.name} 단계 마감 전에 {host} 요청 차례가 오지 않음 (대기 {wait:.1f}초)')
+        if wait > 0:
+            time.sleep(wait)
+            self._count(host, waited=wait)
+        return wait
+
+    def throttled(self, host, retry_after=None):
+        """429 응답(또는 Retry-After가 붙은 503)을 받은 호스트는 Retry-After까지 요청 중단"""
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            # 제한 목록에 없던 호스트도 429를 받으면 그때부터 보수적으로 제한
+            with self._lock:
+                bucket = self.buckets.setdefault(host, TokenBucket(1.0, 1))
+        bucket.pause(min(THROTTLE_MAX_PAUSE, THROTTLE_DEFAULT_PAUSE if retry_after is None else retry_after))
+        self._count(host, throttled=1)
+
+    def succeeded(self, host):
+        bucket = self.buckets.get(host)
+        if bucket is not None:
+            bucket.recover()
+
+    def summary(self):
+        with self._lock:
+            return {host: dict(stats, wait_s=round(stats['wait_s'], 3)) for host, stats in self.stats.items()}
+
+    def report(self):
+        lines = ['🚦 요청 속도 제한: 대기 요청 수 / 대기 시간 합계 / 429 응답']
+        for host, s in sorted(self.summary().items()):
+            lines.append(f"   {host}: 대기 {s['waits']}건 / {s['wait_s']:.2f}초 / 429 {s['throttled']}건")
+        if len(lines) == 1:
+            lines.append('   대기 없음')
+        return '\n'.join(lines)
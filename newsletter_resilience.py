@@ -0,0 +1,173 @@
+# 뉴스레터 외부 요청 복원력 정책 (재시도/서킷 브레이커/헤지 요청)
+# - 멱등 요청(GET/HEAD)은 연결 오류/타임아웃/5xx/429 응답 시 지터를 넣은 지수 백오프로 재시도
+# - 호스트별 서킷 브레이커: 연속 실패가 기준을 넘으면 일정 시간 요청을 보내지 않고 즉시 실패 (구글 뉴스/유튜브 장애 시 대기 시간 절약)
+# - 헤지 요청: 호스트의 최근 지연 p95를 넘도록 응답이 없으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용
+# 주석은 한국어로 설명합니다
+
+import os
+import time
+import random
+import threading
+from collections import deque
+
+import requests
+
+# 재시도 설정: 최대 시도 횟수(첫 요청 포함), 백오프 기준/상한 (초)
+HTTP_RETRY_ATTEMPTS = int(os.environ.get('HTTP_RETRY_ATTEMPTS') or 3)
+HTTP_RETRY_BACKOFF = float(os.environ.get('HTTP_RETRY_BACKOFF') or 0.5)
+HTTP_RETRY_BACKOFF_MAX = float(os.environ.get('HTTP_RETRY_BACKOFF_MAX') or 4)
+# 단계 마감까지 남은 시간이 이보다 적으면 재시도하지 않음 (재시도 한 번에 줄 최소 timeout, 초)
+HTTP_RETRY_MIN_TIMEOUT = float(os.environ.get('HTTP_RETRY_MIN_TIMEOUT') or 1)
+# 서킷 브레이커 설정: 연속 실패 횟수 기준 (재시도 포함 시도 단위, 동시 요청 중 일부 키워드만 실패해도 열리지 않을 만큼), 열린 상태 유지 시간 (초)
+HTTP_BREAKER_FAILURES = int(os.environ.get('HTTP_BREAKER_FAILURES') or 8)
+HTTP_BREAKER_COOLDOWN = float(os.environ.get('HTTP_BREAKER_COOLDOWN') or 30)
+# 헤지 요청 설정 (1이면 사용), 지연 기록이 충분히 쌓인 호스트만 대상, 헤지 대기 최소 시간 (초)
+HTTP_HEDGE = (os.environ.get('HTTP_HEDGE') or '0') == '1'
+HTTP_HEDGE_MIN_SAMPLES = 20
+HTTP_HEDGE_MIN_DELAY = float(os.environ.get('HTTP_HEDGE_MIN_DELAY') or 0.2)
+
+# 재시도 대상: 멱등 메서드, 일시적 서버 오류 응답과 속도 제한 응답(429, 서킷 브레이커 실패로는 세지 않음)
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+THROTTLE_STATUS = 429
+RETRY_STATUSES = frozenset({THROTTLE_STATUS, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """서킷 브레이커가 열려 요청을 보내지 않음 (기존 호출자의 요청 실패 처리 경로를 그대로 탐)"""
+
+
+class RetryPolicy:
+    """
+    지터를 넣은 지수 백오프 (full jitter: 0 ~ min(상한, 기준 × 2^시도) 사이 임의 대기)
+    remaining(단계 마감까지 남은 시간)이 주어지면 재시도 요청에 min_timeout 이상이 남도록 대기를 줄이고,
+    그만큼도 남지 않았으면 재시도하지 않음
+    """
+
+    def __init__(self, attempts=HTTP_RETRY_ATTEMPTS, backoff=HTTP_RETRY_BACKOFF, backoff_max=HTTP_RETRY_BACKOFF_MAX,
+                 min_timeout=HTTP_RETRY_MIN_TIMEOUT):
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.min_timeout = min_timeout
+
+    def should_retry(self, method, attempt, response=None, error=None, remaining=None):
+        """attempt: 방금 끝난 시도 번호 (0부터), remaining: 마감까지 남은 시간 (초, None이면 제한 없음)"""
+        if method.upper() not in IDEMPOTENT_METHODS or attempt + 1 >= self.attempts:
+            return False
+        if remaining is not None and remaining < self.min_timeout:
+            return False
+        if isinstance(error, CircuitOpenError):
+            return False
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return response is not None and response.status_code in RETRY_STATUSES
+
+    def delay(self, attempt, remaining=None):
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+        if remaining is not None:
+            delay = max(0.0, min(delay, remaining - self.min_timeout))
+        return delay
+
+
+class CircuitBreaker:
+    """
+    호스트 하나의 서킷 브레이커
+    - closed: 정상, 연속 실패가 failures에 도달하면 open
+    - open: cooldown 동안 요청 거절 (즉시 CircuitOpenError)
+    - half-open: cooldown이 지나면 시험 요청 1건만 허용, 성공하면 closed / 실패하면 다시 open
+      (시험 요청을 보내지 못하면 release_trial()로 자리를 반환해야 다음 요청이 시험 요청이 될 수 있음)
+    """
+
+    def __init__(self, failures=HTTP_BREAKER_FAILURES, cooldown=HTTP_BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.consecutive = 0
+        self.opened_at = None
+        self.trial = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if time.monotonic() - self.opened_at >= self.cooldown else 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.trial:
+                # 시험 요청을 보낸 스레드 기록 (그 스레드만 release_trial()로 반환 가능)
+                self.trial = threading.get_ident()
+                return True
+            return False
+
+    def release_trial(self):
+        """허용받은 요청을 보내지 못했거나 성공/실패를 판정할 수 없을 때 시험 요청 자리를 반환 (다음 요청이 시험 요청이 됨)"""
+        with self._lock:
+            if self.trial == threading.get_ident():
+                self.trial = False
+
+    def record(self, success):
+        """요청 결과 반영, 반환: 이번 결과로 브레이커가 열렸으면 True"""
+        with self._lock:
+            if success:
+                self.consecutive = 0
+                self.opened_at = None
+                self.trial = False
+                return False
+            self.consecutive += 1
+            if self.trial or (self.opened_at is None and self.consecutive >= self.failures):
+                self.opened_at = time.monotonic()
+                self.trial = False
+                return True
+            return False
+
+
+class LatencyWindow:
+    """호스트별 최근 성공 요청 지연 (헤지 대기 시간 = 최근 p95)"""
+
+    def __init__(self, size=200):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.size = size
+
+    def add(self, host, latency):
+        with self._lock:
+            self.samples.setdefault(host, deque(maxlen=self.size)).append(latency)
+
+    def p95(self, host):
+        with self._lock:
+            samples = sorted(self.samples.get(host, ()))
+        if len(samples) < HTTP_HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+
+class ResilienceStats:
+    """호스트별 재시도/헤지/서킷 브레이커 집계"""
+
+    FIELDS = ('retries', 'hedges', 'hedges_won', 'rejected', 'opened')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hosts = {}
+
+    def count(self, host, field):
+        with self._lock:
+            counts = self.hosts.setdefault(host, dict.fromkeys(self.FIELDS, 0))
+            counts[field] += 1
+
+    def summary(self):
+        with self._lock:
+            return {host: dict(counts) for host, counts in self.hosts.items()}
+
+    def report(self):
+        lines = ['🛡️ 요청 복원력: 재시도 / 헤지 요청(먼저 도착) / 서킷 브레이커 열림(거절)']
+        for host, s in sorted(self.summary().items()):
+            lines.append(f"   {host}: 재시도 {s['retries']}회 / 헤지 {s['hedges']}건({s['hedges_won']}건) / "
+                         f"열림 {s['opened']}회({s['rejected']}건)")
+        if len(lines) == 1:
+            lines.append('   재시도/헤지/거절 없음')
+        return '\n'.join(lines)
@@ -0,0 +1,187 @@
+# 뉴스레터 RSS 파서
+# lxml iterparse로 <item>을 하나씩 읽고 바로 해제하여, 피드 크기와 무관하게 메모리를 일정하게 유지
+# 직접 실행하면 기존 BeautifulSoup 방식과 속도/메모리를 비교함: python newsletter_rss.py [RSS 파일...]
+# 주석은 한국어로 설명합니다
+
+import io
+import time
+from collections import namedtuple
+from email.utils import parsedate_tz, mktime_tz
+from lxml import etree
+
+# RSS 아이템 레코드 (title, link, source, pubDate 원문)
+RssItem = namedtuple('RssItem', ['title', 'link', 'source', 'pub_date'])
+
+# RSS 태그명 → RssItem 필드명
+_ITEM_FIELDS = {'title': 'title', 'link': 'link', 'source': 'source', 'pubDate': 'pub_date'}
+
+
+def _text(element):
+    """BeautifulSoup get_text(strip=True)와 같은 규칙으로 텍스트 추출"""
+    return ''.join(s.strip() for s in element.itertext())
+
+
+def iter_rss_items(data):
+    """
+    RSS 원문(bytes 또는 파일 객체)에서 RssItem을 순서대로 생성
+    - 처리한 <item> 요소는 즉시 비워서 트리가 쌓이지 않게 함
+    - 깨진 XML은 읽을 수 있는 데까지만 반환 (기존 BeautifulSoup 동작과 같이 예외를 내지 않음)
+    """
+    source = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+    parser = etree.iterparse(source, events=('end',), tag='{*}item', recover=True, resolve_entities=False)
+    try:
+        for _, element in parser:
+            fields = {}
+            for child in element:
+                tag = child.tag
+                if not isinstance(tag, str):
+                    continue  # 주석/처리 지시문
+                if '}' in tag:
+                    tag = tag.rsplit('}', 1)[1]
+                name = _ITEM_FIELDS.get(tag)
+                if name and name not in fields:
+                    fields[name] = _text(child)
+            yield RssItem(fields.get('title', ''), fields.get('link', ''),
+                          fields.get('source', ''), fields.get('pub_date', ''))
+            # 처리 끝난 요소와 앞선 형제 요소 해제
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+    except etree.XMLSyntaxError:
+        return
+
+
+# 주 단위 계산용 상수
+WEEK_SECONDS = 7 * 24 * 60 * 60
+
+
+def parse_pub_timestamp(pub_date):
+    """RFC-822 pubDate 문자열 → (UTC epoch 초, UTC 오프셋 초), 파싱 실패 시 (None, 0)"""
+    try:
+        parsed = parsedate_tz(pub_date) if pub_date else None
+        if not parsed:
+            return None, 0
+        return int(mktime_tz(parsed)), parsed[9] or 0
+    except (TypeError, ValueError, OverflowError):
+        return None, 0
+
+
+def week_bucket(wall_timestamp, week_origin, max_weeks=4):
+    """
+    기준 월요일 0시(week_origin) 대비 몇 주 전 월~일 구간인지 산술 계산 (1~max_weeks, 범위 밖이면 None)
+    두 값 모두 기사 현지 시각을 UTC처럼 취급한 epoch 초 (기존 tzinfo 제거 비교와 같은 기준)
+    """
+    diff = week_origin - wall_timestamp
+    if 0 < diff <= max_weeks * WEEK_SECONDS:
+        return -(-diff // WEEK_SECONDS)
+    return None
+
+
+class NewsItem:
+    """
+    수집된 뉴스 1건 (__slots__로 dict 대비 메모리 절약)
+    - pubDate는 생성 시 한 번만 파싱하여 epoch 정수(timestamp)로 보관, 정렬도 이 값 기준
+    - weeks_ago: 1=전주, 2=2주전, 3=3주전, 4=4주전, None=범위 밖
+    - trusted/academic/non_academic: 신뢰 언론사/학술기관/비학술 키워드 일치 여부
+    """
+    __slots__ = ('title', 'link', 'source', 'timestamp', 'utc_offset', 'weeks_ago',
+                 'trusted', 'academic', 'non_academic')
+
+    def __init__(self, title, link, source, timestamp, utc_offset=0, weeks_ago=None):
+        self.title = title
+        self.link = link
+        self.source = source
+        self.timestamp = timestamp
+        self.utc_offset = utc_offset
+        self.weeks_ago = weeks_ago
+        self.trusted = False
+        self.academic = False
+        self.non_academic = False
+
+    @classmethod
+    def from_rss(cls, item, week_origin):
+        """RssItem → NewsItem 변환 (날짜 파싱 1회, 주차는 산술 계산)"""
+        timestamp, utc_offset = parse_pub_timestamp(item.pub_date)
+        weeks_ago = None
+        if timestamp is not None:
+            weeks_ago = week_bucket(timestamp + utc_offset, week_origin)
+        return cls(item.title, item.link, item.source, timestamp, utc_offset, weeks_ago)
+
+    def date_label(self):
+        """표시용 날짜 (MM/DD, 2~3주 전 기사는 '🕐N주전' 표시)"""
+        if self.timestamp is None:
+            return ''
+        date_str = time.strftime('%m/%d', time.gmtime(self.timestamp + self.utc_offset))
+        if self.weeks_ago in (2, 3):
+            return f'{date_str} 🕐{self.weeks_ago}주전'
+        return date_str
+
+
+def parse_rss_items_bs4(text):
+    """기존 BeautifulSoup 트리 방식 (벤치마크 비교용)"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(text, 'xml')
+    items = []
+    for item in soup.find_all('item'):
+        items.append(RssItem(
+            item.find('title').get_text(strip=True) if item.find('title') else '',
+            item.find('link').get_text(strip=True) if item.find('link') else '',
+            item.find('source').get_text(strip=True) if item.find('source') else '',
+            item.find('pubDate').get_text(strip=True) if item.find('pubDate') else '',
+        ))
+    return items
+
+
+def make_sample_feed(item_count):
+    """벤치마크용 구글 뉴스 형식 합성 RSS"""
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>sample</title>']
+    for i in range(item_count):
+        parts.append(
+            f'<item><title>AI 반도체 투자 확대 발표 {i} - 연합뉴스</title>'
+            f'<link>https://news.google.com/rss/articles/sample{i}?oc=5</link>'
+            f'<guid isPermaLink="false">sample{i}</guid>'
+            f'<pubDate>Mon, 06 Oct 2025 0{i % 10}:00:00 GMT</pubDate>'
+            f'<description>&lt;a href="https://example.com/{i}"&gt;기사 {i}&lt;/a&gt;</description>'
+            f'<source url="https://www.yna.co.kr">연합뉴스</source></item>'
+        )
+    parts.append('</channel></rss>')
+    return ''.join(parts).encode('utf-8')
+
+
+def benchmark(feeds, repeat=5):
+    """피드 목록에 대해 두 파서의 평균 소요시간과 최대 메모리 비교 결과 출력"""
+    import tracemalloc
+
+    def measure(func, payload):
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            items = func(payload)
+        elapsed = (time.perf_counter() - start) / repeat
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return items, elapsed, peak
+
+    for name, data in feeds:
+        lxml_items, lxml_time, lxml_peak = measure(lambda d: list(iter_rss_items(d)), data)
+        bs4_items, bs4_time, bs4_peak = measure(lambda d: parse_rss_items_bs4(d.decode('utf-8', 'replace')), data)
+        same = '일치' if lxml_items == bs4_items else '불일치'
+        print(f'[{name}] {len(data) / 1024:.0f}KB, 아이템 {len(lxml_items)}개 (결과 {same})')
+        print(f'   BeautifulSoup : {bs4_time * 1000:8.1f} ms, 최대 메모리 {bs4_peak / 1024:8.0f} KB')
+        print(f'   lxml iterparse: {lxml_time * 1000:8.1f} ms, 최대 메모리 {lxml_peak / 1024:8.0f} KB '
+              f'({bs4_time / lxml_time if lxml_time else 0:.1f}배 빠름)')
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) > 1:
+        targets = []
+        for path in sys.argv[1:]:
+            with open(path, 'rb') as f:
+                targets.append((path, f.read()))
+    else:
+        # 구글 뉴스 RSS 1회 응답(약 100개) 기준 1배/10배/100배 합성 피드
+        targets = [(f'합성 {n}개', make_sample_feed(n)) for n in (100, 1000, 10000)]
+    benchmark(targets)
@@ -15,10 +15,23 @@ import webbrowser
 import os
 import base64
 import hashlib
-# 웹 크롤링을 위한 라이브러리
-import requests
-from bs4 import BeautifulSoup
+# 웹 크롤링을 위한 라이브러리 (모든 HTTP 요청은 연결 풀 공유 전송 계층 사용)
+from newsletter_http import transport, CACHE_DIR
+from newsletter_telemetry import telemetry
+from newsletter_filters import TitleDedupIndex, MultiPatternMatcher
+from newsletter_rss import iter_rss_items, NewsItem, week_bucket, WEEK_SECONDS
+from newsletter_store import ArticleStore, VideoMetadataCache, canonical_link, edition_key
+from newsletter_youtube import parse_search_results, channel_feed_url, iter_channel_feed
+from newsletter_images import ThumbnailStore
+from newsletter_template import render_newsletter, render_email, format_size_report, EMAIL_HTML_BUDGET, NewsletterFragments, YOUTUBE_SECTION, html_size
+from newsletter_github import GitHubPublisher, GITHUB_API_URL
+from newsletter_archive import ArchiveBuilder
+from newsletter_deadline import RunDeadline, GroupBudget, DeadlineExceeded, NO_DEADLINE
+from newsletter_mail import BulkMailer, load_recipients, load_subscriptions, DEFAULT_RATE_PER_MINUTE, DEFAULT_MAX_RETRIES
+import re
 import json
+import time
+import threading
 
 # ============================================================
 # GitHub 설정 (GitHub Pages 자동 업로드용)
@@ -56,267 +69,526 @@ GITHUB_BRANCH = 'main'  # 브랜치명
 GITHUB_PAGES_URL = 'https://khjgate.github.io/AlexGitHub'  # GitHub Pages URL
 
 
+# GitHub API 주소 (테스트 시 로컬 모의 서버로 변경 가능)
+GITHUB_API_URL = get_config_value('GITHUB_API_URL') or GITHUB_API_URL
+github_publisher = GitHubPublisher(GITHUB_REPO, GITHUB_BRANCH, GITHUB_TOKEN, GITHUB_API_URL)
+
+
+def upload_files_to_github(files, message=None):
+    """
+    여러 파일({레포 내 경로: 내용})을 GitHub에 커밋 하나로 업로드
+    원격 파일과 내용(git blob SHA)이 같은 파일은 건너뛰고, 모두 같으면 커밋하지 않음
+    """
+    if message is None:
+        message = f'Update {", ".join(files)} - {datetime.datetime.now().strftime("%Y-%m-%d %H:%M")}'
+    # 업로드 결과는 실행 계측 보고서(github_upload 이벤트)에 기록
+    try:
+        result = github_publisher.publish(files, message)
+    except Exception as e:
+        telemetry.event('github_upload', status='error', error=str(e), files=list(files))
+        print(f'❌ GitHub 업로드 실패: {e}')
+        return False
+    telemetry.event('github_upload', status='ok', commit=result.commit, changed=result.changed, unchanged=result.unchanged)
+    telemetry.count('github_files_uploaded', len(result.changed))
+    telemetry.count('github_files_skipped', len(result.unchanged))
+    if result.changed:
+        print(f'✅ GitHub 업로드 성공: {", ".join(result.changed)} (커밋 {result.commit[:7]})')
+    if result.unchanged:
+        print(f'⏭️ GitHub 업로드 생략 (변경 없음): {", ".join(result.unchanged)}')
+    return True
+
+
 def upload_to_github(file_content, file_name):
     """
     GitHub API를 사용하여 파일을 레포지토리에 업로드하는 함수
-    파일이 이미 존재하면 업데이트, 없으면 새로 생성
+    파일이 이미 존재하면 업데이트, 없으면 새로 생성 (내용이 같으면 생략)
     """
-    url = f'https://api.github.com/repos/{GITHUB_REPO}/contents/{file_name}'
-    headers = {
-        'Authorization': f'token {GITHUB_TOKEN}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
-    # 파일 내용을 base64로 인코딩
-    content_base64 = base64.b64encode(file_content.encode('utf-8')).decode('utf-8')
-    
-    # 기존 파일이 있는지 확인 (SHA 값 필요)
-    sha = None
+    return upload_files_to_github({file_name: file_content},
+                                  f'Update {file_name} - {datetime.datetime.now().strftime("%Y-%m-%d %H:%M")}')
+
+
+# GitHub Pages에 올리는 파일 경로 (최신 호, 지난 호 아카이브 디렉터리)
+GITHUB_LATEST_PATH = 'newsletter_preview_auto.html'
+GITHUB_ARCHIVE_DIR = 'archive'
+# 로컬 지난 호 아카이브 경로 (기본값은 레포 체크아웃의 archive/ - 업로드 경로와 같은 구조)
+ARCHIVE_DIR = get_config_value('ARCHIVE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), GITHUB_ARCHIVE_DIR)
+
+
+def build_archive(news, youtube_recommendations, rendered, edition_date=None):
+    """
+    이번 호를 로컬 지난 호 아카이브에 반영 (입력이 지난 기록과 같으면 페이지를 다시 만들지 않음)
+    호 번호는 기사 저장소와 같은 그 주 월요일 날짜 (같은 주에 다시 실행하면 같은 호 페이지를 갱신)
+    반환: 이번 실행에서 바뀐 아카이브 파일 {파일명: 내용}
+    """
+    edition = edition_key(edition_date)
+    page_url = f'{GITHUB_PAGES_URL}/{GITHUB_ARCHIVE_DIR}/{edition}.html'
+    archive = ArchiveBuilder(ARCHIVE_DIR)
+    archive.add_edition(edition, news, youtube_recommendations,
+                        lambda: rendered.html('browser').replace('{{web_version_url}}', page_url))
+    changed = archive.save()
+    print(archive.report())
+    return changed
+
+
+def publish_edition(rendered, archive_files, edition_date=None):
+    """
+    최신 호와 이번 실행에서 바뀐 아카이브 파일(build_archive() 결과)을 커밋 하나로 업로드
+    지난 호 페이지는 바뀌지 않았으면 업로드 대상에 들어가지 않음
+    """
+    files = {GITHUB_LATEST_PATH: rendered.html('browser').replace('{{web_version_url}}', f'{GITHUB_PAGES_URL}/{GITHUB_LATEST_PATH}')}
+    files.update({f'{GITHUB_ARCHIVE_DIR}/{name}': content for name, content in archive_files.items()})
+    return upload_files_to_github(files, f'Publish newsletter {edition_key(edition_date)}')
+
+
+# ============================================================
+# 동시 수집 엔진
+# 키워드별 요청을 스레드풀로 병렬 실행하여 전체 소요시간을 가장 느린 피드 수준으로 단축
+# ============================================================
+# 동시 요청 작업자 수 (환경변수 NEWS_FETCH_WORKERS로 조정 가능)
+NEWS_FETCH_WORKERS = int(get_config_value('NEWS_FETCH_WORKERS') or 16)
+# 제목 유사 중복 판정 방식 ('compat': 기존 포함/70% 규칙, 'minhash': 대량 후보용 LSH 근사)
+TITLE_DEDUP_MODE = get_config_value('TITLE_DEDUP_MODE') or 'compat'
+# 카테고리별 조기 종료 (1이면 사용): 전주 우선 대상 기사 5건이 모이면 남은 키워드 요청 생략
+# 생략한 키워드에 더 최근 기사가 있으면 선택 결과가 달라질 수 있는 근사이므로 기본값은 모든 키워드 요청
+NEWS_EARLY_STOP = (get_config_value('NEWS_EARLY_STOP') or '0') == '1'
+# 조기 종료 판정 사이에 카테고리별로 한 번에 요청하는 키워드 수
+NEWS_BATCH_SIZE = int(get_config_value('NEWS_BATCH_SIZE') or 4)
+# 기사 저장소 경로 (실행 간 기사 이력 유지, ':memory:'면 이번 실행에만 사용)
+ARTICLE_STORE_PATH = get_config_value('ARTICLE_STORE_PATH') or os.path.join(CACHE_DIR, 'articles.sqlite3')
+# 이번 호 기사를 발송 이력으로 기록 (1이면 기록) - 호를 게시하는 워크플로우 실행에서만 켜고,
+# 로컬 미리보기 실행에서는 꺼 두어 확인만 한 기사가 다음 호 후보에서 빠지지 않도록 함
+RECORD_SENT_EDITION = (get_config_value('RECORD_SENT_EDITION') or '0') == '1'
+# 유튜브 영상 정보(video_id → 제목/채널) 캐시 경로
+VIDEO_CACHE_PATH = get_config_value('VIDEO_CACHE_PATH') or os.path.join(CACHE_DIR, 'videos.sqlite3')
+# 실행 계측 보고서(JSON, Prometheus textfile) 저장 경로
+TELEMETRY_DIR = get_config_value('TELEMETRY_DIR') or os.path.join(CACHE_DIR, 'telemetry')
+# 실행 전체 시간 예산 (초, 0이면 제한 없음) - 뉴스 수집/유튜브 수집 단계에 나눠 배정하고 마감 후 남은 요청은 취소
+RUN_BUDGET_SECONDS = float(get_config_value('RUN_BUDGET_SECONDS') or 900)
+# 유튜브 추천 영상 수집 방식 ('search': 키워드 검색 결과 페이지, 'channels': 큐레이션 채널 Atom 피드)
+YOUTUBE_SOURCE_MODE = get_config_value('YOUTUBE_SOURCE_MODE') or 'search'
+
+
+def fetch_parallel(tasks, max_workers=None, deadline=None):
+    """
+    (함수, 인자 튜플) 목록을 스레드풀로 동시에 실행하고 입력 순서대로 결과 반환
+    실패한 작업은 예외 객체를 결과 자리에 그대로 담아 호출자가 기존처럼 건너뛸 수 있게 함
+    deadline(StageDeadline)이 지나면 아직 시작하지 않은 작업은 취소하고 결과 자리에 DeadlineExceeded를 담음
+    """
+    from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+    def run(task):
+        func, args = task
+        # 취소되기 전에 작업자가 집어 든 작업도 마감이 지났으면 실행하지 않음
+        if deadline is not None and deadline.expired():
+            return DeadlineExceeded(f'{deadline.name} 단계 마감')
+        try:
+            return func(*args)
+        except Exception as e:
+            return e
+
+    if not tasks:
+        return []
+    workers = max(1, min(max_workers or NEWS_FETCH_WORKERS, len(tasks)))
+    executor = ThreadPoolExecutor(max_workers=workers)
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            sha = response.json().get('sha')
-    except:
-        pass
-    
-    # 업로드 데이터 구성
-    data = {
-        'message': f'Update {file_name} - {datetime.datetime.now().strftime("%Y-%m-%d %H:%M")}',
-        'content': content_base64,
-        'branch': GITHUB_BRANCH
-    }
-    
-    # 기존 파일이 있으면 SHA 추가 (업데이트용)
-    if sha:
-        data['sha'] = sha
-    
-    # GitHub API로 파일 업로드/업데이트
-    log_path = os.path.join(os.path.dirname(__file__), 'github_upload_log.txt')
-    def log_print(msg):
-        print(msg)
-        with open(log_path, 'a', encoding='utf-8') as f:
-            f.write(msg + '\n')
+        futures = [executor.submit(run, task) for task in tasks]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=deadline.remaining() if deadline else None))
+            except FutureTimeout:
+                future.cancel()
+                results.append(DeadlineExceeded(f'{deadline.name} 단계 마감'))
+        return results
+    finally:
+        # 마감으로 남은 작업은 기다리지 않음 (진행 중인 요청은 시도마다 timeout이 남은 시간으로 줄고 마감 후 재시도하지 않아 곧 끝남)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def normalize_query(query):
+    """조회 키워드 정규화 (유니코드 NFC, 연속 공백 정리, 대소문자 무시) - 중복 판단용 키"""
+    import unicodedata
+    return ' '.join(unicodedata.normalize('NFC', query).split()).casefold()
+
+
+def plan_queries(query_groups):
+    """
+    그룹(카테고리)별 키워드 목록을 하나의 고유 조회 목록으로 통합
+    반환: (unique_queries, plan)
+      - unique_queries: 실제로 요청할 키워드 목록 (처음 등장한 표기 사용)
+      - plan[그룹명]: 그 그룹이 요청한 unique_queries 인덱스 목록 (그룹 내 중복 제거, 원래 순서 유지)
+    """
+    unique_queries = []
+    index_by_key = {}
+    plan = {}
+    for group, queries in query_groups.items():
+        indexes = []
+        for query in queries:
+            key = normalize_query(query)
+            if not key:
+                continue
+            if key not in index_by_key:
+                index_by_key[key] = len(unique_queries)
+                unique_queries.append(' '.join(query.split()))
+            if index_by_key[key] not in indexes:
+                indexes.append(index_by_key[key])
+        plan[group] = indexes
+    return unique_queries, plan
+
+
+class KeywordYieldStats:
+    """
+    카테고리별 키워드 수확량(선택 우선 대상인 전주 기사 수) 기록 - 실행 간 JSON 파일로 유지
+    지수이동평균으로 갱신하며, 기록이 없는 키워드는 먼저 요청하여 수확량을 측정함
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    @staticmethod
+    def _key(group, query):
+        return f'{group}\t{normalize_query(query)}'
+
+    def expected(self, group, query):
+        """기대 수확량 (기록 없으면 무한대 → 가장 먼저 요청)"""
+        entry = self.data.get(self._key(group, query))
+        return entry['ema'] if entry else float('inf')
+
+    def record(self, group, query, count, alpha=0.5):
+        key = self._key(group, query)
+        entry = self.data.get(key)
+        ema = count if entry is None else alpha * count + (1 - alpha) * entry['ema']
+        self.data[key] = {'ema': round(ema, 3), 'runs': (entry or {}).get('runs', 0) + 1}
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f'⚠️ 키워드 수확량 기록 저장 실패: {e}')
+
+
+def fetch_with_budget(query_plan, fetch, order_key, is_final, batch_size=None, max_workers=None, deadline=None):
+    """
+    카테고리(그룹)별로 키워드를 기대 수확량 순으로 batch_size개씩 요청하고,
+    is_final(group, results)가 True가 되면 그 그룹의 남은 요청을 생략하는 적응형 수집기
+    - fetch(index): 고유 조회 수집 함수 (여러 그룹이 같은 조회를 요청해도 1회만 실행)
+    - order_key(group, index): 요청 순서 정렬 키 (작을수록 먼저)
+    - results: 지금까지 받은 [(index, 결과 또는 예외)] (요청 순서)
+    - deadline(StageDeadline): 마감이 지나면 각 그룹의 남은(수확량 낮은) 요청은 보내지 않고,
+      마감까지 끝나지 않은 요청은 결과에서 제외하며 그 그룹은 degraded로 표시
+      단계 시간은 그룹별 작업 시간 몫(GroupBudget, 키워드 수 비율)으로 나눠 몫을 다 쓴 그룹도 남은 요청을 생략하고 degraded로 표시
+      (일찍 끝난 그룹의 남은 몫은 진행 중인 그룹이 나눠 씀)
+    반환: (feeds {index: 결과 또는 예외}, consumed {group: 실제 사용한 index 목록})
+    """
+    from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+    batch_size = max(1, batch_size or NEWS_BATCH_SIZE)
+    workers = max(1, max_workers or NEWS_FETCH_WORKERS)
+    budget = GroupBudget(deadline, {group: len(indexes) for group, indexes in query_plan.items()}, workers) if deadline else None
+    lock = threading.Lock()
+    futures = {}
+
+    def run(index, group):
+        if deadline is not None and deadline.expired():
+            return DeadlineExceeded(f'{deadline.name} 단계 마감')
+        start = time.monotonic()
+        try:
+            return fetch(index)
+        except Exception as e:
+            return e
+        finally:
+            # 실행 시간은 요청을 처음 보낸 그룹의 몫에서 차감
+            if budget:
+                budget.charge(group, time.monotonic() - start)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
     try:
-        response = requests.put(url, headers=headers, json=data)
-        if response.status_code in [200, 201]:
-            log_print(f'✅ GitHub 업로드 성공: {file_name}')
-            return True
-        else:
-            log_print(f'❌ GitHub 업로드 실패: {response.status_code} - {response.text}')
-            return False
-    except Exception as e:
-        log_print(f'❌ GitHub 업로드 오류: {e}')
-        return False
+        def submit(index, group):
+            with lock:
+                if index not in futures:
+                    futures[index] = executor.submit(run, index, group)
+                return futures[index]
+
+        def drive(group):
+            queue = sorted(query_plan[group], key=lambda index: order_key(group, index))
+            results = []
+            try:
+                while queue:
+                    if deadline and (deadline.expired() or budget.exhausted(group)):
+                        deadline.mark_degraded(group)
+                        break
+                    wave, queue = queue[:batch_size], queue[batch_size:]
+                    pending = [(index, submit(index, group)) for index in wave]
+                    for index, future in pending:
+                        try:
+                            results.append((index, future.result(timeout=deadline.remaining() if deadline else None)))
+                        except FutureTimeout:
+                            deadline.mark_degraded(group)
+                    if queue and is_final(group, results):
+                        break
+            finally:
+                if budget:
+                    budget.finish(group)
+            return [index for index, _ in results]
+
+        groups = list(query_plan)
+        consumed = dict(zip(groups, fetch_parallel([(drive, (group,)) for group in groups], max_workers=len(groups))))
+    finally:
+        # 마감으로 시작하지 못한 요청은 취소, 진행 중인 요청은 timeout이 남은 시간으로 줄어 있어 곧 끝남
+        executor.shutdown(wait=False, cancel_futures=True)
+    feeds = {index: future.result() for index, future in futures.items() if future.done() and not future.cancelled()}
+    return feeds, consumed
+
+
+def format_news_item(item):
+    """NewsItem을 뉴스레터 목록용 HTML 한 줄로 변환 (날짜는 항상 표시)"""
+    date_display_str = item.date_label()
+    date_display = f" <span style='color:#3b82f6;font-size:0.8em;'>[{date_display_str}]</span>" if date_display_str else ''
+    return f"<a href='{item.link}' target='_blank'>{item.title}</a> <span style='color:#888;font-size:0.85em;'>({item.source})</span>{date_display}"
+
+
+# format_news_item() 결과에서 기사 링크 추출 (안내 문구 항목은 링크가 없어 제외됨)
+_NEWS_ITEM_LINK = re.compile(r"^<a href='([^']*)'")
+
+
+def mark_edition_sent(news, edition=None):
+    """
+    게시/발송한 호의 기사를 저장소에 발송 이력으로 기록 (다음 호부터 자동 제외)
+    RECORD_SENT_EDITION이 켜진 실행(워크플로우의 게시 단계)에서만 호출하므로 로컬 미리보기 실행의 기사는 다음 호 후보에 남음
+    """
+    links = [match.group(1) for items in news.values() for match in map(_NEWS_ITEM_LINK.match, items) if match]
+    article_store = ArticleStore(ARTICLE_STORE_PATH)
+    try:
+        article_store.mark_sent(links, edition or edition_key())
+    finally:
+        article_store.close()
+    print(f'🗄️ 발송 이력 기록: 기사 {len(links)}건 ({edition or edition_key()} 호)')
 
 
 # 1. 뉴스 수집 함수 (구글 뉴스 RSS 활용)
-def collect_news():
+def collect_news(deadline=None):
     # 구글 뉴스 RSS를 이용하여 각 카테고리별 키워드로 뉴스 수집
     # 전주 월요일~일요일 사이의 뉴스 우선, 부족하면 2주/3주까지 확대
+    # deadline(RunDeadline)의 'collect' 단계 마감이 지나면 수확량 낮은 남은 키워드는 생략하고 해당 섹션을 degraded로 표시
     import urllib.parse
     import warnings
     # 구글 뉴스 RSS를 이용하여 각 카테고리별 키워드로 뉴스 수집
     # 전주 월요일~일요일 사이의 뉴스 우선, 부족하면 2주/3주까지 확대
     import urllib.parse
     import warnings
-    import re
+    import calendar
     from datetime import datetime, timedelta
-    from email.utils import parsedate_to_datetime
     warnings.filterwarnings('ignore')  # SSL 경고 무시
     
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     }
     
-    # 날짜 범위 계산 함수 (weeks_ago: 1=전주, 2=2주전, 3=3주전, 4=4주전)
+    # 날짜 범위 기준: 이번 주 월요일 0시 (weeks_ago: 1=전주, 2=2주전, 3=3주전, 4=4주전)
     today = datetime.now()
-    this_monday = today - timedelta(days=today.weekday())
-
-    def get_week_range(weeks_ago):
-        """weeks_ago 주 전의 월~일 날짜 범위 반환"""
-        week_monday = this_monday - timedelta(days=7 * weeks_ago)
-        week_sunday = week_monday + timedelta(days=6)
-        start = week_monday.replace(hour=0, minute=0, second=0)
-        end = week_sunday.replace(hour=23, minute=59, second=59)
-        return start, end
-
-    # 1주~4주 전 날짜 범위 미리 계산
-    week_ranges = {
-        1: get_week_range(1),  # 전주
-        2: get_week_range(2),  # 2주 전
-        3: get_week_range(3),  # 3주 전
-        4: get_week_range(4),  # 4주 전
-    }
+    this_monday = (today - timedelta(days=today.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    week_origin = calendar.timegm(this_monday.timetuple())
+    last_monday = this_monday - timedelta(days=7)
+    last_sunday = last_monday + timedelta(days=6)
 
-    print(f'📅 뉴스 수집 기간: 1주전({week_ranges[1][0].strftime("%m/%d")}~{week_ranges[1][1].strftime("%m/%d")}) → 2주전 → 3주전 → 4주전 순으로 확대')
+    print(f'📅 뉴스 수집 기간: 1주전({last_monday.strftime("%m/%d")}~{last_sunday.strftime("%m/%d")}) → 2주전 → 3주전 → 4주전 순으로 확대')
     # 프롬프트/조회조건을 별도 파일에서 import
-    from newsletter_prompt import trusted_sources, trusted_academic_sources, categories
-    # 날짜 파싱 함수
-    def parse_pub_date(pub_date_str):
-        """RSS pubDate를 datetime으로 파싱"""
-        try:
-            return parsedate_to_datetime(pub_date_str)
-        except:
-            return None
-    
-    # 날짜가 특정 주 범위 내인지 확인하고 몇 주 전인지 반환
-    def get_week_ago(pub_date_str):
-        """날짜가 몇 주 전인지 반환 (1, 2, 3 또는 None)"""
-        pub_date = parse_pub_date(pub_date_str)
-        if pub_date:
-            pub_date_naive = pub_date.replace(tzinfo=None)
-            for weeks_ago in [1, 2, 3, 4]:
-                start, end = week_ranges[weeks_ago]
-                if start <= pub_date_naive <= end:
-                    return weeks_ago
-        return None
-    
-    # 날짜 포맷 함수 (몇 주 전인지 포함)
-    def format_date_with_week(pub_date_str, weeks_ago):
-        pub_date = parse_pub_date(pub_date_str)
-        if pub_date:
-            date_str = pub_date.strftime('%m/%d')
-            if weeks_ago == 1:
-                return date_str  # 전주는 날짜만
-            elif weeks_ago == 2:
-                return f"{date_str} 🕐2주전"
-            elif weeks_ago == 3:
-                return f"{date_str} 🕐3주전"
-        return ''
-    
-    # 중복 제거를 위한 제목 정규화 함수
-    def normalize_title(title):
-        # 특수문자, 공백 제거 후 소문자로 변환
-        normalized = re.sub(r'[^\w가-힣]', '', title).lower()
-        return normalized
-    
-    # 유사 제목 체크 함수 (70% 이상 겹치면 중복으로 판단)
-    def is_duplicate(new_title, existing_titles):
-        new_normalized = normalize_title(new_title)
-        for existing in existing_titles:
-            existing_normalized = normalize_title(existing)
-            # 짧은 쪽 기준으로 겹치는 비율 계산
-            if len(new_normalized) == 0 or len(existing_normalized) == 0:
-                continue
-            # 한쪽이 다른 쪽에 포함되면 중복
-            if new_normalized in existing_normalized or existing_normalized in new_normalized:
-                return True
-            # 공통 문자 비율로 유사도 체크
-            common = set(new_normalized) & set(existing_normalized)
-            shorter = min(len(new_normalized), len(existing_normalized))
-            if len(common) / shorter > 0.7:
-                return True
-        return False
-    
+    from newsletter_prompt import trusted_sources, trusted_academic_sources, categories, non_academic_keywords
+
+    # 언론사/학술기관/비학술 키워드 목록을 다중 패턴 매처로 한 번만 컴파일
+    news_matcher = MultiPatternMatcher({
+        'trusted': trusted_sources,
+        'academic': trusted_academic_sources,
+        'non_academic': non_academic_keywords,
+    })
+
+    # 판정 규칙 해시 (newsletter_prompt.py의 목록이 바뀌면 저장된 기사의 판정도 다시 계산)
+    rules_hash = hashlib.sha256(json.dumps([trusted_sources, trusted_academic_sources, non_academic_keywords],
+                                           ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def match_flags(title, source):
+        """제목/소스를 한 번씩만 스캔하여 (trusted, academic, non_academic) 판정"""
+        title_hits = news_matcher.scan(title)
+        source_hits = news_matcher.scan(source)
+        return ('trusted' in title_hits or 'trusted' in source_hits,
+                'academic' in title_hits or 'academic' in source_hits,
+                'non_academic' in title_hits)  # 비학술 키워드는 제목만 확인
+
+    def classify(item):
+        """필터에 필요한 목록 일치 여부를 NewsItem에 기록"""
+        item.trusted, item.academic, item.non_academic = match_flags(item.title, item.source)
+        return item
+
+    # 기사 저장소 (이번 호 번호 = 이번 주 월요일 날짜, 같은 주 재실행 시 같은 결과 유지)
+    article_store = ArticleStore(ARTICLE_STORE_PATH)
+    reclassified = article_store.reclassify(rules_hash, match_flags)
+    if reclassified:
+        print(f'🗄️ 필터 조건 변경: 저장된 기사 {reclassified}건 재판정')
+    edition = edition_key(today)
+    edition_links = []  # 이번 호에 실린 기사 링크 (발송 이력 기록용)
+
+    def stored_item(row):
+        """저장소 행 → NewsItem (날짜 재파싱 없이 저장된 epoch로 주차 계산)"""
+        item = NewsItem(row['title'], row['link'], row['source'], row['pub_ts'], row['utc_offset'],
+                        week_bucket(row['pub_ts'] + row['utc_offset'], week_origin))
+        item.trusted = bool(row['trusted'])
+        item.academic = bool(row['academic'])
+        item.non_academic = bool(row['non_academic'])
+        return item
+
+    def load_candidates(group):
+        """저장소 인덱스 조회로 카테고리 후보(1~4주 전, 지난 호 기사 제외)를 최신순으로 반환"""
+        # 발행 시각 범위는 시간대 차이(최대 ±1일)를 감안해 넓게 조회한 뒤 주차로 정확히 거름
+        rows = article_store.candidates(
+            group, week_origin - 4 * WEEK_SECONDS - 86400, week_origin + 86400, edition,
+            exclude_academic=(group != '학술기관 AX Trend'),
+            exclude_non_academic=(group == '학술기관 AX Trend'),
+        )
+        return [item for item in map(stored_item, rows) if item.weeks_ago]
+
+    # 최신순 후보 목록에서 중복을 제외하고 5개까지 선택
+    def select_items(candidates, is_preferred, fill_with_rest):
+        """is_preferred 통과 항목을 먼저 고르고, fill_with_rest면 5개 미만일 때 나머지로 채움"""
+        selected = []
+        collected_titles = TitleDedupIndex(TITLE_DEDUP_MODE)  # 중복 체크용 제목 인덱스
+        passes = [is_preferred, lambda item: True] if fill_with_rest else [is_preferred]
+        for accept in passes:
+            for item in candidates:
+                if len(selected) >= 5:
+                    break
+                # 중복 체크
+                if collected_titles.is_duplicate(item.title):
+                    continue
+                if item.title and item.link and accept(item):
+                    selected.append(format_news_item(item))
+                    edition_links.append(item.link)
+                    collected_titles.add(item.title)
+        return selected
+
     news = {}
 
     # ...카테고리별 검색 키워드는 newsletter_prompt.py에서 import...
 
+    def rss_url(kw):
+        encoded_keyword = urllib.parse.quote(kw)
+        return f'https://news.google.com/rss/search?q={encoded_keyword}&hl=ko&gl=KR&ceid=KR:ko'
+
+    feed_records = {}  # 조회어 -> 요청 계측 기록 (선택 결과 반영용)
+    stage = (deadline or NO_DEADLINE).stage('collect')
+
+    def fetch_feed(kw, timeout):
+        """RSS를 받아 NewsItem 목록으로 파싱 - 고유 조회당 1회만 실행 (날짜 파싱/필터 판정 포함)"""
+        with telemetry.track('rss', query=kw) as record:
+            feed_records[kw] = record
+            # 디스크 HTTP 캐시 경유 (TTL 이내 재실행 시 네트워크 요청 없음)
+            res = transport.get(rss_url(kw), use_cache=True, headers=headers, timeout=timeout, deadline=stage, verify=False)
+            # lxml 스트리밍 파서로 원문 바이트를 바로 파싱 (BeautifulSoup 트리 생성 없음)
+            items = [NewsItem.from_rss(item, week_origin) for item in iter_rss_items(res.content)]
+            record['items_parsed'] = len(items)
+        # 필터 판정은 매번 새로 계산 (조기 종료 판정용, 저장소의 판정은 규칙이 바뀌면 reclassify()가 갱신)
+        for item in items:
+            classify(item)
+        return items
+
+    # 조회 계획: 모든 카테고리 + 학술기관 키워드를 정규화/중복 제거하여 고유 조회 목록 생성
+    query_groups = {}
     for category, keyword in categories.items():
-        news_list = []
-        collected_titles = []  # 중복 체크용 제목 리스트
+        query_groups[category] = keyword if isinstance(keyword, list) else [keyword]
+    query_groups['학술기관 AX Trend'] = list(trusted_academic_sources)
+    unique_queries, query_plan = plan_queries(query_groups)
 
-        # RSS에서 모든 아이템 수집 (날짜 정보 포함)
-        all_items_with_date = []
+    # 고유 조회만 동시 수집 (카테고리 키워드는 timeout 3초, 학술기관 키워드는 10초 - 둘 다 요청하면 긴 쪽)
+    timeouts = [3] * len(unique_queries)
+    for index in query_plan['학술기관 AX Trend']:
+        timeouts[index] = 10
 
-        try:
-            # 모든 카테고리가 리스트 형태 - 여러 키워드로 검색하여 다양한 콘텐츠 수집
-            keywords = keyword if isinstance(keyword, list) else [keyword]
-            for kw in keywords:
-                try:
-                    encoded_keyword = urllib.parse.quote(kw)
-                    url = f'https://news.google.com/rss/search?q={encoded_keyword}&hl=ko&gl=KR&ceid=KR:ko'
-                    # timeout을 3초로 줄이고, 네트워크 오류 발생 시 해당 키워드는 건너뜀
-                    res = requests.get(url, headers=headers, timeout=3, verify=False)
-                    soup = BeautifulSoup(res.text, 'xml')
-                    items = soup.find_all('item')
-
-                    for item in items:
-                        title = item.find('title').get_text(strip=True) if item.find('title') else ''
-                        link = item.find('link').get_text(strip=True) if item.find('link') else ''
-                        source = item.find('source').get_text(strip=True) if item.find('source') else ''
-                        pub_date_str = item.find('pubDate').get_text(strip=True) if item.find('pubDate') else ''
-
-                        weeks_ago = get_week_ago(pub_date_str)
-                        # 학술기관 키워드가 제목/소스에 포함된 뉴스는 '학술기관 AX Trend'에서만 보여주고, 다른 카테고리에서는 제외
-                        if any(ts in source or ts in title for ts in trusted_academic_sources):
-                            continue
-                        if weeks_ago:
-                            all_items_with_date.append({
-                                'title': title,
-                                'link': link,
-                                'source': source,
-                                'pub_date_str': pub_date_str,
-                                'weeks_ago': weeks_ago
-                            })
-                except Exception as e:
-                    # 네트워크 오류, 타임아웃 등 발생 시 해당 키워드는 건너뜀
-                    continue
+    # 카테고리별 후보/우선 선택 기준 (학술기관 AX Trend는 비학술 키워드 제외 + 학술기관 일치 우선)
+    def is_candidate(group, item):
+        if group == '학술기관 AX Trend':
+            return bool(item.weeks_ago) and not item.non_academic
+        return bool(item.weeks_ago) and not item.academic
 
-            # pub_date_str 기준 최신순 정렬
-            all_items_with_date.sort(key=lambda x: x['pub_date_str'], reverse=True)
+    def is_preferred(group, item):
+        return item.academic if group == '학술기관 AX Trend' else item.trusted
 
-            # 신뢰할 수 있는 언론사 뉴스 먼저 수집 (5개까지)
-            for item in all_items_with_date:
-                if len(news_list) >= 5:
-                    break
-                title = item['title']
-                link = item['link']
-                source = item['source']
-                pub_date_str = item['pub_date_str']
-                weeks_ago = item['weeks_ago']
+    # 조기 종료 판정 (NEWS_EARLY_STOP=1일 때만): 중복 아닌 우선 대상 전주(1주전) 기사가 5건 이상이면 남은 요청 생략
+    # 남은 키워드의 2~4주 전 기사나 비신뢰 기사는 선택을 바꿀 수 없지만, 더 최근의 우선 대상 전주 기사는
+    # 5건 중 일부를 대신할 수 있으므로 선택 결과가 전체 요청 시와 다를 수 있음
+    def is_final(group, results):
+        if not NEWS_EARLY_STOP:
+            return False
+        titles = TitleDedupIndex(TITLE_DEDUP_MODE)
+        for _, items in results:
+            if isinstance(items, Exception):
+                continue
+            for item in items:
+                if item.weeks_ago == 1 and is_candidate(group, item) and is_preferred(group, item) and item.title and item.link:
+                    if titles.add_if_new(item.title) and len(titles) >= 5:
+                        return True
+        return False
 
-                # 중복 체크
-                if is_duplicate(title, collected_titles):
-                    continue
+    # 지난 실행의 키워드별 수확량 기록으로 요청 순서 결정 (수확량 높은 키워드 먼저)
+    yield_stats = KeywordYieldStats(os.path.join(CACHE_DIR, 'keyword_yield.json'))
+    feeds, consumed = fetch_with_budget(
+        query_plan,
+        lambda index: fetch_feed(unique_queries[index], timeouts[index]),
+        order_key=lambda group, index: -yield_stats.expected(group, unique_queries[index]),
+        is_final=is_final,
+        deadline=stage,
+    )
+    total_requested = sum(len(v) for v in query_groups.values())
+    print(f'🌐 RSS 동시 수집 완료: 고유 조회 {len(unique_queries)}건 중 {len(feeds)}건 요청 (작업자 {NEWS_FETCH_WORKERS}개)')
+    print(f'🧭 조회 계획: 요청 {total_requested}건 → 고유 {len(unique_queries)}건 ({total_requested - len(unique_queries)}건 절감)')
+    print('🎯 카테고리별 요청 현황 (실제 요청 / 설정 키워드)')
+    for group, indexes in consumed.items():
+        print(f'   {group}: {len(indexes)} / {len(query_groups[group])}')
+    # 대기열에서 마감을 맞은 요청은 실패가 아니라 생략으로 처리 (해당 섹션은 degraded)
+    for group, indexes in consumed.items():
+        if any(isinstance(feeds[index], DeadlineExceeded) for index in indexes):
+            stage.mark_degraded(group)
+    failed = [unique_queries[index] for index, items in feeds.items()
+              if isinstance(items, Exception) and not isinstance(items, DeadlineExceeded)]
+    if failed:
+        telemetry.count('rss_failed_queries', len(failed))
+        print(f"⚠️ RSS 수집 실패 {len(failed)}건 (해당 키워드 제외): {', '.join(failed[:10])}{' 외' if len(failed) > 10 else ''}")
 
-                # 신뢰 언론사만 필터링 (학술기관은 AX Trend에만 사용)
-                is_trusted = any(ts in source or ts in title for ts in trusted_sources)
-                if title and link and is_trusted:
-                    # 날짜 표기 보완: weeks_ago가 None이어도 날짜는 항상 표시
-                    date_display_str = format_date_with_week(pub_date_str, weeks_ago)
-                    if not date_display_str:
-                        # pub_date_str이 있으면 날짜만이라도 표시
-                        try:
-                            from email.utils import parsedate_to_datetime
-                            pub_date = parsedate_to_datetime(pub_date_str)
-                            if pub_date:
-                                date_display_str = pub_date.strftime('%m/%d')
-                        except:
-                            pass
-                    date_display = f" <span style='color:#3b82f6;font-size:0.8em;'>[{date_display_str}]</span>" if date_display_str else ''
-                    news_list.append(f"<a href='{link}' target='_blank'>{title}</a> <span style='color:#888;font-size:0.85em;'>({source})</span>{date_display}")
-                    collected_titles.append(title)
-
-            # 5개 미만이면 비신뢰 언론사 뉴스로 채우기
-            if len(news_list) < 5:
-                for item in all_items_with_date:
-                    if len(news_list) >= 5:
-                        break
-                    title = item['title']
-                    link = item['link']
-                    source = item['source']
-                    pub_date_str = item['pub_date_str']
-                    weeks_ago = item['weeks_ago']
+    # 이번 실행 수확량 기록 (다음 실행의 요청 순서에 반영)
+    for group, indexes in consumed.items():
+        for index in indexes:
+            items = feeds[index]
+            if isinstance(items, Exception):
+                continue
+            count = sum(1 for item in items if item.weeks_ago == 1 and is_candidate(group, item) and is_preferred(group, item))
+            yield_stats.record(group, unique_queries[index], count)
+    yield_stats.save()
 
-                    # 중복 체크
-                    if is_duplicate(title, collected_titles):
-                        continue
+    # 이번 실행 수집 결과를 저장소에 반영 (1~4주 전 기사만, 이미 있는 기사는 카테고리 연결만 추가)
+    # 카테고리마다 모든 피드의 기사를 모아 한 번에 upsert (트랜잭션/커밋은 카테고리당 1회)
+    for group, indexes in consumed.items():
+        article_store.upsert([item for index in indexes if not isinstance(feeds[index], Exception)
+                              for item in feeds[index] if item.weeks_ago], group)
 
-                    if title and link:
-                        # 날짜 표기 보완: weeks_ago가 None이어도 날짜는 항상 표시
-                        date_display_str = format_date_with_week(pub_date_str, weeks_ago)
-                        if not date_display_str:
-                            try:
-                                from email.utils import parsedate_to_datetime
-                                pub_date = parsedate_to_datetime(pub_date_str)
-                                if pub_date:
-                                    date_display_str = pub_date.strftime('%m/%d')
-                            except:
-                                pass
-                        date_display = f" <span style='color:#3b82f6;font-size:0.8em;'>[{date_display_str}]</span>" if date_display_str else ''
-                        news_list.append(f"<a href='{link}' target='_blank'>{title}</a> <span style='color:#888;font-size:0.85em;'>({source})</span>{date_display}")
-                        collected_titles.append(title)
+    for category in categories:
+        news_list = []
+
+        try:
+            # 저장소에서 이 카테고리의 1~4주 전 기사를 발행 시각 최신순으로 조회
+            # (학술기관 키워드가 제목/소스에 포함된 뉴스는 '학술기관 AX Trend'에서만 보여주고, 다른 카테고리에서는 제외)
+            all_items_with_date = load_candidates(category)
+
+            # 신뢰할 수 있는 언론사 뉴스 먼저 수집 (5개까지), 5개 미만이면 비신뢰 언론사 뉴스로 채우기
+            # (신뢰 언론사만 우선, 학술기관은 AX Trend에만 사용)
+            news_list = select_items(all_items_with_date, lambda item: item.trusted, fill_with_rest=True)
 
         except Exception as e:
             news_list.append(f'수집 오류: {e}')
@@ -330,72 +602,35 @@ def collect_news():
 
     # 학술기관 AX Trend 카테고리: trusted_academic_sources 키워드로 뉴스 5개까지 조회
     academic_news_list = []
-    collected_titles = []
-    all_items_with_date = []
     try:
-        # 정치, 사회, 연예 등 비학술적 키워드 목록
-        non_academic_keywords = [
-            '정치', '대통령', '총리', '국회', '의원', '선거', '정당', '정부', '청와대',
-            '사회', '사건', '사고', '범죄', '재판', '법원', '검찰', '경찰',
-            '연예', '연예인', '가수', '배우', '방송', '드라마', '영화', '스포츠',
-            '사망', '사건사고', '논란', '입학취소', '징계', '정치권', '정치인', '부정', '비리', '의혹', '논문 표절', '입시', '입학', '퇴출', '징계', '윤리', '조민', '김건희'
-        ]
-        for kw in trusted_academic_sources:
-            encoded_keyword = urllib.parse.quote(kw)
-            url = f'https://news.google.com/rss/search?q={encoded_keyword}&hl=ko&gl=KR&ceid=KR:ko'
-            res = requests.get(url, headers=headers, timeout=10, verify=False)
-            soup = BeautifulSoup(res.text, 'xml')
-            items = soup.find_all('item')
-            for item in items:
-                title = item.find('title').get_text(strip=True) if item.find('title') else ''
-                link = item.find('link').get_text(strip=True) if item.find('link') else ''
-                source = item.find('source').get_text(strip=True) if item.find('source') else ''
-                pub_date_str = item.find('pubDate').get_text(strip=True) if item.find('pubDate') else ''
-                weeks_ago = get_week_ago(pub_date_str)
-                # 비학술적 키워드가 제목에 포함되어 있으면 제외
-                if any(bad_kw in title for bad_kw in non_academic_keywords):
-                    continue
-                if weeks_ago:
-                    all_items_with_date.append({
-                        'title': title,
-                        'link': link,
-                        'source': source,
-                        'pub_date_str': pub_date_str,
-                        'weeks_ago': weeks_ago
-                    })
-        # pub_date_str 기준 최신순 정렬
-        all_items_with_date.sort(key=lambda x: x['pub_date_str'], reverse=True)
-        for item in all_items_with_date:
-            if len(academic_news_list) >= 5:
-                break
-            title = item['title']
-            link = item['link']
-            source = item['source']
-            pub_date_str = item['pub_date_str']
-            weeks_ago = item['weeks_ago']
-            if is_duplicate(title, collected_titles):
-                continue
-            # 신뢰 학술기관 키워드가 제목 또는 소스에 포함된 경우만
-            is_trusted_academic = any(ts in source or ts in title for ts in trusted_academic_sources)
-            if title and link and is_trusted_academic:
-                date_display_str = format_date_with_week(pub_date_str, weeks_ago)
-                if not date_display_str:
-                    try:
-                        from email.utils import parsedate_to_datetime
-                        pub_date = parsedate_to_datetime(pub_date_str)
-                        if pub_date:
-                            date_display_str = pub_date.strftime('%m/%d')
-                    except:
-                        pass
-                date_display = f" <span style='color:#3b82f6;font-size:0.8em;'>[{date_display_str}]</span>" if date_display_str else ''
-                academic_news_list.append(f"<a href='{link}' target='_blank'>{title}</a> <span style='color:#888;font-size:0.85em;'>({source})</span>{date_display}")
-                collected_titles.append(title)
+        # 키워드별로 실패를 격리 (실패한 키워드만 제외, 모든 키워드가 실패한 경우에만 수집 오류 표시)
+        academic_results = [feeds[index] for index in consumed['학술기관 AX Trend']]
+        academic_errors = [result for result in academic_results
+                           if isinstance(result, Exception) and not isinstance(result, DeadlineExceeded)]
+        if academic_errors and len(academic_errors) == len(academic_results):
+            raise academic_errors[0]
+        # 비학술적 키워드(newsletter_prompt.non_academic_keywords)가 제목에 포함된 기사는 제외, 발행 시각 최신순
+        all_items_with_date = load_candidates('학술기관 AX Trend')
+        # 신뢰 학술기관 키워드가 제목 또는 소스에 포함된 경우만
+        academic_news_list = select_items(all_items_with_date, lambda item: item.academic, fill_with_rest=False)
         if not academic_news_list:
             academic_news_list.append('최근 4주간 관련 뉴스가 없습니다.')
     except Exception as e:
         academic_news_list.append(f'수집 오류: {e}')
     news['학술기관 AX Trend'] = academic_news_list
 
+    # 조회어별로 이번 호에 실린 기사 수 기록 (키워드 수확량 추이 확인용)
+    kept_links = {canonical_link(link) for link in edition_links}
+    for index, items in feeds.items():
+        record = feed_records.get(unique_queries[index])
+        if record is not None and not isinstance(items, Exception):
+            record['items_kept'] = sum(1 for item in items if item.link and canonical_link(item.link) in kept_links)
+
+    # 오래된 기사 정리 (발송 이력은 게시 단계에서 mark_edition_sent()로 기록)
+    article_store.prune()
+    print(article_store.report())
+    article_store.close()
+
     # 카테고리 순서 재정렬: 해외 AI 신규뉴스 뒤에 학술기관 AX Trend, 그 다음 피지컬 AI
     ordered_keys = []
     for k in ['AX 활용 사례', '국내 AI 소식', '해외 AI 신규뉴스', '학술기관 AX Trend', '피지컬 AI', '금융사 AI 적용 사례 및 규제 완화 소식', '🔥 한화그룹 Hot News']:
@@ -405,12 +640,12 @@ def collect_news():
     news = {k: news[k] for k in ordered_keys}
 
     return news
-def collect_youtube_recommendations():
+def collect_youtube_recommendations(deadline=None):
     # IT/AI 학습 목적의 건전한 영상만 수집 (공개 발표용)
     # 전주 월요일~일요일 사이 영상, 인기순 정렬
+    # deadline(RunDeadline)의 'youtube' 단계 마감이 지나면 남은 요청은 취소하고 수집된 영상만 사용
     import urllib.parse
     import warnings
-    import re
     from datetime import datetime, timedelta
     warnings.filterwarnings('ignore')
     
@@ -426,24 +661,16 @@ def collect_youtube_recommendations():
     
     print(f'📺 유튜브 수집 기간: {last_monday.strftime("%Y-%m-%d")} ~ {last_sunday.strftime("%Y-%m-%d")} (인기순)')
     
-    # IT/AI 관련 키워드 필터 (이 키워드가 제목에 포함된 영상만 추천)
-    it_ai_keywords = [
-        'AI', '인공지능', 'GPT', 'ChatGPT', '챗GPT', '머신러닝', '딥러닝',
-        '데이터', '분석', '자동화', 'AX', 'DX', '디지털', '전환',
-        '로봇', '클라우드', '빅데이터', 'IT', 'RPA', '코딩', '프로그래밍',
-        '알고리즘', '테크', '기술', '혁신', '스마트', '플랫폼',
-        '비즈니스', '업무', '생산성', '효율', '솔루션'
-    ]
+    # IT/AI 관련 키워드 필터 (newsletter_prompt.it_ai_keywords가 제목에 포함된 영상만 추천)
+    # 대소문자 무시 다중 패턴 매처로 한 번만 컴파일
+    from newsletter_prompt import it_ai_keywords
+    it_ai_matcher = MultiPatternMatcher({'it_ai': it_ai_keywords}, ignore_case=True)
     
     youtube_list = []
     
     # IT/AI 키워드 포함 여부 확인 함수
     def is_it_ai_content(title):
-        title_lower = title.lower()
-        for keyword in it_ai_keywords:
-            if keyword.lower() in title_lower:
-                return True
-        return False
+        return bool(it_ai_matcher.scan(title))
     
     # 날짜가 전주 범위 내인지 확인
     def is_within_week(date_str):
@@ -466,64 +693,148 @@ def collect_youtube_recommendations():
             pass
         return ''
     
-    # 유튜브 검색 키워드는 newsletter_prompt.py에서 import
-    from newsletter_prompt import youtube_search_keywords
+    # 유튜브 요청 수/수신 바이트 집계 (수집 방식별 전송량 비교용)
+    transfer = {'requests': 0, 'bytes': 0}
+    transfer_lock = threading.Lock()
     
-    for keyword in youtube_search_keywords:
-        try:
+    def youtube_get(url, **kwargs):
+        res = transport.get(url, **kwargs)
+        if res.headers.get('X-Cache') == 'hit':
+            return res  # 디스크 캐시 적중은 네트워크 전송 없음
+        with transfer_lock:
+            transfer['requests'] += 1
+            transfer['bytes'] += len(res.content)
+        return res
+    
+    youtube_records = []  # (요청 계측 기록, 후보 영상 ID 집합) - 최종 선택 결과 반영용
+    stage = (deadline or NO_DEADLINE).stage('youtube')
+
+    if YOUTUBE_SOURCE_MODE == 'channels':
+        # 채널 피드 모드: 큐레이션 채널의 Atom 피드(채널당 최신 영상 약 15개)만 동시 요청
+        # 피드에 제목/게시일/조회수가 모두 있어 검색 페이지와 oEmbed 요청이 필요 없음
+        from newsletter_prompt import youtube_channels
+        
+        def fetch_channel(channel_id):
+            with telemetry.track('youtube_channel', query=channel_id) as record:
+                res = youtube_get(channel_feed_url(channel_id), use_cache=True, headers=headers, timeout=10, deadline=stage, verify=False)
+                if res.status_code != 200:
+                    return []
+                entries = list(iter_channel_feed(res.content))
+                record['items_parsed'] = len(entries)
+                youtube_records.append((record, {entry.video_id for entry in entries}))
+                return entries
+        
+        channel_feeds = fetch_parallel([(fetch_channel, (channel_id,)) for channel_id in youtube_channels.values()], deadline=stage)
+        if any(isinstance(entries, DeadlineExceeded) for entries in channel_feeds):
+            stage.mark_degraded(YOUTUBE_SECTION)
+        for entries in channel_feeds:
+            if isinstance(entries, Exception):
+                continue
+            # 전주 업로드 + IT/AI 키워드 포함 영상 중 조회수 1위 (채널당 1개)
+            for entry in sorted(entries, key=lambda entry: entry.view_count, reverse=True):
+                if not (entry.video_id and entry.title and is_within_week(entry.published) and is_it_ai_content(entry.title)):
+                    continue
+                # 중복 체크
+                if any(item['title'] == entry.title for item in youtube_list):
+                    continue
+                youtube_list.append({
+                    'channel': entry.channel or '유튜브',
+                    'title': entry.title,
+                    'link': f'https://www.youtube.com/watch?v={entry.video_id}',
+                    'thumbnail': f'https://img.youtube.com/vi/{entry.video_id}/mqdefault.jpg',
+                    'date': format_date(entry.published),
+                    'views': entry.view_count
+                })
+                break
+    else:
+        # 유튜브 검색 키워드는 newsletter_prompt.py에서 import
+        from newsletter_prompt import youtube_search_keywords
+    
+        def search_videos(keyword):
+            """검색 결과 페이지에서 조회수 상위 3개 영상(VideoEntry) 목록 추출"""
             encoded_keyword = urllib.parse.quote(keyword)
             # YouTube 검색 - 이번 주 업로드 + 조회수순 정렬
             # sp=CAMSBAgCEAE: 이번 주 + 조회수순
             # sp=EgQIBRAB: 이번 주만
             url = f'https://www.youtube.com/results?search_query={encoded_keyword}&sp=EgQIBRAB'
-            res = requests.get(url, headers=headers, timeout=10, verify=False)
-            
-            # YouTube 페이지에서 videoId와 viewCount 추출
-            video_data = re.findall(r'"videoId":"([a-zA-Z0-9_-]{11})".*?"viewCountText":\{"simpleText":"조회수 ([0-9,]+)회"\}', res.text)
+            with telemetry.track('youtube_search', query=keyword) as record:
+                res = youtube_get(url, headers=headers, timeout=10, deadline=stage, verify=False)
             
-            # viewCount로 정렬이 안되면 기본 videoId만 추출
-            if not video_data:
-                video_ids = re.findall(r'"videoId":"([a-zA-Z0-9_-]{11})"', res.text)
-                video_data = [(vid, '0') for vid in video_ids[:5]]
+                # 페이지에 포함된 ytInitialData를 한 번만 디코딩하여 영상 ID/제목/채널/조회수 추출
+                # (구조화 데이터가 없는 페이지는 videoId만 추출, 조회수 0)
+                entries = parse_search_results(res.text)
+                record['items_parsed'] = len(entries)
             
-            # 조회수 기준 내림차순 정렬
-            video_data_sorted = sorted(video_data, key=lambda x: int(x[1].replace(',', '')) if x[1] else 0, reverse=True)
-            
-            for video_id, view_count in video_data_sorted[:3]:  # 상위 3개만 확인
-                try:
-                    # oEmbed API로 영상 정보 가져오기
-                    oembed_url = f'https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json'
-                    oembed_res = requests.get(oembed_url, timeout=5, verify=False)
-                    
-                    if oembed_res.status_code == 200:
-                        oembed_data = oembed_res.json()
-                        title = oembed_data.get('title', '')
-                        channel = oembed_data.get('author_name', '유튜브')
-                        thumbnail = f'https://img.youtube.com/vi/{video_id}/mqdefault.jpg'
-                        link = f'https://www.youtube.com/watch?v={video_id}'
-                        
-                        # IT/AI 관련 키워드가 포함된 영상만 추가
-                        if title and is_it_ai_content(title):
-                            # 중복 체크
-                            if any(item['title'] == title for item in youtube_list):
-                                continue
-                            
-                            # 조회수 파싱
-                            views = int(view_count.replace(',', '')) if view_count else 0
-                            
-                            youtube_list.append({
-                                'channel': channel,
-                                'title': title,
-                                'link': link,
-                                'thumbnail': thumbnail,
-                                'date': '',  # 검색 결과에서는 날짜 추출 어려움
-                                'views': views
-                            })
-                            break  # 키워드당 1개만
-                except:
+                # 조회수 기준 내림차순 정렬
+                top = sorted(entries, key=lambda entry: entry.view_count, reverse=True)[:3]  # 상위 3개만 확인
+                youtube_records.append((record, {entry.video_id for entry in top}))
+                return top
+    
+        def fetch_oembed(video_id):
+            """oEmbed API로 영상 정보(제목/채널) 조회, 실패 시 None"""
+            oembed_url = f'https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json'
+            with telemetry.track('oembed', query=video_id):
+                oembed_res = youtube_get(oembed_url, timeout=5, deadline=stage, verify=False)
+                if oembed_res.status_code != 200:
+                    return None
+                oembed_data = oembed_res.json()
+            return {'title': oembed_data.get('title', ''), 'channel': oembed_data.get('author_name', '유튜브')}
+    
+        # 1) 모든 키워드의 검색 페이지를 동시에 요청
+        searches = fetch_parallel([(search_videos, (keyword,)) for keyword in youtube_search_keywords], deadline=stage)
+        if any(isinstance(entries, DeadlineExceeded) for entries in searches):
+            stage.mark_degraded(YOUTUBE_SECTION)
+    
+        # 2) 검색 결과에 제목이 없는 후보 영상만 모아 캐시에 없는 영상의 oEmbed를 한 번에 동시 조회
+        candidate_ids = []
+        for entries in searches:
+            if not isinstance(entries, Exception):
+                candidate_ids.extend(entry.video_id for entry in entries if not entry.title)
+        video_cache = VideoMetadataCache(VIDEO_CACHE_PATH)
+        video_info = video_cache.get_many(candidate_ids)
+        missing_ids = [video_id for video_id in dict.fromkeys(candidate_ids) if video_id not in video_info]
+        resolved = {}
+        for video_id, info in zip(missing_ids, fetch_parallel([(fetch_oembed, (video_id,)) for video_id in missing_ids], deadline=stage)):
+            if info and not isinstance(info, Exception):
+                resolved[video_id] = info
+        video_cache.put_many(resolved)
+        video_cache.evict()
+        print(video_cache.report())
+        video_cache.close()
+        video_info.update(resolved)
+    
+        # 3) 키워드 순서대로 조회수 상위 후보 중 첫 번째 적합 영상 선택 (키워드당 1개)
+        for entries in searches:
+            if isinstance(entries, Exception):
+                continue
+            for entry in entries:
+                video_id = entry.video_id
+                if entry.title:
+                    title, channel = entry.title, entry.channel or '유튜브'
+                elif video_id in video_info:
+                    title, channel = video_info[video_id]['title'], video_info[video_id]['channel']
+                else:
                     continue
-        except:
-            continue
+                thumbnail = f'https://img.youtube.com/vi/{video_id}/mqdefault.jpg'
+                link = f'https://www.youtube.com/watch?v={video_id}'
+            
+                # IT/AI 관련 키워드가 포함된 영상만 추가
+                if title and is_it_ai_content(title):
+                    # 중복 체크
+                    if any(item['title'] == title for item in youtube_list):
+                        continue
+                
+                    youtube_list.append({
+                        'channel': channel,
+                        'title': title,
+                        'link': link,
+                        'thumbnail': thumbnail,
+                        'date': '',  # 검색 결과에서는 날짜 추출 어려움
+                        'views': entry.view_count
+                    })
+                    break  # 키워드당 1개만
+    
+    print(f"📦 유튜브 수집({YOUTUBE_SOURCE_MODE}): 요청 {transfer['requests']}건 / 수신 {transfer['bytes'] / 1024:.0f}KB")
     
     # 조회수 기준 내림차순 정렬
     youtube_list.sort(key=lambda x: x.get('views', 0), reverse=True)
@@ -536,264 +847,198 @@ def collect_youtube_recommendations():
             seen_titles.add(item['title'])
             unique_list.append(item)
     
+    # 요청별로 최종 추천에 실린 영상 수 기록
+    kept_ids = {item['link'].rsplit('=', 1)[-1] for item in unique_list[:5]}
+    for record, video_ids in youtube_records:
+        record['items_kept'] = len(video_ids & kept_ids)
+    
     return unique_list[:5]  # 최대 5개만 반환
 
+def prepare_thumbnails(youtube_recommendations):
+    """추천 영상 썸네일을 동시에 받아 축소/캐시하고 {썸네일 URL: Thumbnail} 반환"""
+    store = ThumbnailStore()
+    thumbnails = store.fetch_all(video.get('thumbnail', '') for video in youtube_recommendations or [])
+    print(store.report())
+    return thumbnails
+
 # 2. HTML 본문 생성 함수
-def generate_html(news, youtube_recommendations=None, email_version=True):
+def generate_html(news, youtube_recommendations=None, email_version=True, thumbnails=None, notices=None):
     """
     HTML 뉴스레터 생성
-    email_version=True: 이메일용 (단색 배경, 호환성 우선)
-    email_version=False: 브라우저용 (그라데이션 배경, 풀 디자인)
+    email_version=True: 이메일용 (단색 배경, 호환성 우선, 썸네일은 cid: 참조 - send_email에서 첨부)
+    email_version=False: 브라우저용 (그라데이션 배경, 풀 디자인, 썸네일은 data URI)
+    thumbnails: prepare_thumbnails() 결과 {썸네일 URL: Thumbnail} (없으면 여기서 준비)
+    notices: {섹션명: 안내 문구} (실행 시간 제한으로 일부만 수집된 섹션, RunDeadline.degraded)
+    두 버전이 모두 필요하면 render_newsletter()로 한 번만 렌더링하여 버전별로 꺼내 쓰는 것이 빠름
     """
-    today = datetime.date.today().strftime('%Y년 %m월 %d일')
-    
-    # 이메일 버전과 브라우저 버전의 배경 스타일 분리
-    if email_version:
-        header_bg = 'background-color:#1e3a8a;'
-        subheader_bg = 'background-color:#1e3a8a;'
-        footer_bg = 'background-color:#1e3a8a;'
-        banner_bg = 'background-color:#f7931e;'  # 이메일용 단색
-    else:
-        header_bg = 'background:linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%);'
-        subheader_bg = 'background:linear-gradient(90deg, #1e3a8a 0%, #2563eb 100%);'
-        footer_bg = 'background:linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%);'
-        banner_bg = 'background:linear-gradient(90deg, #ff6b35 0%, #f7931e 100%);'  # 브라우저용 그라데이션
-    
-    html = f"""
-    <style>
-        .date-badge {{{{
-            display: none !important;
-        }}}}
-        .content-cell {{{{
-            padding: 15px !important;
-        }}}}
-        .section-title {{{{
-            font-size: 1em !important;
-        }}}}
-        .news-item {{{{
-            font-size: 14px !important;
-        }}}}
-        .youtube-thumb {{{{
-            width: 120px !important;
-            height: 68px !important;
-        }}}}
-        .youtube-title {{{{
-            font-size: 13px !important;
-        }}}}
-        .footer-cell {{{{
-            padding: 15px !important;
-        }}}}
-        .logo-badge {{{{
-            padding: 8px 12px !important;
-        }}}}
-        .logo-text {{{{
-            font-size: 14px !important;
-        }}}}
-    </style>
-    </head>
-    <body style='font-family:Segoe UI,Arial,sans-serif; background-color:#f5f5f5; margin:0; padding:10px; word-wrap:break-word; word-break:break-word;'>
-        <!-- 웹 브라우저에서 보기 배너 (Outlook 호환) -->
-        <table width='100%' cellpadding='0' cellspacing='0' border='0' style='max-width:1000px; width:100%; margin:0 auto 15px auto;'>
-            <tr>
-                <td align='center' bgcolor='#f7931e' style='background-color:#f7931e; border-radius:12px; mso-padding-alt:15px 20px;'>
-                    <a href='{{{{web_version_url}}}}' target='_blank' style='display:block; padding:15px 20px; color:#ffffff; font-family:Segoe UI,Arial,sans-serif; font-size:15px; font-weight:bold; text-decoration:none; text-align:center;'>
-                        &#10024; 더 멋진 디자인으로 보기 - 클릭하여 웹 브라우저에서 열기 &#8594;
-                    </a>
-                </td>
-            </tr>
-        </table>
-        <!-- 뉴스레터 헤더 배너 -->
-        <table class='email-container' width='100%' cellpadding='0' cellspacing='0' border='0' style='max-width:1000px; width:100%; margin:0 auto;'>
-            <tr>
-                <td class='header-cell' style='{header_bg} border-radius:16px 16px 0 0; padding:20px;'>
-                    <!-- 로고 + 날짜 한 줄 -->
-                    <table width='100%' cellpadding='0' cellspacing='0' border='0'>
-                        <tr>
-                            <td style='vertical-align:middle;'>
-                                <div style='display:inline-block; background:#fff; border-radius:10px; padding:8px 12px;'>
-                                    <span style='font-size:20px;'>🚀</span>
-                                    <span style='font-size:14px; font-weight:700; color:#1e3a8a;'>Hanwha Systems/ICT</span>
-                                </div>
-                            </td>
-                            <td style='text-align:right; vertical-align:middle;'>
-                                <span style='color:#fff; font-size:13px; background:rgba(255,255,255,0.2); padding:6px 12px; border-radius:8px;'>📅 {today}</span>
-                            </td>
-                        </tr>
-                    </table>
-                    <!-- 메인 타이틀 -->
-                    <h1 style='color:#ffffff; font-size:24px; font-weight:800; margin:15px 0 5px 0;'>
-                        AX / IT 트랜드 뉴스레터
-                    </h1>
-                    <p style='color:rgba(255,255,255,0.85); font-size:12px; margin:0;'>
-                        AI Transformation & Digital Innovation Weekly Digest
-                    </p>
-                </td>
-            </tr>
-            <!-- 서브 헤더 바 -->
-            <tr>
-                <td class='content-cell' style='{subheader_bg} padding:10px 25px;'>
-                    <table width='100%' cellpadding='0' cellspacing='0' border='0'>
-                        <tr>
-                            <td class='header-subtitle' style='color:rgba(255,255,255,0.9); font-size:11px;'>
-                                📊 AX &nbsp;|&nbsp; 🤖 AI &nbsp;|&nbsp; 🌍 글로벌 &nbsp;|&nbsp; 🔥 한화
-                            </td>
-                        </tr>
-                    </table>
-                </td>
-            </tr>
-            <!-- 본문 컨테이너 -->
-            <tr>
-                <td class='content-cell' style='background:#ffffff; padding:20px 25px;'>
+    if youtube_recommendations and thumbnails is None:
+        thumbnails = prepare_thumbnails(youtube_recommendations)
+    rendered = render_newsletter(news, youtube_recommendations, thumbnails, notices=notices)
+    return rendered.html('email' if email_version else 'browser')
+
+# 이메일 HTML 크기 예산 (바이트, Gmail 잘림 기준 약 102KB보다 작게)
+EMAIL_SIZE_BUDGET = int(get_config_value('EMAIL_SIZE_BUDGET') or EMAIL_HTML_BUDGET)
+
+
+def message_size_report(msg):
+    """MIME 파트별 인코딩 후 크기를 콘솔용 문자열로 반환"""
+    lines = [f'✉️ 메일 크기: 전체 {len(msg.as_bytes()) / 1024:.1f}KB']
+    for part in msg.walk():
+        if part.is_multipart():
+            continue
+        encoding = part.get('Content-Transfer-Encoding', '')
+        lines.append(f'   {part.get_content_type()} ({encoding}): {len(part.get_payload()) / 1024:.1f}KB')
+    return '\n'.join(lines)
+
+
+# SMTP 서버 설정 (기본 Gmail, 테스트 시 로컬 SMTP 서버로 변경 가능)
+SMTP_SERVER = get_config_value('SMTP_SERVER') or 'smtp.gmail.com'
+SMTP_PORT = int(get_config_value('SMTP_PORT') or 587)
+SMTP_STARTTLS = (get_config_value('SMTP_STARTTLS') or '1') != '0'
+# 대량 발송 설정: 수신자 목록 파일(한 줄에 한 주소), 분당 발송 건수, 일시 오류 재시도 횟수
+RECIPIENTS_FILE = get_config_value('RECIPIENTS_FILE') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recipients.txt')
+BULK_RATE_PER_MINUTE = int(get_config_value('BULK_RATE_PER_MINUTE') or DEFAULT_RATE_PER_MINUTE)
+BULK_MAX_RETRIES = int(get_config_value('BULK_MAX_RETRIES') or DEFAULT_MAX_RETRIES)
+# 구독 설정 파일 (수신자별 구독 섹션, 설정에 없는 수신자는 전체 호)
+SUBSCRIPTIONS_FILE = get_config_value('SUBSCRIPTIONS_FILE') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'subscriptions.json')
+
+
+def build_email_message(html, thumbnails=None, receiver_email=None):
     """
-    # 카테고리별 아이콘 매핑
-    section_icons = {
-        'AX 활용 사례': '⚡',
-        '국내 AI 소식': '🇰🇷',
-        '해외 AI 신규뉴스': '🌍',
-        '피지컬 AI': '🤖',
-        '금융사 AI 적용 사례 및 규제 완화 소식': '💰',
-        '🔥 한화그룹 Hot News': '🔥'
-    }
-    
-    for section, items in news.items():
-        icon = section_icons.get(section, '📰')
-        # 한화그룹 뉴스는 특별 스타일
-        if '한화' in section:
-            html += f"""
-            <div style='background-color:#ff6b35; border-radius:12px; padding:20px; margin:25px 0 15px 0;'>
-                <h2 class='section-title' style='color:#fff; margin:0; font-size:1.3em;'>{section}</h2>
-            </div>
-            <ul style='list-style:none; padding:0; margin:0;'>
-            """
-        else:
-            html += f"""
-            <div style='border-left:4px solid #3b82f6; padding-left:15px; margin:25px 0 15px 0;'>
-                <h2 class='section-title' style='color:#1e3a8a; margin:0; font-size:1.2em;'>{icon} {section}</h2>
-            </div>
-            <ul style='list-style:none; padding:0; margin:0;'>
-            """
-        for item in items:
-            html += f"<li class='news-item' style='padding:8px 0; border-bottom:1px solid #f0f0f0; word-wrap:break-word; word-break:break-word; overflow-wrap:break-word;'>{item}</li>"
-        html += "</ul>"
-    
-    # 유튜버 추천 섹션 추가 (썸네일 Base64 인라인 포함)
-    if youtube_recommendations:
-        html += """
-        <div style='margin-top:40px; padding:25px; background:#f8f9fa; border-radius:16px;'>
-            <h2 style='color:#333; margin-top:0; margin-bottom:8px; font-size:1.4em;'>🎬 추천 AX 영상</h2>
-            <p style='color:#666; font-size:0.9em; margin-bottom:20px;'>이번 주 주목할 만한 AI/AX 관련 유튜브 콘텐츠를 추천합니다.</p>
-            <table cellpadding='0' cellspacing='0' border='0' width='100%'>
-        """
-        for idx, video in enumerate(youtube_recommendations, 1):
-            date_str = video.get('date', '')
-            thumbnail_url = video.get('thumbnail', '')
-            
-            # 썸네일 이미지를 Base64로 인코딩
-            thumbnail_base64 = ''
-            if thumbnail_url:
-                try:
-                    import warnings
-                    warnings.filterwarnings('ignore')
-                    img_response = requests.get(thumbnail_url, timeout=5, verify=False)
-                    if img_response.status_code == 200:
-                        thumbnail_base64 = base64.b64encode(img_response.content).decode('utf-8')
-                except:
-                    pass
-            
-            # 썸네일이 있으면 이미지 표시, 없으면 대체 아이콘
-            if thumbnail_base64:
-                img_html = f"<img class='youtube-thumb' src='data:image/jpeg;base64,{thumbnail_base64}' alt='썸네일' style='width:160px; height:90px; object-fit:cover; border-radius:8px; display:block;'>"
-            else:
-                img_html = "<div class='youtube-thumb' style='width:160px; height:90px; background-color:#ff0000; border-radius:8px; display:table-cell; vertical-align:middle; text-align:center; color:#fff; font-size:32px;'>▶</div>"
-            
-            html += f"""
-                <tr>
-                    <td style='padding:10px 0; border-bottom:1px solid #eee;'>
-                        <table cellpadding='0' cellspacing='0' border='0' width='100%'>
-                            <tr>
-                                <td width='170' valign='top'>
-                                    <a href='{video['link']}' target='_blank'>{img_html}</a>
-                                </td>
-                                <td valign='top' style='padding-left:15px;'>
-                                    <a class='youtube-title' href='{video['link']}' target='_blank' style='text-decoration:none; color:#222; font-size:0.95em; font-weight:600; line-height:1.4;'>{video['title']}</a>
-                                    <div style='margin-top:8px;'>
-                                        <span style='color:#ff0000; font-size:0.8em; font-weight:500;'>{video['channel']}</span>
-                                    </div>
-                                    <div style='color:#888; font-size:0.75em; margin-top:4px;'>{date_str}</div>
-                                </td>
-                            </tr>
-                        </table>
-                    </td>
-                </tr>
-            """
-        html += """
-            </table>
-        </div>
-        """
-    
-    html += f"""
-                </td>
-            </tr>
-            <!-- 푸터 -->
-            <tr>
-                <td class='footer-cell' style='{footer_bg} border-radius:0 0 16px 16px; padding:20px 25px;'>
-                    <table width='100%' cellpadding='0' cellspacing='0' border='0'>
-                        <tr>
-                            <td style='color:#ffffff; font-size:11px; line-height:1.6; vertical-align:middle;'>
-                                <div class='logo-badge' style='font-weight:600; font-size:13px; margin-bottom:8px;'>🚀 Hanwha Systems/ICT</div>
-                                매주 월요일 오전 8시 자동 발송<br>
-                                AI/AX 트랜드 & 한화그룹 뉴스
-                            </td>
-                            <td style='color:rgba(255,255,255,0.7); font-size:10px; text-align:right; vertical-align:middle;'>
-                                Copyright 2026. hanwhasystem Inc. All rights reserved.
-                            </td>
-                        </tr>
-                    </table>
-                </td>
-            </tr>
-        </table>
-    </body>
-    </html>
+    뉴스레터 메일 메시지 구성 (related: HTML 본문 + 본문에서 cid:로 참조하는 썸네일 이미지)
+    receiver_email이 None이면 To 헤더 없이 만들어 대량 발송 시 수신자별로 붙임
     """
-    return html
+    msg = MIMEMultipart('related')
+    # 한글 제목을 위한 Header 적용
+    msg['Subject'] = Header('AX / IT 트랜드 뉴스레터', 'utf-8')
+    # 발신자 이름 및 표시 이메일 설정 (암호화된 config에서 읽음)
+    sender_name = 'AX / IT Trend for U'
+    display_email = get_config_value('DISPLAY_EMAIL')
+    msg['From'] = f'{sender_name} <{display_email}>'
+    if receiver_email is not None:
+        msg['To'] = receiver_email
+    # 한글 인코딩 오류 방지를 위해 charset을 utf-8로 명시
+    body = MIMEMultipart('alternative')
+    body.attach(MIMEText(html, 'html', 'utf-8'))
+    msg.attach(body)
+    # 본문에서 참조하는 썸네일만 인라인 이미지로 첨부 (내용이 같은 이미지는 한 번만)
+    attached = set()
+    for thumbnail in (thumbnails or {}).values():
+        if thumbnail.cid in attached or f'cid:{thumbnail.cid}' not in html:
+            continue
+        attached.add(thumbnail.cid)
+        image = MIMEImage(thumbnail.data, _subtype=thumbnail.subtype)
+        image.add_header('Content-ID', f'<{thumbnail.cid}>')
+        image.add_header('Content-Disposition', 'inline', filename=f"{thumbnail.cid.split('@')[0]}.{thumbnail.subtype}")
+        msg.attach(image)
+    return msg
+
 
 # 3. 이메일 발송 함수
-def send_email(html):
-    # Gmail SMTP 설정
-    smtp_server = 'smtp.gmail.com'
-    smtp_port = 587
-    
+def send_email(html, thumbnails=None):
     # 이메일 설정 (암호화된 config 파일 또는 환경변수에서 읽음)
     sender_email = get_config_value('SENDER_EMAIL')
     sender_password = get_config_value('EMAIL_PASSWORD')
     receiver_email = get_config_value('RECEIVER_EMAIL')
 
     # 메일 메시지 구성
-    msg = MIMEMultipart('alternative')
-    # 한글 제목을 위한 Header 적용
-    msg['Subject'] = Header('AX / IT 트랜드 뉴스레터', 'utf-8')
-    # 발신자 이름 및 표시 이메일 설정 (암호화된 config에서 읽음)
-    sender_name = 'AX / IT Trend for U'
-    display_email = get_config_value('DISPLAY_EMAIL')
-    msg['From'] = f'{sender_name} <{display_email}>'
-    msg['To'] = receiver_email
-    # 한글 인코딩 오류 방지를 위해 charset을 utf-8로 명시
-    msg.attach(MIMEText(html, 'html', 'utf-8'))
+    msg = build_email_message(html, thumbnails, receiver_email)
+    print(message_size_report(msg))
 
     # SMTP 서버 연결 및 메일 발송
     try:
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+        if SMTP_STARTTLS:
+            server.starttls()
         server.login(sender_email, sender_password)
         # 한글 인코딩 문제 방지를 위해 as_bytes()로 전송
         server.sendmail(sender_email, receiver_email, msg.as_bytes())
         server.quit()
+        telemetry.event('send', status='ok', recipients=1)
         print('뉴스레터 발송 완료!')
+        return True
     except Exception as e:
+        telemetry.event('send', status='error', error=str(e))
         print('메일 발송 오류:', e)
+        return False
+
+
+def default_recipients():
+    """RECIPIENTS_FILE + RECEIVER_EMAILS(쉼표 구분) + RECEIVER_EMAIL에서 수신자 목록 읽기"""
+    path = RECIPIENTS_FILE if os.path.exists(RECIPIENTS_FILE) else None
+    return load_recipients(path, ','.join([get_config_value('RECEIVER_EMAILS'), get_config_value('RECEIVER_EMAIL')]))
+
+
+def deliver_bulk(recipients, build_message):
+    """인증된 SMTP 연결 하나로 수신자별 메시지 발송 (속도 제한, 수신자별 실패 추적/재시도), DeliveryReport 반환"""
+    sender_email = get_config_value('SENDER_EMAIL')
+    mailer = BulkMailer(SMTP_SERVER, SMTP_PORT, sender_email, get_config_value('EMAIL_PASSWORD'),
+                        starttls=SMTP_STARTTLS, rate_per_minute=BULK_RATE_PER_MINUTE, max_retries=BULK_MAX_RETRIES)
+    with mailer:
+        report = mailer.send_all(sender_email, recipients, build_message)
+    telemetry.event('bulk_send', sent=len(report.sent), failed=len(report.failed), retries=report.retries,
+                    reconnects=report.reconnects, throttled_s=round(report.throttled, 2), elapsed_s=round(report.elapsed, 2))
+    telemetry.count('mail_sent', len(report.sent))
+    telemetry.count('mail_failed', len(report.failed))
+    print(report.summary())
+    return report
+
+
+def send_bulk_email(html, thumbnails=None, recipients=None):
+    """
+    수신자 목록에 같은 호를 대량 발송 (recipients가 없으면 default_recipients())
+    반환: DeliveryReport
+    """
+    if recipients is None:
+        recipients = default_recipients()
+
+    # 본문/첨부는 한 번만 직렬화하고 수신자별로 To 헤더만 앞에 붙임
+    msg = build_email_message(html, thumbnails)
+    print(message_size_report(msg))
+    payload = msg.as_bytes()
+    return deliver_bulk(recipients, lambda recipient: f'To: {recipient}\n'.encode('utf-8') + payload)
+
+
+def send_personalized_email(news, youtube_recommendations=None, thumbnails=None, recipients=None, subscriptions=None, notices=None):
+    """
+    구독 섹션에 맞춘 개인화 호 대량 발송
+    - 섹션 조각은 실행당 한 번만 렌더링하고, 같은 섹션 조합의 호는 한 번만 조립/직렬화
+    - 수신자별 비용은 To 헤더를 붙이는 것뿐 (수천 명이어도 렌더링은 구독 조합 수만큼)
+    - 조립한 호가 크기 예산을 넘으면 그 조합만 render_email()로 다시 렌더링
+    반환: DeliveryReport
+    """
+    if recipients is None:
+        recipients = default_recipients()
+    if subscriptions is None:
+        subscriptions = load_subscriptions(SUBSCRIPTIONS_FILE)
+    fragments = NewsletterFragments(news, youtube_recommendations, thumbnails, notices=notices)
+
+    payloads = {}  # 호 식별 키 -> 직렬화된 메시지
+    recipient_keys = {}
+    for recipient in recipients:
+        sections = subscriptions.get(recipient.lower())
+        key = fragments.edition_key(sections)
+        recipient_keys[recipient] = key
+        if key in payloads:
+            continue
+        html = fragments.assemble(key).html('email')
+        edition_thumbnails = fragments.thumbnails_for(key)
+        if html_size(html) > EMAIL_SIZE_BUDGET:
+            edition_news = {name: items for name, items in news.items() if name in key}
+            edition_videos = youtube_recommendations if YOUTUBE_SECTION in key else None
+            html, edition_thumbnails, size_report = render_email(edition_news, edition_videos, edition_thumbnails, EMAIL_SIZE_BUDGET, notices)
+            print(format_size_report(size_report))
+        payloads[key] = build_email_message(html, edition_thumbnails).as_bytes()
+    print(f'🧩 개인화 발송: 수신자 {len(recipients)}명 / 구독 조합 {len(payloads)}종 '
+          f'(섹션 조각 {len(fragments.sections)}개를 한 번만 렌더링)')
+    return deliver_bulk(recipients, lambda recipient: f'To: {recipient}\n'.encode('utf-8') + payloads[recipient_keys[recipient]])
 
 if __name__ == '__main__':
-    news = collect_news()
+    # 단계별 실행 시간/요청별 계측은 실행 종료 시 TELEMETRY_DIR에 JSON + Prometheus textfile로 저장
+    # 실행 시간 예산: 수집 단계가 마감을 넘기면 수집된 만큼으로 렌더링하고 잘린 섹션에 안내 문구 표시
+    run_deadline = RunDeadline(RUN_BUDGET_SECONDS)
+    with telemetry.stage('collect'):
+        news = collect_news(run_deadline)
     # 카테고리별 수집 결과를 콘솔에 출력
     for section, items in news.items():
         print(f'[{section}]')
@@ -803,27 +1048,58 @@ if __name__ == '__main__':
 
     # 유튜브 추천 영상 수집
     print('[유튜브 추천 영상]')
-    youtube_recommendations = collect_youtube_recommendations()
+    with telemetry.stage('youtube'):
+        youtube_recommendations = collect_youtube_recommendations(run_deadline)
     for video in youtube_recommendations:
         print(f"▶ {video['title']} ({video['channel']})")
         print(f"   썸네일: {video.get('thumbnail', 'N/A')}")
     print('-' * 40)
+    print(run_deadline.report())
+    notices = dict(run_deadline.degraded)
+    if notices:
+        telemetry.event('deadline_degraded', sections=list(notices))
 
     # 미리보기용 HTML 파일 경로 설정 (현재 스크립트 위치 기준)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     preview_path = os.path.join(script_dir, 'newsletter_preview_auto.html')
 
-    # 1. 브라우저 버전 HTML 생성 (그라데이션 적용)
-    html_browser = generate_html(news, youtube_recommendations, email_version=False)
-    html_browser = html_browser.replace('{{web_version_url}}', preview_path)
+    with telemetry.stage('render'):
+        # 썸네일은 한 번만 받아 축소 (이메일/브라우저 버전이 같은 이미지 사용)
+        thumbnails = prepare_thumbnails(youtube_recommendations)
+
+        # 본문은 한 번만 렌더링 (이메일/브라우저 버전은 버전별 스타일만 바꿔 조립)
+        rendered = render_newsletter(news, youtube_recommendations, thumbnails, notices=notices)
+
+        # 1. 브라우저 버전 HTML 파일로 로컬 저장 (그라데이션 적용, 문자열 전체를 만들지 않고 파일로 바로 기록)
+        rendered.write(preview_path, 'browser', {'{{web_version_url}}': preview_path})
+        print(f'브라우저 버전 HTML 저장 완료: {preview_path}')
+
+        # 지난 호 아카이브에 이번 호 반영 (입력이 바뀐 호와 목록 페이지만 다시 기록)
+        archive_files = build_archive(news, youtube_recommendations, rendered)
 
-    # 브라우저 버전 HTML 파일로 로컬 저장
-    with open(preview_path, 'w', encoding='utf-8') as f:
-        f.write(html_browser)
-    print(f'브라우저 버전 HTML 저장 완료: {preview_path}')
+        # 2. 이메일 버전은 크기 예산 안으로 렌더링 (발송 시 send_email(html_email, email_thumbnails))
+        html_email, email_thumbnails, size_report = render_email(news, youtube_recommendations, thumbnails, EMAIL_SIZE_BUDGET, notices)
+        print(format_size_report(size_report))
 
     # 웹브라우저로 자동 오픈
     webbrowser.open('file://' + preview_path)
 
+    # 이번 호 기사 발송 이력 기록 (아카이브와 같은 edition_key() 호로 기록, 워크플로우가 RECORD_SENT_EDITION=1로 실행)
+    # 워크플로우는 이 실행이 만든 최신 호/아카이브를 커밋하여 게시하므로 그 호의 기사를 다음 호 후보에서 제외
+    if RECORD_SENT_EDITION:
+        mark_edition_sent(news, edition_key())
+
     # GitHub 업로드 및 이메일 발송은 테스트용으로 생략
+    # (업로드 시 with telemetry.stage('upload'): publish_edition(rendered, archive_files),
+    #  발송 시 with telemetry.stage('send'): send_email(html_email, email_thumbnails)
+    #  또는 개인화 발송 send_personalized_email(...) - 발송 이력은 위에서 RECORD_SENT_EDITION으로 기록)
     print('테스트: GitHub 업로드 및 이메일 발송 생략, HTML만 생성/오픈')
+
+    # 전체 실행 동안의 HTTP 연결 재사용 현황 출력 후 헤지 요청 스레드풀/연결 풀 정리
+    print(transport.report())
+    transport.close()
+
+    # 실행 계측 보고서 저장
+    print(telemetry.format_summary())
+    json_path, prom_path = telemetry.write(TELEMETRY_DIR)
+    print(f'📈 실행 보고서 저장: {json_path}, {prom_path}')
@@ -0,0 +1,262 @@
+# 뉴스레터 기사 저장소 (SQLite)
+# 실행 간 수집 기사를 보관하여 이미 본 기사는 재처리 없이 건너뛰고, 지난 호에 실린 기사는 자동 제외
+# 주석은 한국어로 설명합니다
+
+import os
+import time
+import hashlib
+import sqlite3
+import datetime
+import threading
+import urllib.parse
+
+from newsletter_filters import normalize_title
+
+# 오래된 기사 정리 기준 (지난 호 중복 확인을 위해 발송 기사도 이 기간만큼 보관)
+ARTICLE_RETENTION_DAYS = 84
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    canonical_link TEXT NOT NULL UNIQUE,
+    link TEXT NOT NULL,
+    title TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    pub_ts INTEGER NOT NULL,
+    utc_offset INTEGER NOT NULL DEFAULT 0,
+    trusted INTEGER NOT NULL DEFAULT 0,
+    academic INTEGER NOT NULL DEFAULT 0,
+    non_academic INTEGER NOT NULL DEFAULT 0,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    sent_edition TEXT
+);
+CREATE TABLE IF NOT EXISTS article_categories (
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    PRIMARY KEY (article_id, category)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_fingerprint ON articles(fingerprint);
+CREATE INDEX IF NOT EXISTS idx_articles_pub_ts ON articles(pub_ts);
+CREATE INDEX IF NOT EXISTS idx_articles_sent ON articles(sent_edition);
+CREATE INDEX IF NOT EXISTS idx_article_categories_category ON article_categories(category, article_id);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+'''
+
+# 링크에서 제거할 추적용 쿼리 파라미터
+_TRACKING_PARAMS = {'oc', 'gclid', 'fbclid', 'ref'}
+
+
+def canonical_link(link):
+    """기사 링크 정규화 (스킴/호스트 소문자, 추적 파라미터와 #fragment 제거)"""
+    parts = urllib.parse.urlsplit(link.strip())
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+             if k not in _TRACKING_PARAMS and not k.startswith('utm_')]
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path,
+                                    urllib.parse.urlencode(query), ''))
+
+
+def edition_key(day=None):
+    """호 번호 = 그 주 월요일 날짜 'YYYY-MM-DD' (같은 주에 다시 실행해도 같은 호)"""
+    day = day or datetime.date.today()
+    if isinstance(day, datetime.datetime):
+        day = day.date()
+    return (day - datetime.timedelta(days=day.weekday())).isoformat()
+
+
+def title_fingerprint(title, source=''):
+    """정규화 제목 지문 (구글 뉴스 제목 끝의 ' - 언론사' 표기는 제외하여 매체가 달라도 같은 헤드라인으로 판단)"""
+    if source and title.endswith(f' - {source}'):
+        title = title[:-len(source) - 3]
+    return hashlib.sha1(normalize_title(title).encode('utf-8')).hexdigest()[:16]
+
+
+class ArticleStore:
+    """
+    수집 기사 SQLite 저장소
+    - 정규화 링크(canonical_link) 기준 upsert, 카테고리는 별도 테이블로 다대다 연결
+    - 인덱스: 정규화 링크, 제목 지문, 카테고리, 발행 시각
+    - 지난 호(sent_edition)에 실린 기사와 같은 제목 지문의 기사는 선택 후보에서 제외
+    - 필터 판정(trusted/academic/non_academic)은 처음 저장할 때 기록하고, 판정 규칙이 바뀌면 저장된 기사 전체를 재판정
+    여러 수집 스레드에서 조회하므로 연결 하나를 잠금으로 보호하여 공유함
+    """
+
+    def __init__(self, path):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(_SCHEMA)
+        self.counts = {'new': 0, 'seen': 0}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def reclassify(self, rules_hash, match_flags):
+        """
+        판정 규칙(newsletter_prompt.py의 언론사/학술기관/비학술 키워드 목록) 해시가 지난 실행과 다르면
+        저장된 모든 기사를 match_flags(title, source) → (trusted, academic, non_academic)로 다시 판정
+        반환: 다시 판정한 기사 수
+        """
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT value FROM store_meta WHERE key = 'filter_rules'").fetchone()
+            if row and row['value'] == rules_hash:
+                return 0
+            rows = self.conn.execute('SELECT id, title, source FROM articles').fetchall()
+            self.conn.executemany(
+                'UPDATE articles SET trusted = ?, academic = ?, non_academic = ? WHERE id = ?',
+                [(*map(int, match_flags(row['title'], row['source'])), row['id']) for row in rows])
+            self.conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('filter_rules', ?)", (rules_hash,))
+        return len(rows)
+
+    def upsert(self, items, category):
+        """
+        NewsItem 목록을 한 번에 저장하고 카테고리에 연결
+        이미 있는 기사(정규화 링크 충돌)는 last_seen만 갱신하고 다시 처리하지 않음
+        (필터 판정은 판정 규칙이 바뀌면 reclassify()가 저장된 기사 전체를 다시 판정하므로 항상 현재 규칙 기준)
+        """
+        now = int(time.time())
+        rows = {}
+        for item in items:
+            if not item.link or item.timestamp is None:
+                continue
+            canonical = canonical_link(item.link)
+            if canonical not in rows:
+                rows[canonical] = (canonical, item.link, item.title, item.source, title_fingerprint(item.title, item.source),
+                                   item.timestamp, item.utc_offset, int(item.trusted), int(item.academic),
+                                   int(item.non_academic), now, now)
+        if not rows:
+            return
+        with self._lock, self.conn:
+            # 새 기사는 기존 최대 id 뒤에 붙으므로 그 뒤의 행 수가 이번에 추가된 기사 수
+            last_id = self.conn.execute('SELECT COALESCE(MAX(id), 0) FROM articles').fetchone()[0]
+            self.conn.executemany(
+                'INSERT INTO articles (canonical_link, link, title, source, fingerprint, pub_ts, utc_offset, '
+                'trusted, academic, non_academic, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(canonical_link) DO UPDATE SET last_seen = excluded.last_seen', rows.values())
+            added = self.conn.execute('SELECT COUNT(*) FROM articles WHERE id > ?', (last_id,)).fetchone()[0]
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO article_categories (article_id, category) '
+                'SELECT id, ? FROM articles WHERE canonical_link = ?', [(category, canonical) for canonical in rows])
+        self.counts['new'] += added
+        self.counts['seen'] += len(rows) - added
+
+    def candidates(self, category, since_ts, until_ts, edition, exclude_academic=False, exclude_non_academic=False):
+        """
+        카테고리의 선택 후보를 발행 시각 최신순으로 반환 (sqlite3.Row 목록)
+        - 발행 시각이 [since_ts, until_ts] 범위인 기사
+        - 이번 호(edition) 이전 호에 실린 기사 및 같은 제목 지문의 기사 제외
+        """
+        conditions = ['c.category = ?', 'a.pub_ts BETWEEN ? AND ?',
+                      '(a.sent_edition IS NULL OR a.sent_edition = ?)',
+                      'NOT EXISTS (SELECT 1 FROM articles s WHERE s.fingerprint = a.fingerprint '
+                      'AND s.sent_edition IS NOT NULL AND s.sent_edition != ?)']
+        if exclude_academic:
+            conditions.append('a.academic = 0')
+        if exclude_non_academic:
+            conditions.append('a.non_academic = 0')
+        sql = ('SELECT a.* FROM article_categories c JOIN articles a ON a.id = c.article_id '
+               f'WHERE {" AND ".join(conditions)} ORDER BY a.pub_ts DESC, a.id')
+        with self._lock:
+            return self.conn.execute(sql, (category, since_ts, until_ts, edition, edition)).fetchall()
+
+    def mark_sent(self, links, edition):
+        """이번 호에 실린 기사로 기록 (다음 호부터 자동 제외)"""
+        with self._lock, self.conn:
+            self.conn.executemany('UPDATE articles SET sent_edition = ? WHERE canonical_link = ? AND sent_edition IS NULL',
+                                  [(edition, canonical_link(link)) for link in links])
+
+    def prune(self, retention_days=ARTICLE_RETENTION_DAYS):
+        """보관 기간이 지난 기사 삭제"""
+        cutoff = int(time.time()) - retention_days * 24 * 60 * 60
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM articles WHERE pub_ts < ? AND last_seen < ?', (cutoff, cutoff))
+
+    def report(self):
+        with self._lock:
+            total = self.conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+            sent = self.conn.execute('SELECT COUNT(*) FROM articles WHERE sent_edition IS NOT NULL').fetchone()[0]
+        return (f"🗄️ 기사 저장소: 신규 {self.counts['new']}건 / 기존 기사 재확인 {self.counts['seen']}건 "
+                f'(전체 {total}건, 발송 이력 {sent}건)')
+
+
+# 영상 메타데이터 캐시 최대 보관 건수 (초과 시 최근 사용 시각이 오래된 순으로 삭제)
+VIDEO_CACHE_MAX_ENTRIES = 5000
+
+_VIDEO_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL,
+    last_access INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_videos_last_access ON videos(last_access);
+'''
+
+
+class VideoMetadataCache:
+    """
+    유튜브 영상 메타데이터 캐시 (video_id → 제목/채널, SQLite)
+    영상 제목과 채널은 거의 바뀌지 않으므로 한 번 조회한 영상은 다음 실행부터 oEmbed 요청 없이 재사용
+    보관 건수가 max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    """
+
+    def __init__(self, path, max_entries=VIDEO_CACHE_MAX_ENTRIES):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(_VIDEO_SCHEMA)
+        self.counts = {'hit': 0, 'miss': 0}
+
+    def close(self):
+        self.conn.close()
+
+    def get_many(self, video_ids):
+        """캐시에 있는 영상 {video_id: {'title', 'channel'}} 반환 (조회된 항목은 최근 사용 시각 갱신)"""
+        video_ids = list(dict.fromkeys(video_ids))
+        found = {}
+        for start in range(0, len(video_ids), 500):
+            chunk = video_ids[start:start + 500]
+            rows = self.conn.execute(
+                f'SELECT video_id, title, channel FROM videos WHERE video_id IN ({",".join("?" * len(chunk))})', chunk)
+            for row in rows:
+                found[row['video_id']] = {'title': row['title'], 'channel': row['channel']}
+        now = int(time.time())
+        with self.conn:
+            self.conn.executemany('UPDATE videos SET last_access = ? WHERE video_id = ?',
+                                  [(now, video_id) for video_id in found])
+        self.counts['hit'] += len(found)
+        self.counts['miss'] += len(video_ids) - len(found)
+        return found
+
+    def put_many(self, metadata):
+        """{video_id: {'title', 'channel'}} 저장"""
+        now = int(time.time())
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO videos (video_id, title, channel, fetched_at, last_access) VALUES (?, ?, ?, ?, ?)',
+                [(video_id, info['title'], info['channel'], now, now) for video_id, info in metadata.items()])
+
+    def evict(self):
+        """보관 건수 초과분을 최근 사용 시각이 오래된 순으로 삭제"""
+        with self.conn:
+            self.conn.execute(
+                'DELETE FROM videos WHERE video_id IN (SELECT video_id FROM videos ORDER BY last_access DESC, fetched_at DESC '
+                'LIMIT -1 OFFSET ?)', (self.max_entries,))
+
+    def report(self):
+        return f"🎞️ 영상 정보 캐시: 적중 {self.counts['hit']}건 / oEmbed 조회 {self.counts['miss']}건"
@@ -0,0 +1,242 @@
+# 뉴스레터 실행 계측 (단계별/요청별 타이머와 카운터)
+# 단계(collect, youtube, render, upload, send)마다 실행 시간/CPU 시간/성공 여부를,
+# 외부 요청마다 호스트/조회어/지연/바이트/상태/캐시 적중/파싱 항목 수/선택 항목 수를 기록하고
+# 실행 보고서를 JSON과 Prometheus textfile(node_exporter textfile collector 형식)로 저장
+# 주석은 한국어로 설명합니다
+
+import os
+import json
+import time
+import threading
+import contextlib
+import urllib.parse
+
+# 요청 기록에서 조회어로 사용할 쿼리 파라미터 (구글 뉴스 q, 유튜브 search_query, 채널 피드 channel_id)
+_QUERY_PARAMS = ('q', 'search_query', 'channel_id')
+
+
+def _quantile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _label(value):
+    """Prometheus 레이블 값 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Telemetry:
+    """
+    한 번의 실행 동안 계측값을 모으는 수집기 (여러 수집 스레드에서 동시에 기록하므로 잠금으로 보호)
+    - stage(name): 단계 실행 시간/CPU 시간 측정 (예외가 나면 실패로 기록 후 그대로 전달)
+    - track(kind, **fields): 요청 하나의 기록을 열어 두고, 그 안에서 전송 계층이 보낸 요청 결과를 같은 기록에 채움
+      (호출자는 items_parsed 등 파싱 결과를 기록에 덧붙임, 예외는 error로 기록 후 그대로 전달)
+    - count(name, value): 이름별 누적 카운터
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started = time.time()
+        self.stages = {}
+        self.requests = []
+        self.counters = {}
+        self.events = []
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.stages = {}
+            self.requests = []
+            self.counters = {}
+            self.events = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        record = {'status': 'ok'}
+        try:
+            yield record
+        except BaseException as e:
+            record['status'] = 'error'
+            record['error'] = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            record['wall_s'] = round(time.perf_counter() - wall, 4)
+            record['cpu_s'] = round(time.process_time() - cpu, 4)
+            with self._lock:
+                self.stages[name] = record
+
+    @contextlib.contextmanager
+    def track(self, kind, **fields):
+        record = {'kind': kind, **fields}
+        outer = getattr(self._local, 'record', None)
+        self._local.record = record
+        try:
+            yield record
+        except Exception as e:
+            record.setdefault('error', f'{type(e).__name__}: {e}')
+            raise
+        finally:
+            self._local.record = outer
+            with self._lock:
+                self.requests.append(record)
+
+    def record_request(self, method, url, status=None, latency=0.0, size=0, cache=None, error=None, throttle=0.0):
+        """
+        전송 계층에서 호출 - 열린 track() 기록이 있으면 채우고, 없으면 새 기록 추가
+        throttle: 보내기 전 호스트 속도 제한으로 기다린 시간 (초, latency에는 포함하지 않음)
+        """
+        parts = urllib.parse.urlsplit(url)
+        params = urllib.parse.parse_qs(parts.query)
+        query = next((params[name][0] for name in _QUERY_PARAMS if name in params), '')
+        fields = {'method': method, 'host': parts.hostname or '', 'path': parts.path, 'query': query,
+                  'status': status, 'latency_s': round(latency, 4), 'bytes': size, 'cache': cache}
+        if error:
+            fields['error'] = error
+        if throttle:
+            fields['throttle_s'] = round(throttle, 4)
+        record = getattr(self._local, 'record', None)
+        if record is not None and 'host' not in record:
+            record.update({key: value for key, value in fields.items() if key not in record})
+            return
+        with self._lock:
+            self.requests.append({'kind': 'http', **fields})
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def event(self, name, **fields):
+        """업로드/발송 결과 등 실행 중 한 번씩 일어나는 일 기록"""
+        with self._lock:
+            self.events.append({'name': name, 'time': round(time.time() - self.started, 3), **fields})
+
+    def summary(self):
+        """호스트별 요청 수/오류/바이트/캐시 적중/지연(p50, p95) 및 요청 종류별 파싱/선택 항목 수"""
+        with self._lock:
+            requests = list(self.requests)
+        hosts = {}
+        kinds = {}
+        for record in requests:
+            host = hosts.setdefault(record.get('host', ''), {
+                'requests': 0, 'errors': 0, 'bytes': 0, 'cache_hits': 0, 'throttle_s': 0.0, 'latencies': []})
+            host['requests'] += 1
+            host['errors'] += bool(record.get('error')) or (record.get('status') or 0) >= 400
+            host['bytes'] += record.get('bytes') or 0
+            host['cache_hits'] += record.get('cache') == 'hit'
+            host['throttle_s'] += record.get('throttle_s') or 0.0
+            host['latencies'].append(record.get('latency_s') or 0.0)
+            kind = kinds.setdefault(record['kind'], {'requests': 0, 'errors': 0, 'items_parsed': 0, 'items_kept': 0})
+            kind['requests'] += 1
+            kind['errors'] += bool(record.get('error'))
+            kind['items_parsed'] += record.get('items_parsed') or 0
+            kind['items_kept'] += record.get('items_kept') or 0
+        for host in hosts.values():
+            latencies = host.pop('latencies')
+            host['throttle_s'] = round(host['throttle_s'], 4)
+            host['latency_sum_s'] = round(sum(latencies), 4)
+            host['latency_p50_s'] = _quantile(latencies, 0.5)
+            host['latency_p95_s'] = _quantile(latencies, 0.95)
+        return {'hosts': hosts, 'kinds': kinds}
+
+    def report(self):
+        """실행 보고서 (JSON 저장용 dict)"""
+        summary = self.summary()
+        with self._lock:
+            return {
+                'started': self.started,
+                'finished': time.time(),
+                'stages': dict(self.stages),
+                'counters': dict(self.counters),
+                'events': list(self.events),
+                'hosts': summary['hosts'],
+                'kinds': summary['kinds'],
+                'requests': list(self.requests),
+            }
+
+    def prometheus(self, report=None):
+        """Prometheus 텍스트 노출 형식"""
+        report = report or self.report()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_label(val)}"' for key, val in labels.items())
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        stages = report['stages']
+        metric('newsletter_last_run_timestamp_seconds', 'gauge', '실행 종료 시각', [({}, round(report['finished'], 3))])
+        metric('newsletter_stage_duration_seconds', 'gauge', '단계별 실행 시간',
+               [({'stage': name}, stage['wall_s']) for name, stage in stages.items()])
+        metric('newsletter_stage_cpu_seconds', 'gauge', '단계별 CPU 시간',
+               [({'stage': name}, stage['cpu_s']) for name, stage in stages.items()])
+        metric('newsletter_stage_success', 'gauge', '단계 성공 여부 (1 성공, 0 실패)',
+               [({'stage': name}, int(stage['status'] == 'ok')) for name, stage in stages.items()])
+        hosts = report['hosts']
+        metric('newsletter_requests_total', 'counter', '호스트별 요청 수',
+               [({'host': host}, data['requests']) for host, data in hosts.items()])
+        metric('newsletter_request_errors_total', 'counter', '호스트별 실패 요청 수',
+               [({'host': host}, data['errors']) for host, data in hosts.items()])
+        metric('newsletter_request_cache_hits_total', 'counter', '호스트별 디스크 캐시 적중 수',
+               [({'host': host}, data['cache_hits']) for host, data in hosts.items()])
+        metric('newsletter_response_bytes_total', 'counter', '호스트별 수신 바이트',
+               [({'host': host}, data['bytes']) for host, data in hosts.items()])
+        metric('newsletter_throttle_wait_seconds_total', 'counter', '호스트별 속도 제한 대기 시간',
+               [({'host': host}, data['throttle_s']) for host, data in hosts.items()])
+        latency = []
+        for host, data in hosts.items():
+            latency.append(({'host': host, 'quantile': '0.5'}, data['latency_p50_s']))
+            latency.append(({'host': host, 'quantile': '0.95'}, data['latency_p95_s']))
+        metric('newsletter_request_latency_seconds', 'summary', '호스트별 요청 지연', latency)
+        lines.extend(f'newsletter_request_latency_seconds_sum{{host="{_label(host)}"}} {data["latency_sum_s"]}'
+                     for host, data in hosts.items())
+        lines.extend(f'newsletter_request_latency_seconds_count{{host="{_label(host)}"}} {data["requests"]}'
+                     for host, data in hosts.items())
+        kinds = report['kinds']
+        metric('newsletter_items_parsed_total', 'counter', '요청 종류별 파싱 항목 수',
+               [({'kind': kind}, data['items_parsed']) for kind, data in kinds.items()])
+        metric('newsletter_items_kept_total', 'counter', '요청 종류별 뉴스레터에 실린 항목 수',
+               [({'kind': kind}, data['items_kept']) for kind, data in kinds.items()])
+        metric('newsletter_events_total', 'counter', '이름별 누적 카운터',
+               [({'name': name}, value) for name, value in report['counters'].items()])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory, prefix='newsletter'):
+        """
+        <directory>/<prefix>-<시각>.json (실행별 보고서, 주간 추이 비교용)과
+        <directory>/<prefix>.prom (최신 실행, textfile collector가 읽는 파일) 기록, 반환: (JSON 경로, prom 경로)
+        """
+        report = self.report()
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f"{prefix}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(report['started']))}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        prom_path = os.path.join(directory, f'{prefix}.prom')
+        # textfile collector가 쓰는 도중의 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        with open(f'{prom_path}.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.prometheus(report))
+        os.replace(f'{prom_path}.tmp', prom_path)
+        return json_path, prom_path
+
+    def format_summary(self):
+        """콘솔용 요약"""
+        report = self.report()
+        lines = ['📈 실행 계측 요약']
+        for name, stage in report['stages'].items():
+            status = '' if stage['status'] == 'ok' else f" ❌ {stage.get('error', '')}"
+            lines.append(f"   [{name}] {stage['wall_s']:.2f}s (CPU {stage['cpu_s']:.2f}s){status}")
+        for host, data in sorted(report['hosts'].items()):
+            lines.append(f"   {host}: 요청 {data['requests']}건 / 실패 {data['errors']}건 / 캐시 적중 {data['cache_hits']}건 / "
+                         f"p50 {data['latency_p50_s'] * 1000:.0f}ms, p95 {data['latency_p95_s'] * 1000:.0f}ms / "
+                         f"{data['bytes'] / 1024:.0f}KB" +
+                         (f" / 속도 제한 대기 {data['throttle_s']:.2f}s" if data['throttle_s'] else ''))
+        return '\n'.join(lines)
+
+
+# 프로그램 전체가 공유하는 계측 수집기
+telemetry = Telemetry()
@@ -0,0 +1,499 @@
+# 뉴스레터 HTML 템플릿
+# 템플릿 조각을 모듈 로드 시 한 번만 (리터럴, 슬롯) 목록으로 컴파일하고,
+# 이메일/브라우저 버전이 공유하는 본문은 한 번만 렌더링한 뒤 버전별 스타일만 끼워 넣어 완성함
+# 문자열 += 반복 없이 조각 목록에 모았다가 한 번에 join하거나 파일로 바로 기록
+# 주석은 한국어로 설명합니다
+
+import re
+import html as html_lib
+import datetime
+import string
+
+from newsletter_images import data_uri
+
+# 렌더링 버전 (email: 단색 배경/호환성 우선, browser: 그라데이션 배경/풀 디자인)
+VARIANTS = ('email', 'browser')
+
+# 버전별 배경 스타일
+VARIANT_STYLES = {
+    'email': {
+        'header_bg': 'background-color:#1e3a8a;',
+        'subheader_bg': 'background-color:#1e3a8a;',
+        'footer_bg': 'background-color:#1e3a8a;',
+    },
+    'browser': {
+        'header_bg': 'background:linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%);',
+        'subheader_bg': 'background:linear-gradient(90deg, #1e3a8a 0%, #2563eb 100%);',
+        'footer_bg': 'background:linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%);',
+    },
+}
+
+# 카테고리별 아이콘 매핑
+SECTION_ICONS = {
+    'AX 활용 사례': '⚡',
+    '국내 AI 소식': '🇰🇷',
+    '해외 AI 신규뉴스': '🌍',
+    '피지컬 AI': '🤖',
+    '금융사 AI 적용 사례 및 규제 완화 소식': '💰',
+    '🔥 한화그룹 Hot News': '🔥'
+}
+
+
+class Variant(dict):
+    """버전마다 값이 다른 슬롯 값 {버전명: 문자열} - 공유 렌더링 결과에 그대로 남았다가 버전별 조립 시 치환됨"""
+
+
+class CompiledTemplate:
+    """
+    str.format 문법 템플릿을 리터럴 문자열과 슬롯 이름 목록으로 한 번만 분해해 둔 템플릿
+    render_into()는 출력 목록에 조각을 추가하기만 하므로 렌더링 비용이 결과 길이에 선형
+    """
+
+    def __init__(self, source):
+        self.parts = []
+        for literal, field, _, _ in string.Formatter().parse(source):
+            if literal:
+                self.parts.append(literal)
+            if field is not None:
+                self.parts.append((field,))
+
+    def render_into(self, out, **values):
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+            else:
+                value = values[part[0]]
+                if isinstance(value, list):
+                    out.extend(value)  # 미리 렌더링한 조각 목록
+                else:
+                    out.append(value)
+
+    def render(self, **values):
+        """조각 목록으로 렌더링 (Variant 값 포함 가능)"""
+        out = []
+        self.render_into(out, **values)
+        return out
+
+
+_HEAD = CompiledTemplate("""
+    <style>
+        .date-badge {{{{
+            display: none !important;
+        }}}}
+        .content-cell {{{{
+            padding: 15px !important;
+        }}}}
+        .section-title {{{{
+            font-size: 1em !important;
+        }}}}
+        .news-item {{{{
+            font-size: 14px !important;
+        }}}}
+        .youtube-thumb {{{{
+            width: 120px !important;
+            height: 68px !important;
+        }}}}
+        .youtube-title {{{{
+            font-size: 13px !important;
+        }}}}
+        .footer-cell {{{{
+            padding: 15px !important;
+        }}}}
+        .logo-badge {{{{
+            padding: 8px 12px !important;
+        }}}}
+        .logo-text {{{{
+            font-size: 14px !important;
+        }}}}
+    </style>
+    </head>
+    <body style='font-family:Segoe UI,Arial,sans-serif; background-color:#f5f5f5; margin:0; padding:10px; word-wrap:break-word; word-break:break-word;'>
+        <!-- 웹 브라우저에서 보기 배너 (Outlook 호환) -->
+        <table width='100%' cellpadding='0' cellspacing='0' border='0' style='max-width:1000px; width:100%; margin:0 auto 15px auto;'>
+            <tr>
+                <td align='center' bgcolor='#f7931e' style='background-color:#f7931e; border-radius:12px; mso-padding-alt:15px 20px;'>
+                    <a href='{{{{web_version_url}}}}' target='_blank' style='display:block; padding:15px 20px; color:#ffffff; font-family:Segoe UI,Arial,sans-serif; font-size:15px; font-weight:bold; text-decoration:none; text-align:center;'>
+                        &#10024; 더 멋진 디자인으로 보기 - 클릭하여 웹 브라우저에서 열기 &#8594;
+                    </a>
+                </td>
+            </tr>
+        </table>
+        <!-- 뉴스레터 헤더 배너 -->
+        <table class='email-container' width='100%' cellpadding='0' cellspacing='0' border='0' style='max-width:1000px; width:100%; margin:0 auto;'>
+            <tr>
+                <td class='header-cell' style='{header_bg} border-radius:16px 16px 0 0; padding:20px;'>
+                    <!-- 로고 + 날짜 한 줄 -->
+                    <table width='100%' cellpadding='0' cellspacing='0' border='0'>
+                        <tr>
+                            <td style='vertical-align:middle;'>
+                                <div style='display:inline-block; background:#fff; border-radius:10px; padding:8px 12px;'>
+                                    <span style='font-size:20px;'>🚀</span>
+                                    <span style='font-size:14px; font-weight:700; color:#1e3a8a;'>Hanwha Systems/ICT</span>
+                                </div>
+                            </td>
+                            <td style='text-align:right; vertical-align:middle;'>
+                                <span style='color:#fff; font-size:13px; background:rgba(255,255,255,0.2); padding:6px 12px; border-radius:8px;'>📅 {today}</span>
+                            </td>
+                        </tr>
+                    </table>
+                    <!-- 메인 타이틀 -->
+                    <h1 style='color:#ffffff; font-size:24px; font-weight:800; margin:15px 0 5px 0;'>
+                        AX / IT 트랜드 뉴스레터
+                    </h1>
+                    <p style='color:rgba(255,255,255,0.85); font-size:12px; margin:0;'>
+                        AI Transformation & Digital Innovation Weekly Digest
+                    </p>
+                </td>
+            </tr>
+            <!-- 서브 헤더 바 -->
+            <tr>
+                <td class='content-cell' style='{subheader_bg} padding:10px 25px;'>
+                    <table width='100%' cellpadding='0' cellspacing='0' border='0'>
+                        <tr>
+                            <td class='header-subtitle' style='color:rgba(255,255,255,0.9); font-size:11px;'>
+                                📊 AX &nbsp;|&nbsp; 🤖 AI &nbsp;|&nbsp; 🌍 글로벌 &nbsp;|&nbsp; 🔥 한화
+                            </td>
+                        </tr>
+                    </table>
+                </td>
+            </tr>
+            <!-- 본문 컨테이너 -->
+            <tr>
+                <td class='content-cell' style='background:#ffffff; padding:20px 25px;'>
+    """)
+_SECTION_HANWHA = CompiledTemplate("""
+            <div style='background-color:#ff6b35; border-radius:12px; padding:20px; margin:25px 0 15px 0;'>
+                <h2 class='section-title' style='color:#fff; margin:0; font-size:1.3em;'>{section}</h2>
+            </div>
+            <ul style='list-style:none; padding:0; margin:0;'>
+            """)
+_SECTION = CompiledTemplate("""
+            <div style='border-left:4px solid #3b82f6; padding-left:15px; margin:25px 0 15px 0;'>
+                <h2 class='section-title' style='color:#1e3a8a; margin:0; font-size:1.2em;'>{icon} {section}</h2>
+            </div>
+            <ul style='list-style:none; padding:0; margin:0;'>
+            """)
+_NEWS_ITEM = CompiledTemplate("<li class='news-item' style='padding:8px 0; border-bottom:1px solid #f0f0f0; word-wrap:break-word; word-break:break-word; overflow-wrap:break-word;'>{item}</li>")
+_SECTION_END = "</ul>"
+# 실행 시간 제한 등으로 일부 키워드만 반영된 섹션의 안내 문구
+_NEWS_NOTICE = CompiledTemplate("<li class='news-notice' style='padding:8px 0; color:#b45309; font-size:0.85em;'>⏳ {notice}</li>")
+_YOUTUBE_OPEN = """
+        <div style='margin-top:40px; padding:25px; background:#f8f9fa; border-radius:16px;'>
+            <h2 style='color:#333; margin-top:0; margin-bottom:8px; font-size:1.4em;'>🎬 추천 AX 영상</h2>
+            <p style='color:#666; font-size:0.9em; margin-bottom:20px;'>이번 주 주목할 만한 AI/AX 관련 유튜브 콘텐츠를 추천합니다.</p>
+            <table cellpadding='0' cellspacing='0' border='0' width='100%'>
+        """
+_YOUTUBE_NOTICE = CompiledTemplate("""
+                <tr>
+                    <td style='padding:0 0 10px 0; color:#b45309; font-size:0.85em;'>⏳ {notice}</td>
+                </tr>
+            """)
+_THUMBNAIL_IMG = CompiledTemplate("<img class='youtube-thumb' src='{thumbnail_src}' width='160' height='90' alt='썸네일' style='width:160px; height:90px; object-fit:cover; border-radius:8px; display:block;'>")
+_THUMBNAIL_PLACEHOLDER = "<div class='youtube-thumb' style='width:160px; height:90px; background-color:#ff0000; border-radius:8px; display:table-cell; vertical-align:middle; text-align:center; color:#fff; font-size:32px;'>▶</div>"
+_VIDEO = CompiledTemplate("""
+                <tr>
+                    <td style='padding:10px 0; border-bottom:1px solid #eee;'>
+                        <table cellpadding='0' cellspacing='0' border='0' width='100%'>
+                            <tr>
+                                <td width='170' valign='top'>
+                                    <a href='{link}' target='_blank'>{img_html}</a>
+                                </td>
+                                <td valign='top' style='padding-left:15px;'>
+                                    <a class='youtube-title' href='{link}' target='_blank' style='text-decoration:none; color:#222; font-size:0.95em; font-weight:600; line-height:1.4;'>{title}</a>
+                                    <div style='margin-top:8px;'>
+                                        <span style='color:#ff0000; font-size:0.8em; font-weight:500;'>{channel}</span>
+                                    </div>
+                                    <div style='color:#888; font-size:0.75em; margin-top:4px;'>{date_str}</div>
+                                </td>
+                            </tr>
+                        </table>
+                    </td>
+                </tr>
+            """)
+_YOUTUBE_CLOSE = """
+            </table>
+        </div>
+        """
+_FOOTER = CompiledTemplate("""
+                </td>
+            </tr>
+            <!-- 푸터 -->
+            <tr>
+                <td class='footer-cell' style='{footer_bg} border-radius:0 0 16px 16px; padding:20px 25px;'>
+                    <table width='100%' cellpadding='0' cellspacing='0' border='0'>
+                        <tr>
+                            <td style='color:#ffffff; font-size:11px; line-height:1.6; vertical-align:middle;'>
+                                <div class='logo-badge' style='font-weight:600; font-size:13px; margin-bottom:8px;'>🚀 Hanwha Systems/ICT</div>
+                                매주 월요일 오전 8시 자동 발송<br>
+                                AI/AX 트랜드 & 한화그룹 뉴스
+                            </td>
+                            <td style='color:rgba(255,255,255,0.7); font-size:10px; text-align:right; vertical-align:middle;'>
+                                Copyright 2026. hanwhasystem Inc. All rights reserved.
+                            </td>
+                        </tr>
+                    </table>
+                </td>
+            </tr>
+        </table>
+    </body>
+    </html>
+    """)
+
+
+class RenderedNewsletter:
+    """
+    두 버전이 공유하는 렌더링 결과 - 인접한 공통 문자열은 미리 합쳐 두어
+    버전별 조립은 공통 조각과 Variant 값을 번갈아 이어 붙이기만 함
+    """
+
+    def __init__(self, chunks):
+        self.chunks = []
+        buffer = []
+        for chunk in chunks:
+            if isinstance(chunk, Variant):
+                if buffer:
+                    self.chunks.append(''.join(buffer))
+                    buffer = []
+                self.chunks.append(chunk)
+            else:
+                buffer.append(chunk)
+        if buffer:
+            self.chunks.append(''.join(buffer))
+
+    def iter_chunks(self, variant):
+        for chunk in self.chunks:
+            yield chunk[variant] if isinstance(chunk, Variant) else chunk
+
+    def html(self, variant):
+        """버전별 완성 HTML 문자열"""
+        return ''.join(self.iter_chunks(variant))
+
+    def write(self, path, variant, replacements=None):
+        """버전별 HTML을 문자열 전체를 만들지 않고 파일로 바로 기록 (replacements: {자리표시자: 값})"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for chunk in self.iter_chunks(variant):
+                for placeholder, value in (replacements or {}).items():
+                    chunk = chunk.replace(placeholder, value)
+                f.write(chunk)
+
+
+# 구독 설정에서 유튜브 추천 섹션을 가리키는 이름
+YOUTUBE_SECTION = '🎬 추천 AX 영상'
+
+
+class NewsletterFragments:
+    """
+    머리말/섹션별/유튜브/꼬리말 조각을 실행당 한 번만 렌더링해 두고,
+    구독자별 호(edition)는 필요한 조각을 이어 붙이기만 하여 만듦 (같은 섹션 조합은 한 번만 조립)
+    notices: {섹션명: 안내 문구} - 일부만 수집된 섹션은 제목 아래에 안내 문구 표시
+    """
+
+    def __init__(self, news, youtube_recommendations=None, thumbnails=None, today=None, notices=None):
+        if today is None:
+            today = datetime.date.today().strftime('%Y년 %m월 %d일')
+        styles = {name: Variant({variant: VARIANT_STYLES[variant][name] for variant in VARIANTS})
+                  for name in VARIANT_STYLES['email']}
+        self.thumbnails = thumbnails or {}
+        notices = notices or {}
+        self.head = RenderedNewsletter(_HEAD.render(today=today, header_bg=styles['header_bg'],
+                                                    subheader_bg=styles['subheader_bg']))
+        self.sections = {}  # 섹션명 -> RenderedNewsletter (표시 순서 유지)
+        for section, items in news.items():
+            out = []
+            icon = SECTION_ICONS.get(section, '📰')
+            # 한화그룹 뉴스는 특별 스타일
+            if '한화' in section:
+                _SECTION_HANWHA.render_into(out, section=section)
+            else:
+                _SECTION.render_into(out, icon=icon, section=section)
+            if section in notices:
+                _NEWS_NOTICE.render_into(out, notice=notices[section])
+            for item in items:
+                _NEWS_ITEM.render_into(out, item=item)
+            out.append(_SECTION_END)
+            self.sections[section] = RenderedNewsletter(out)
+
+        # 유튜버 추천 섹션 (썸네일은 미리 받아 축소해 둔 이미지 사용)
+        self.youtube_thumbnails = {}
+        if youtube_recommendations:
+            out = [_YOUTUBE_OPEN]
+            if YOUTUBE_SECTION in notices:
+                _YOUTUBE_NOTICE.render_into(out, notice=notices[YOUTUBE_SECTION])
+            for video in youtube_recommendations:
+                thumbnail = self.thumbnails.get(video.get('thumbnail', ''))
+                # 썸네일이 있으면 이미지 표시, 없으면 대체 아이콘
+                if thumbnail:
+                    self.youtube_thumbnails[video['thumbnail']] = thumbnail
+                    img_html = _THUMBNAIL_IMG.render(thumbnail_src=Variant(email=f'cid:{thumbnail.cid}',
+                                                                           browser=data_uri(thumbnail)))
+                else:
+                    img_html = _THUMBNAIL_PLACEHOLDER
+                _VIDEO.render_into(out, link=video['link'], img_html=img_html, title=video['title'],
+                                   channel=video['channel'], date_str=video.get('date', ''))
+            out.append(_YOUTUBE_CLOSE)
+            self.sections[YOUTUBE_SECTION] = RenderedNewsletter(out)
+
+        self.footer = RenderedNewsletter(_FOOTER.render(footer_bg=styles['footer_bg']))
+        self._editions = {}
+
+    def edition_key(self, sections=None):
+        """구독 섹션 목록 → 호 식별 키 (표시 순서대로 정렬된 섹션명 튜플, None이면 전체)"""
+        if sections is None:
+            return tuple(self.sections)
+        wanted = set(sections)
+        return tuple(name for name in self.sections if name in wanted)
+
+    def assemble(self, sections=None):
+        """선택한 섹션만 포함한 RenderedNewsletter (같은 조합은 캐시된 결과 재사용)"""
+        key = self.edition_key(sections)
+        edition = self._editions.get(key)
+        if edition is None:
+            chunks = list(self.head.chunks)
+            for name in key:
+                chunks.extend(self.sections[name].chunks)
+            chunks.extend(self.footer.chunks)
+            edition = self._editions[key] = RenderedNewsletter(chunks)
+        return edition
+
+    def thumbnails_for(self, sections=None):
+        """해당 호에 첨부할 썸네일 (유튜브 섹션이 없으면 빈 dict)"""
+        return self.youtube_thumbnails if YOUTUBE_SECTION in self.edition_key(sections) else {}
+
+
+def render_newsletter(news, youtube_recommendations=None, thumbnails=None, today=None, notices=None):
+    """
+    뉴스레터 본문을 한 번만 렌더링하여 RenderedNewsletter 반환
+    - 썸네일은 이메일 버전 cid: 참조, 브라우저 버전 data URI (thumbnails: {썸네일 URL: Thumbnail})
+    - today: 상단 날짜 표시 문자열 (기본값 오늘)
+    - notices: {섹션명: 안내 문구} (일부만 수집된 섹션 표시)
+    """
+    return NewsletterFragments(news, youtube_recommendations, thumbnails, today, notices).assemble()
+
+
+# ============================================================
+# 이메일 크기 예산 렌더링
+# Gmail은 HTML 본문이 약 102KB를 넘으면 뒷부분을 잘라 '메시지 잘림' 링크로 표시하므로
+# 예산을 넘으면 압축 → 썸네일 제거 → 기사 수 축소 → 추천 영상 수 축소 순으로 단계적으로 줄임
+# (style 속성을 <style> 블록의 클래스로 옮기면 일부 웹메일이 블록을 지워 서식이 깨지므로 인라인 style은 그대로 유지)
+# ============================================================
+GMAIL_CLIP_BYTES = 102 * 1024
+# 기본 예산 (잘림 기준보다 약간 작게 잡아 메일 클라이언트가 덧붙이는 부분 여유 확보)
+EMAIL_HTML_BUDGET = 100 * 1024
+
+# 조건부 주석(<!--[if mso]>)은 Outlook 렌더링에 쓰이므로 남김
+_HTML_COMMENT = re.compile(r'<!--(?!\[if)(?!<!\[endif).*?-->', re.S)
+# 줄바꿈이 포함된 태그 사이 공백만 제거 (한 줄 안의 '</a> <span>' 같은 표시용 공백은 유지)
+_NEWLINE_BETWEEN_TAGS = re.compile(r'>[ \t]*\n\s*<')
+_NEWLINE_RUN = re.compile(r'[ \t]*\n\s*')
+_SPACE_RUN = re.compile(r'[ \t]{2,}')
+
+
+def minify_html(html):
+    """HTML 주석과 들여쓰기/줄바꿈 공백 제거 (표시되는 텍스트와 속성값은 그대로 유지)"""
+    html = _HTML_COMMENT.sub('', html)
+    html = _NEWLINE_BETWEEN_TAGS.sub('><', html)
+    html = _NEWLINE_RUN.sub(' ', html)
+    html = _SPACE_RUN.sub(' ', html)
+    return html.strip()
+
+
+def html_size(html):
+    """Gmail 잘림 판정 기준인 HTML 본문 UTF-8 바이트 수"""
+    return len(html.encode('utf-8'))
+
+
+def render_email(news, youtube_recommendations=None, thumbnails=None, budget=EMAIL_HTML_BUDGET, notices=None):
+    """
+    크기 예산 안에 들어오는 이메일 버전 HTML 렌더링
+    단계: 원본 → 압축(minify) → 썸네일 제거 → 기사 수 축소(긴 섹션 뒤쪽부터, 섹션당 최소 1건)
+          → 추천 영상 수 축소(뒤쪽부터, 최소 1개)
+    반환: (html, 실제 사용한 thumbnails, 단계별 크기 보고 dict)
+    """
+    report = {'budget': budget, 'steps': [], 'dropped_images': False, 'trimmed_items': 0, 'trimmed_videos': 0}
+
+    def build(news, thumbnails, steps=None, videos=youtube_recommendations):
+        """렌더링 후 예산을 넘으면 압축 적용 (steps가 있으면 단계별 크기 기록)"""
+        html = render_newsletter(news, videos, thumbnails, notices=notices).html('email')
+        for name, shrink in (('원본', None), ('압축', minify_html)):
+            if shrink is not None:
+                if html_size(html) <= budget:
+                    break
+                html = shrink(html)
+            if steps is not None:
+                steps.append((name, html_size(html)))
+        return html
+
+    html = build(news, thumbnails, report['steps'])
+    # 1차 축소: 썸네일 제거 (이미지 태그와 첨부 이미지가 빠짐)
+    if html_size(html) > budget and thumbnails:
+        thumbnails = {}
+        report['dropped_images'] = True
+        html = build(news, thumbnails)
+        report['steps'].append(('썸네일 제거', html_size(html)))
+    # 2차 축소: 섹션별 기사 수 상한을 두어 긴 섹션의 뒤쪽 기사부터 제외 (섹션당 최소 1건 유지)
+    # 예산에 들어오는 가장 큰 상한을 이분 탐색하므로 렌더링 횟수는 기사 수의 로그 수준
+    # (기사가 없거나 섹션마다 1건뿐이면 건너뛰고 영상 축소로 넘어감)
+    if html_size(html) > budget and max((len(items) for items in news.values()), default=0) > 1:
+        total = sum(len(items) for items in news.values())
+        low, high = 1, max(len(items) for items in news.values()) - 1
+        best = None
+        while low <= high:
+            cap = (low + high) // 2
+            candidate = build({section: items[:cap] for section, items in news.items()}, thumbnails)
+            if html_size(candidate) <= budget:
+                best, low = (cap, candidate), cap + 1
+            else:
+                high = cap - 1
+        cap, html = best or (1, build({section: items[:1] for section, items in news.items()}, thumbnails))
+        report['trimmed_items'] = total - sum(min(len(items), cap) for items in news.values())
+        report['steps'].append((f"기사 {report['trimmed_items']}건 축소", html_size(html)))
+        news = {section: items[:cap] for section, items in news.items()}
+    # 3차 축소: 추천 영상을 뒤쪽부터 제외 (최소 1개 유지)
+    if html_size(html) > budget and youtube_recommendations and len(youtube_recommendations) > 1:
+        count = len(youtube_recommendations)
+        while count > 1 and html_size(html) > budget:
+            count -= 1
+            html = build(news, thumbnails, videos=youtube_recommendations[:count])
+        report['trimmed_videos'] = len(youtube_recommendations) - count
+        report['steps'].append((f"영상 {report['trimmed_videos']}개 축소", html_size(html)))
+    report['size'] = html_size(html)
+    return html, thumbnails, report
+
+
+def format_size_report(report):
+    """render_email() 보고를 콘솔용 문자열로 변환"""
+    steps = ' → '.join(f'{name} {size / 1024:.1f}KB' for name, size in report['steps'])
+    status = '예산 이내' if report['size'] <= report['budget'] else '예산 초과'
+    return f"📏 이메일 HTML: {report['size'] / 1024:.1f}KB / 예산 {report['budget'] / 1024:.0f}KB ({status}) [{steps}]"
+
+
+# ============================================================
+# 지난 호 목록(index) 페이지 (GitHub Pages 게시용)
+# ============================================================
+_ARCHIVE_INDEX = CompiledTemplate("""<!DOCTYPE html>
+<html lang='ko'>
+<head>
+    <meta charset='utf-8'>
+    <meta name='viewport' content='width=device-width, initial-scale=1'>
+    <title>AX / IT 트랜드 뉴스레터 - 지난 호</title>
+</head>
+<body style='font-family:Segoe UI,Arial,sans-serif; background-color:#f5f5f5; margin:0; padding:10px;'>
+    <div style='max-width:680px; margin:0 auto; background:#ffffff; border-radius:16px; overflow:hidden;'>
+        <div style='{header_bg} padding:25px; color:#ffffff; font-size:20px; font-weight:bold;'>📚 AX / IT 트랜드 뉴스레터 지난 호</div>
+        <ul style='list-style:none; margin:0; padding:10px 25px 25px;'>
+{entries}
+        </ul>
+    </div>
+</body>
+</html>
+""")
+_ARCHIVE_ENTRY = CompiledTemplate("""            <li style='padding:10px 0; border-bottom:1px solid #f0f0f0;'><a href='{href}' style='color:#1e3a8a; text-decoration:none;'>📅 {label}</a></li>
+""")
+
+
+def render_archive_index(editions):
+    """지난 호 목록 페이지 HTML (editions: (표시 문자열, 링크) 목록, 주어진 순서대로 표시)"""
+    entries = []
+    for label, href in editions:
+        _ARCHIVE_ENTRY.render_into(entries, label=html_lib.escape(label), href=html_lib.escape(href, quote=True))
+    return ''.join(_ARCHIVE_INDEX.render(header_bg=VARIANT_STYLES['browser']['header_bg'], entries=entries))
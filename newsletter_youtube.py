@@ -0,0 +1,143 @@
+# 뉴스레터 유튜브 검색 결과/채널 피드 파서
+# 검색 결과 페이지에 포함된 ytInitialData JSON을 한 번만 디코딩하여 영상 정보를 추출
+# (문서 전체를 가로지르는 지연 정규식 매칭/역추적 없이 선형 시간으로 처리)
+# 채널 Atom 피드(feeds/videos.xml)는 lxml iterparse로 <entry>를 하나씩 읽음
+# 주석은 한국어로 설명합니다
+
+import io
+import re
+import json
+from collections import namedtuple
+from lxml import etree
+
+# 영상 1건 (view_count는 정수, published는 검색 결과면 '3일 전' 같은 상대 시간 원문, 채널 피드면 ISO 8601 시각)
+VideoEntry = namedtuple('VideoEntry', ['video_id', 'title', 'channel', 'view_count', 'published'])
+
+# ytInitialData 시작 위치 표식 (var ytInitialData = {...}; 또는 window["ytInitialData"] = {...};)
+_INITIAL_DATA_MARKERS = ('var ytInitialData', 'window["ytInitialData"]', "window['ytInitialData']")
+
+# ytInitialData를 찾지 못했을 때의 대체 추출용 (단순 패턴이라 역추적 없음)
+_VIDEO_ID = re.compile(r'"videoId":"([a-zA-Z0-9_-]{11})"')
+
+_DIGITS = re.compile(r'\d+')
+
+_decoder = json.JSONDecoder()
+
+
+def extract_initial_data(html):
+    """페이지 원문에서 ytInitialData 객체를 찾아 디코딩 (없거나 깨졌으면 None)"""
+    for marker in _INITIAL_DATA_MARKERS:
+        start = html.find(marker)
+        if start < 0:
+            continue
+        brace = html.find('{', start + len(marker))
+        if brace < 0:
+            continue
+        try:
+            # raw_decode는 객체가 끝나는 지점에서 멈추므로 뒤따르는 스크립트는 읽지 않음
+            data, _ = _decoder.raw_decode(html, brace)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def _text(node):
+    """유튜브 텍스트 객체({'simpleText': ...} 또는 {'runs': [{'text': ...}]})를 문자열로 변환"""
+    if not isinstance(node, dict):
+        return ''
+    if 'simpleText' in node:
+        return node['simpleText']
+    return ''.join(run.get('text', '') for run in node.get('runs', ()))
+
+
+def parse_view_count(text):
+    """'조회수 1,234회' / '1,234 views' → 1234 (숫자가 없으면 0)"""
+    digits = ''.join(_DIGITS.findall(text or ''))
+    return int(digits) if digits else 0
+
+
+def iter_video_renderers(data):
+    """ytInitialData 트리를 문서 순서대로 순회하며 videoRenderer 객체를 생성"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            renderer = node.get('videoRenderer')
+            if isinstance(renderer, dict):
+                yield renderer
+            # 문서 순서를 유지하도록 역순으로 쌓음 (영상 안쪽은 다시 볼 필요 없음)
+            stack.extend(reversed([value for key, value in node.items()
+                                   if key != 'videoRenderer' and isinstance(value, (dict, list))]))
+        elif isinstance(node, list):
+            stack.extend(reversed([value for value in node if isinstance(value, (dict, list))]))
+
+
+def video_entry(renderer):
+    """videoRenderer 객체 → VideoEntry"""
+    channel = _text(renderer.get('ownerText')) or _text(renderer.get('longBylineText'))
+    return VideoEntry(
+        renderer.get('videoId', ''),
+        _text(renderer.get('title')),
+        channel,
+        parse_view_count(_text(renderer.get('viewCountText'))),
+        _text(renderer.get('publishedTimeText')),
+    )
+
+
+def parse_search_results(html):
+    """
+    검색 결과 페이지 → VideoEntry 목록 (페이지 표시 순서, 같은 영상은 처음 한 번만)
+    ytInitialData가 없는 페이지는 videoId만 추출하여 제목/채널은 비워 둠 (oEmbed로 보완)
+    """
+    data = extract_initial_data(html)
+    entries = []
+    seen = set()
+    if data is not None:
+        for renderer in iter_video_renderers(data):
+            entry = video_entry(renderer)
+            if entry.video_id and entry.video_id not in seen:
+                seen.add(entry.video_id)
+                entries.append(entry)
+        return entries
+    for video_id in _VIDEO_ID.findall(html):
+        if video_id not in seen:
+            seen.add(video_id)
+            entries.append(VideoEntry(video_id, '', '', 0, ''))
+    return entries
+
+
+# 채널 Atom 피드 네임스페이스
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_YT = '{http://www.youtube.com/xml/schemas/2015}'
+_MEDIA = '{http://search.yahoo.com/mrss/}'
+
+
+def channel_feed_url(channel_id):
+    """채널 최신 영상 Atom 피드 주소 (영상 약 15개, 제목/게시일/조회수 포함)"""
+    return f'https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}'
+
+
+def iter_channel_feed(data):
+    """채널 Atom 피드 원문(bytes) → VideoEntry를 피드 순서대로 생성 (깨진 XML은 읽을 수 있는 데까지만)"""
+    source = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+    parser = etree.iterparse(source, events=('end',), tag=f'{_ATOM}entry', recover=True, resolve_entities=False)
+    try:
+        for _, element in parser:
+            statistics = element.find(f'{_MEDIA}group/{_MEDIA}community/{_MEDIA}statistics')
+            yield VideoEntry(
+                (element.findtext(f'{_YT}videoId') or '').strip(),
+                (element.findtext(f'{_ATOM}title') or '').strip(),
+                (element.findtext(f'{_ATOM}author/{_ATOM}name') or '').strip(),
+                parse_view_count(statistics.get('views') if statistics is not None else ''),
+                (element.findtext(f'{_ATOM}published') or '').strip(),
+            )
+            # 처리 끝난 요소와 앞선 형제 요소 해제
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+    except etree.XMLSyntaxError:
+        return